@@ -1,7 +1,34 @@
 # app.py
 import os
+import time
+
 import streamlit as st
-from main import process_pdf  # pastikan main.py punya fungsi process_pdf(pdf_path)
+from jobs import (
+    ACTIVE_STATUSES,
+    CANCELLED,
+    DONE,
+    JobQueueFull,
+    cancel_job,
+    get_job,
+    submit_job,
+)  # process_pdf dijalankan di background lewat job queue
+from pdf_source import digest
+
+# Interval polling status job (detik) selama job masih jalan
+JOB_POLL_SECONDS = 1.0
+
+# Label tahap process_pdf untuk progress bar
+STAGE_LABELS = {
+    "queued": "Menunggu antrian...",
+    "start": "Memulai...",
+    "extract": "Membaca PDF...",
+    "detect_period": "Mendeteksi periode...",
+    "parse": "Parsing P&L, Balance Sheet, Cash Flow & KPI...",
+    "sheets": "Meng-update Google Sheet...",
+    "drive": "Menunggu upload ke Google Drive...",
+    "meta": "Menyimpan link Drive ke META...",
+    "done": "Selesai",
+}
 
 # =========================
 # PAGE CONFIG
@@ -336,23 +363,70 @@ def main():
 
     # Jika user upload file → proses
     result = None
+    needs_poll = False
     if uploaded_file is not None:
-        # Simpan file sementara
-        pdf_path = "report.pdf"
-        with open(pdf_path, "wb") as f:
-            f.write(uploaded_file.read())
+        # Streamlit menjalankan ulang script tiap ada interaksi widget.
+        # Hasil disimpan per session berdasarkan hash isi PDF, jadi file yang
+        # sama tidak diproses (extract / upload / Sheets) berulang-ulang.
+        file_hash = digest(uploaded_file)
+        processed = st.session_state.setdefault("processed_results", {})
+        job_ids = st.session_state.setdefault("job_ids", {})
+
+        # Proses berjalan di job queue (background), script ini cuma polling
+        job = get_job(job_ids[file_hash]) if file_hash in job_ids else None
+        if job is not None and job["status"] == DONE:
+            processed[file_hash] = job["result"]
+
+        result = processed.get(file_hash)
+        start_job = False
+
+        if job is not None and job["status"] in ACTIVE_STATUSES:
+            result = None
+            needs_poll = True
+
+            st.progress(
+                job["progress"],
+                text=STAGE_LABELS.get(job["stage"], job["stage"]),
+            )
+            if job["cancel_requested"]:
+                st.caption("Membatalkan setelah tahap ini selesai...")
+            elif st.button("✖️ Batalkan", key=f"cancel_{job['id']}"):
+                cancel_job(job["id"])
+                st.rerun()
+
+        elif result is not None:
+            st.info("PDF ini sudah diproses di sesi ini. Menampilkan ringkasan sebelumnya.")
+            start_job = st.button("🔄 Proses ulang PDF ini", key=f"reprocess_{file_hash[:12]}")
+
+        elif job is not None:
+            if job["status"] == CANCELLED:
+                st.warning("Proses dibatalkan.")
+            else:
+                st.error("Terjadi error saat memproses PDF / update Google.")
+                st.code(job["error"] or "", language="text")
+            start_job = st.button("🔄 Proses lagi", key=f"retry_{job['id']}")
+
+        else:
+            start_job = True
 
-        with st.spinner("Memproses PDF dan meng-update Google Sheet & Google Drive..."):
+        if start_job:
             try:
-                result = process_pdf(pdf_path)
-            except Exception as e:
-                st.error("Terjadi error saat memproses PDF / update Google.")
-                st.exception(e)
+                job_ids[file_hash] = submit_job(uploaded_file, file_name=uploaded_file.name)
+            except JobQueueFull:
+                st.warning("Server sedang sibuk memproses PDF lain. Coba lagi sebentar lagi.")
+            else:
+                processed.pop(file_hash, None)
+                st.rerun()
 
         if result:
             st.success("Selesai! ✅ Google Sheet & Google Drive sudah di-update.")
             st.markdown("##### Ringkasan hasil")
-            st.json(result)
+            st.json({k: v for k, v in result.items() if k != "trace"})
+
+            # durasi & request Google per tahap (tracing.py)
+            if result.get("trace"):
+                with st.expander("⏱️ Detail waktu per tahap"):
+                    st.json(result["trace"], expanded=False)
 
             # Kalau ada drive_link di result → tampilkan link
             drive_link = result.get("drive_link")
@@ -417,6 +491,11 @@ def main():
         unsafe_allow_html=True,
     )
 
+    # Job masih jalan -> render ulang halaman sebentar lagi untuk update progress
+    if needs_poll:
+        time.sleep(JOB_POLL_SECONDS)
+        st.rerun()
+
 
 if __name__ == "__main__":
     main()
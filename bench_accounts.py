@@ -0,0 +1,67 @@
+# bench_accounts.py
+# Scaling benchmark: regex per akun (cara lama) vs single-pass matcher,
+# dengan jumlah akun dan ukuran teks yang dinaikkan bertahap.
+#
+# Jalankan:
+#   python bench_accounts.py
+
+import random
+import re
+import time
+
+from parse_accounts import build_account_matcher
+
+
+def naive_match(accounts, text):
+    # implementasi lama parse_balance_sheet / parse_cashflow
+    data = {}
+    for acc in accounts:
+        match = re.search(rf"{acc}\s+Rp([\d\.]+)", text)
+        if match:
+            data[acc] = int(match.group(1).replace(".", ""))
+    return data
+
+
+def make_text(accounts, n_lines, seed=0):
+    """
+    Teks laporan sintetis: baris filler + baris akun di posisi acak.
+    Sebagian akun sengaja tidak muncul (worst case untuk cara lama).
+    """
+    rng = random.Random(seed)
+    lines = [
+        f"Filler line {i} lorem ipsum Rp{rng.randint(0, 10**9):,}".replace(",", ".")
+        for i in range(n_lines)
+    ]
+    for acc in accounts[: len(accounts) * 3 // 4]:
+        value = f"{rng.randint(0, 10**10):,}".replace(",", ".")
+        lines.insert(rng.randrange(len(lines)), f"{acc} Rp{value} Rp0 1,00%")
+    return "\n".join(lines)
+
+
+def best_time(fn, repeat=5):
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+if __name__ == "__main__":
+    print(f"{'accounts':>8} {'lines':>7} {'naive ms':>10} {'single ms':>10} {'speedup':>8}")
+
+    for n_accounts in (20, 80, 320):
+        accounts = [f"Account {i:04d} Balance" for i in range(n_accounts)]
+        matcher = build_account_matcher(accounts)
+
+        for n_lines in (500, 2000, 8000):
+            text = make_text(accounts, n_lines)
+            assert matcher(text) == naive_match(accounts, text)
+
+            t_naive = best_time(lambda: naive_match(accounts, text))
+            t_single = best_time(lambda: matcher(text))
+            print(
+                f"{n_accounts:>8} {n_lines:>7} {t_naive * 1000:>10.2f} "
+                f"{t_single * 1000:>10.2f} {t_naive / t_single:>7.1f}x"
+            )
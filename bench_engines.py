@@ -0,0 +1,199 @@
+# bench_engines.py
+# Bandingkan engine ekstraksi teks (extract_pdf.ENGINES) di 1 corpus PDF:
+#   - kecepatan   : halaman / detik (extract_text penuh, tanpa cache)
+#   - memori      : peak RSS proses (tiap engine x PDF jalan di proses baru,
+#                   jadi angkanya tidak tercampur engine lain)
+#   - akurasi     : apakah hasil period / P&L / BS / CF / KPI identik dengan
+#                   engine referensi (pdfplumber)
+#
+# Corpus default: report.pdf + beberapa laporan sintetis.
+#
+# Jalankan:
+#   python bench_engines.py                       # corpus default
+#   python bench_engines.py "laporan/*.pdf"       # PDF sendiri
+#   python bench_engines.py --engines pdfium --repeat 3
+
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pypdfium2
+
+from extract_pdf import ENGINES, extract_text
+from parse_bs import parse_balance_sheet
+from parse_cashflow import parse_cashflow
+from parse_kpi import parse_kpi_result
+from parse_pl import detect_period, parse_profit_loss
+from sections import split_sections
+from synthetic_report import synthetic_pdf
+
+# =========================
+# CONFIG
+# =========================
+REFERENCE_ENGINE = "pdfplumber"
+
+# name -> argumen synthetic_pdf
+SYNTHETIC_CORPUS = {
+    "synthetic_base": {"filler_pages": 10},
+    "synthetic_pages_60": {"filler_pages": 60},
+    "synthetic_accounts_300": {"filler_pages": 10, "extra_accounts": 300, "kpi_rows": 120},
+}
+
+PARSED_KEYS = ("period", "pl", "bs", "cf", "kpi")
+
+
+# =========================
+# WORKER (proses terpisah)
+# =========================
+def parse_all(text: str) -> dict:
+    sections = split_sections(text)
+    period = detect_period(text)
+    return {
+        "period": period,
+        "pl": parse_profit_loss(sections.get("pl", text)),
+        "bs": parse_balance_sheet(sections.get("bs", text)),
+        "cf": parse_cashflow(sections.get("cf", text)),
+        "kpi": parse_kpi_result(sections.get("kpi", text), period),
+    }
+
+
+def _max_rss_kb() -> int:
+    # Linux: KB, macOS: bytes
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def run_engine(engine: str, path: str, repeat: int) -> dict:
+    """
+    Dijalankan di proses baru: ekstrak path dengan engine, best of repeat.
+    """
+    rss_before = _max_rss_kb()
+
+    best = None
+    text = ""
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        text = extract_text(path, workers=0, use_cache=False, engine=engine)
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+
+    return {
+        "seconds": best,
+        "peak_rss_kb": _max_rss_kb(),
+        "extract_rss_kb": _max_rss_kb() - rss_before,
+        "parsed": parse_all(text),
+    }
+
+
+# =========================
+# HARNESS
+# =========================
+def _count_pages(path: str) -> int:
+    doc = pypdfium2.PdfDocument(path)
+    try:
+        return len(doc)
+    finally:
+        doc.close()
+
+
+def build_corpus(patterns, tmp_dir: str) -> dict:
+    """
+    {nama: path}. Tanpa pattern = report.pdf + SYNTHETIC_CORPUS.
+    """
+    if patterns:
+        from main import resolve_pdf_paths
+
+        return {os.path.basename(p): p for p in resolve_pdf_paths(patterns)}
+
+    corpus = {}
+    if os.path.exists("report.pdf"):
+        corpus["report.pdf"] = "report.pdf"
+    for name, kwargs in SYNTHETIC_CORPUS.items():
+        data, _ = synthetic_pdf(seed=1, **kwargs)
+        path = os.path.join(tmp_dir, f"{name}.pdf")
+        with open(path, "wb") as f:
+            f.write(data)
+        corpus[name] = path
+    return corpus
+
+
+def compare(engines, corpus: dict, repeat: int) -> list:
+    """
+    Return list hasil per (engine, pdf). Tiap run = 1 proses spawn baru.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    results = []
+    reference = {}
+
+    # referensi dulu, biar bisa dibandingkan
+    ordered = [REFERENCE_ENGINE] + [e for e in engines if e != REFERENCE_ENGINE]
+    for engine in ordered:
+        for name, path in corpus.items():
+            with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+                run = pool.submit(run_engine, engine, path, repeat).result()
+
+            parsed = run.pop("parsed")
+            if engine == REFERENCE_ENGINE:
+                reference[name] = parsed
+            mismatched = [k for k in PARSED_KEYS if parsed[k] != reference[name][k]]
+
+            pages = _count_pages(path)
+            results.append({
+                "engine": engine,
+                "pdf": name,
+                "pages": pages,
+                "pages_per_sec": pages / run["seconds"] if run["seconds"] else float("inf"),
+                **run,
+                "identical": not mismatched,
+                "mismatched": mismatched,
+            })
+
+    return [r for r in results if r["engine"] in engines]
+
+
+def print_results(results: list):
+    print(
+        f"{'engine':<11} {'pdf':<24} {'pages':>5} {'ms':>9} {'pages/s':>9} "
+        f"{'peak RSS':>10} {'extract':>9}  parse == {REFERENCE_ENGINE}"
+    )
+    for r in results:
+        same = "yes" if r["identical"] else "NO (" + ", ".join(r["mismatched"]) + ")"
+        print(
+            f"{r['engine']:<11} {r['pdf']:<24} {r['pages']:>5} {r['seconds'] * 1000:>9.1f} "
+            f"{r['pages_per_sec']:>9.1f} {r['peak_rss_kb'] / 1024:>8.1f}MB "
+            f"{r['extract_rss_kb'] / 1024:>7.1f}MB  {same}"
+        )
+
+    print("\n-- total per engine --")
+    for engine in dict.fromkeys(r["engine"] for r in results):
+        rows = [r for r in results if r["engine"] == engine]
+        pages = sum(r["pages"] for r in rows)
+        seconds = sum(r["seconds"] for r in rows)
+        identical = sum(r["identical"] for r in rows)
+        print(
+            f"{engine:<11} {pages / seconds:>9.1f} pages/s  "
+            f"max peak RSS {max(r['peak_rss_kb'] for r in rows) / 1024:.1f}MB  "
+            f"identical {identical}/{len(rows)}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bandingkan engine ekstraksi PDF")
+    parser.add_argument("inputs", nargs="*", help="file PDF, folder, atau glob (default: corpus bawaan)")
+    parser.add_argument("--engines", nargs="+", default=list(ENGINES), choices=list(ENGINES))
+    parser.add_argument("--repeat", type=int, default=1, help="best of N per PDF")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        corpus = build_corpus(args.inputs, tmp_dir)
+        if not corpus:
+            sys.exit("Tidak ada PDF di corpus")
+        results = compare(args.engines, corpus, args.repeat)
+
+    print_results(results)
+    sys.exit(0 if all(r["identical"] for r in results) else 1)
@@ -0,0 +1,59 @@
+# bench_extract.py
+# Bandingkan kecepatan ekstraksi serial vs paralel (pages/sec)
+#
+# Jalankan:
+#   python bench_extract.py [pdf_path] [workers] [repeat]
+
+import os
+import sys
+import time
+
+from extract_pdf import _count_pages, extract_section_text, extract_text, find_section_pages
+
+
+def bench(pdf_path, workers, repeat):
+    best = None
+    text = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        text = extract_text(pdf_path, workers=workers, use_cache=False)
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return text, best
+
+
+if __name__ == "__main__":
+    pdf_path = sys.argv[1] if len(sys.argv) > 1 else "report.pdf"
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 2)
+    repeat = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+
+    n_pages = _count_pages(pdf_path)
+    print(f"📄 {pdf_path}: {n_pages} pages, best of {repeat}")
+
+    serial_text, serial_time = bench(pdf_path, 1, repeat)
+    print(f"serial        : {serial_time:.3f}s  {n_pages / serial_time:.1f} pages/sec")
+
+    parallel_text, parallel_time = bench(pdf_path, workers, repeat)
+    print(
+        f"parallel ({workers:>2}) : {parallel_time:.3f}s  "
+        f"{n_pages / parallel_time:.1f} pages/sec  "
+        f"(x{serial_time / parallel_time:.2f})"
+    )
+
+    if parallel_text != serial_text:
+        print("❌ Output paralel BEDA dengan serial")
+        sys.exit(1)
+    print("✅ Output paralel identik dengan serial")
+
+    # ---------- SECTION-ONLY (LAZY) ----------
+    n_section = len(find_section_pages(pdf_path))
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        extract_section_text(pdf_path, use_cache=False)
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    print(
+        f"sections only : {best:.3f}s  {n_section}/{n_pages} pages extracted  "
+        f"(x{serial_time / best:.2f} vs serial)"
+    )
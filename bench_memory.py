@@ -0,0 +1,108 @@
+# bench_memory.py
+# Peak RSS ekstraksi teks vs jumlah halaman (laporan sintetis).
+#
+# Mode:
+#   legacy    : cara lama extract_text, semua halaman pdfplumber tetap
+#               hidup sampai PDF ditutup + text += per halaman
+#   streaming : extract_text sekarang (iter_page_texts, page.close() per
+#               halaman, join linear), per engine
+#
+# Tiap (mode, jumlah halaman) jalan di proses baru, jadi peak RSS-nya
+# tidak tercampur run lain.
+#
+# Jalankan:
+#   python bench_memory.py                        # 25, 50, 100 halaman
+#   python bench_memory.py --pages 100 300 --no-legacy
+
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pdfplumber
+
+from bench_engines import _count_pages, _max_rss_kb
+from extract_pdf import ENGINES, extract_text
+from synthetic_report import synthetic_pdf
+
+# =========================
+# CONFIG
+# =========================
+DEFAULT_PAGES = [25, 50, 100]
+
+
+# =========================
+# WORKER (proses terpisah)
+# =========================
+def _legacy_extract(path: str) -> str:
+    text = ""
+    with pdfplumber.open(path) as pdf:
+        for page in pdf.pages:
+            page_text = page.extract_text()
+            if page_text:
+                text += page_text + "\n"
+    return text
+
+
+def run_mode(mode: str, path: str) -> dict:
+    rss_before = _max_rss_kb()
+    t0 = time.perf_counter()
+    if mode == "legacy":
+        text = _legacy_extract(path)
+    else:
+        text = extract_text(path, workers=0, use_cache=False, engine=mode)
+    return {
+        "seconds": time.perf_counter() - t0,
+        "peak_rss_kb": _max_rss_kb(),
+        "extract_rss_kb": _max_rss_kb() - rss_before,
+        "chars": len(text),
+    }
+
+
+# =========================
+# HARNESS
+# =========================
+def _synthetic_path(tmp_dir: str, n_pages: int) -> str:
+    # laporan sintetis minimal = 5 halaman (cover + tabel), sisanya filler
+    data, _ = synthetic_pdf(seed=1, filler_pages=max(0, n_pages - 5))
+    path = os.path.join(tmp_dir, f"synthetic_{n_pages}.pdf")
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+def measure(page_counts, modes) -> list:
+    ctx = multiprocessing.get_context("spawn")
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for n_pages in page_counts:
+            path = _synthetic_path(tmp_dir, n_pages)
+            pages = _count_pages(path)
+            for mode in modes:
+                with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+                    run = pool.submit(run_mode, mode, path).result()
+                results.append({"mode": mode, "pages": pages, **run})
+    return results
+
+
+def print_results(results: list):
+    print(f"{'mode':<11} {'pages':>5} {'ms':>9} {'peak RSS':>10} {'extract':>9} {'KB/page':>8}")
+    for r in results:
+        print(
+            f"{r['mode']:<11} {r['pages']:>5} {r['seconds'] * 1000:>9.1f} "
+            f"{r['peak_rss_kb'] / 1024:>8.1f}MB {r['extract_rss_kb'] / 1024:>7.1f}MB "
+            f"{r['extract_rss_kb'] / r['pages']:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Peak RSS ekstraksi vs jumlah halaman")
+    parser.add_argument("--pages", nargs="+", type=int, default=DEFAULT_PAGES)
+    parser.add_argument("--engines", nargs="+", default=list(ENGINES), choices=list(ENGINES))
+    parser.add_argument("--no-legacy", action="store_true", help="lewati mode legacy (boros memori)")
+    args = parser.parse_args()
+
+    modes = ([] if args.no_legacy else ["legacy"]) + args.engines
+    print_results(measure(args.pages, modes))
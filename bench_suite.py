@@ -0,0 +1,217 @@
+# bench_suite.py
+# Benchmark suite: extract_text, tiap parse_*, dan process_pdf (ke backend
+# Google palsu) untuk laporan sintetis dengan ukuran yang di-scale
+# (halaman, jumlah akun, baris KPI, jumlah period).
+#
+# Hasil dibandingkan dengan baseline yang disimpan; metric yang lebih
+# lambat dari baseline lebih dari --threshold ditandai REGRESSION
+# (exit code 1). Jumlah request Google dibandingkan persis.
+#
+# Jalankan:
+#   python bench_suite.py --save            # simpan baseline baru
+#   python bench_suite.py                   # bandingkan dengan baseline
+#   python bench_suite.py --quick --threshold 0.5
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import extract_pdf
+import fake_google
+import google_clients
+import main
+import store
+import upload_to_drive
+from extract_pdf import extract_section_text, extract_text
+from parse_bs import parse_balance_sheet
+from parse_cashflow import parse_cashflow
+from parse_kpi import parse_kpi_result
+from parse_pl import parse_profit_loss
+from sections import split_sections
+from synthetic_report import MONTHS, synthetic_pdf
+
+# =========================
+# CONFIG
+# =========================
+BASELINE_PATH = "bench_baseline.json"
+
+# Regression kalau waktu > baseline * (1 + threshold)
+DEFAULT_THRESHOLD = 0.25
+# Selisih di bawah ini dianggap noise (detik), berapapun rasionya
+NOISE_FLOOR = 0.005
+
+# name -> argumen synthetic_pdf + jumlah period yang diproses berturut-turut
+SCENARIOS = {
+    "base": {"filler_pages": 10, "extra_accounts": 0, "kpi_rows": 28, "periods": 1},
+    "many_pages": {"filler_pages": 60, "extra_accounts": 0, "kpi_rows": 28, "periods": 1},
+    "many_accounts": {"filler_pages": 10, "extra_accounts": 300, "kpi_rows": 28, "periods": 1},
+    "many_kpis": {"filler_pages": 10, "extra_accounts": 0, "kpi_rows": 300, "periods": 1},
+    "many_periods": {"filler_pages": 10, "extra_accounts": 0, "kpi_rows": 28, "periods": 12},
+}
+QUICK_SCENARIOS = ["base", "many_accounts"]
+
+# metric yang nilainya jumlah (bukan waktu): harus sama persis / turun
+COUNT_METRICS = ("sheets_requests", "drive_requests")
+
+
+# =========================
+# HELPERS
+# =========================
+def best_time(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _periods(n: int, last: str = "Dec 2025") -> list:
+    """n period bulanan berurutan yang berakhir di `last`."""
+    month, year = last.split()
+    idx = int(year) * 12 + MONTHS.index(month)
+    return [f"{MONTHS[i % 12]} {i // 12}" for i in range(idx - n + 1, idx + 1)]
+
+
+def _use_fake_backend(latency: float):
+    google_clients.BACKEND = "fake"
+    backend = fake_google.FakeBackend(latency=latency)
+    fake_google.set_backend(backend)
+    upload_to_drive._folder_cache.clear()
+    # store lokal baru: semua period dianggap belum ter-sync ke sheet palsu
+    store.STORE_DB_PATH = os.path.join(tempfile.mkdtemp(), "store.sqlite3")
+    return backend
+
+
+# =========================
+# BENCHMARK
+# =========================
+def run_scenario(config: dict, repeat: int, latency: float) -> dict:
+    periods = _periods(config["periods"])
+    report_args = {k: v for k, v in config.items() if k != "periods"}
+    pdfs = [synthetic_pdf(period=p, seed=i, **report_args) for i, p in enumerate(periods)]
+    pdf, expected = pdfs[-1]
+
+    metrics = {}
+    metrics["extract_text"] = best_time(lambda: extract_text(pdf, workers=0, use_cache=False), repeat)
+    metrics["extract_section_text"] = best_time(lambda: extract_section_text(pdf, use_cache=False), repeat)
+
+    text = extract_section_text(pdf, use_cache=False)
+    sections = split_sections(text)
+    parsers = {
+        "parse_profit_loss": (lambda: parse_profit_loss(sections["pl"]), expected["pl"]),
+        "parse_balance_sheet": (lambda: parse_balance_sheet(sections["bs"]), expected["bs"]),
+        "parse_cashflow": (lambda: parse_cashflow(sections["cf"]), expected["cf"]),
+        "parse_kpi_result": (lambda: parse_kpi_result(sections["kpi"], expected["period"]), expected["kpi_rows"]),
+    }
+    for name, (fn, want) in parsers.items():
+        if fn() != want:
+            raise AssertionError(f"{name}: hasil parse tidak sesuai laporan sintetis")
+        # parser cepat: ulang lebih banyak biar timing stabil
+        metrics[name] = best_time(fn, repeat * 5)
+
+    # process_pdf semua period berturut-turut ke 1 spreadsheet palsu
+    # (sheet makin besar, seperti pemakaian bulanan)
+    backend = _use_fake_backend(latency)
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for period_pdf, _ in pdfs:
+            main.process_pdf(period_pdf)
+    metrics["process_pdf"] = (time.perf_counter() - t0) / len(pdfs)
+
+    counts = backend.request_counts()
+    metrics["sheets_requests"] = counts["sheets"]
+    metrics["drive_requests"] = counts["drive"]
+    return metrics
+
+
+def compare(name: str, metrics: dict, baseline: dict, threshold: float) -> list:
+    """
+    Return list pesan regression untuk 1 scenario.
+    """
+    regressions = []
+    for metric, value in metrics.items():
+        base = baseline.get(metric)
+        if base is None:
+            continue
+        if metric in COUNT_METRICS:
+            if value > base:
+                regressions.append(f"{name}.{metric}: {base} -> {value} requests")
+        elif value > base * (1 + threshold) and value - base > NOISE_FLOOR:
+            regressions.append(f"{name}.{metric}: {base * 1000:.1f} -> {value * 1000:.1f} ms (x{value / base:.2f})")
+    return regressions
+
+
+def print_table(name: str, metrics: dict, baseline: dict):
+    print(f"\n== {name} ==")
+    for metric, value in metrics.items():
+        base = baseline.get(metric)
+        if metric in COUNT_METRICS:
+            line = f"{metric:<22} {value:>10}"
+            if base is not None:
+                line += f"   baseline {base:>10}"
+        else:
+            line = f"{metric:<22} {value * 1000:>8.2f}ms"
+            if base:
+                line += f"   baseline {base * 1000:>8.2f}ms  x{value / base:.2f}"
+        print(line)
+
+
+def main_cli(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="bench_suite.py")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save", action="store_true", help="simpan hasil sebagai baseline baru")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.0, help="latency per request Google palsu (detik)")
+    parser.add_argument("--quick", action="store_true", help=f"hanya scenario {', '.join(QUICK_SCENARIOS)}")
+    parser.add_argument("scenarios", nargs="*", help="nama scenario (default semua)")
+    args = parser.parse_args(argv)
+
+    names = args.scenarios or (QUICK_SCENARIOS if args.quick else list(SCENARIOS))
+    extract_pdf.CACHE_ENABLED = False
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f).get("scenarios", {})
+
+    results = {}
+    regressions = []
+    for name in names:
+        results[name] = run_scenario(SCENARIOS[name], args.repeat, args.latency)
+        print_table(name, results[name], baseline.get(name, {}))
+        regressions += compare(name, results[name], baseline.get(name, {}), args.threshold)
+
+    if args.save:
+        saved = {"scenarios": {**baseline, **results}}
+        saved["machine"] = {"python": platform.python_version(), "platform": platform.platform()}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(saved, f, indent=2, sort_keys=True)
+        print(f"\n💾 Baseline disimpan ke {args.baseline}")
+        return 0
+
+    if not baseline:
+        print(f"\nBelum ada baseline ({args.baseline}), jalankan dengan --save dulu.")
+        return 0
+
+    print()
+    if regressions:
+        print(f"❌ {len(regressions)} REGRESSION (threshold {args.threshold:.0%}):")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+
+    print(f"✅ Tidak ada regression (threshold {args.threshold:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,88 @@
+# bench_tables.py
+# Bandingkan 2 cara ambil tabel P&L & Balance Sheet:
+#   text  : extract_text halaman tabel -> split_sections -> parse_* (regex)
+#   table : koordinat kata pdfplumber -> cell (table_extract.py)
+# Ukur waktu (best of N) dan akurasi terhadap nilai asli laporan sintetis
+# (semua akun, kolom period berjalan, nilai bertanda).
+#
+# Jalankan:
+#   python bench_tables.py [repeat]
+
+import sys
+import time
+
+from extract_pdf import _join_pages, find_section_pages, iter_page_texts
+from parse_bs import BS_ACCOUNTS, parse_balance_sheet
+from parse_pl import parse_profit_loss
+from sections import split_sections
+from synthetic_report import synthetic_pdf
+from table_extract import STATEMENT_TITLES, extract_statement_cells, statement_values
+
+# name -> argumen synthetic_pdf
+CASES = {
+    "base": {"extra_accounts": 0},
+    "accounts_100": {"extra_accounts": 100},
+    "accounts_400": {"extra_accounts": 400},
+}
+
+
+def text_path(pdf) -> dict:
+    # halaman yang sama dengan table path, biar adil
+    titles = [t for ts in STATEMENT_TITLES.values() for t in ts]
+    pages = find_section_pages(pdf, titles)
+    text = _join_pages(t for _, t in iter_page_texts(pdf, pages))
+    sections = split_sections(text)
+    return {
+        "pl": parse_profit_loss(sections.get("pl", text)),
+        "bs": parse_balance_sheet(sections.get("bs", text)),
+    }
+
+
+def table_path(pdf) -> dict:
+    cells = extract_statement_cells(pdf)
+    return {
+        "pl": statement_values(cells, "pl"),
+        "bs": statement_values(cells, "bs"),
+    }
+
+
+def accuracy(got: dict, truth: dict, known_only: bool = False) -> str:
+    """
+    "benar/total" untuk P&L + BS. known_only = hanya akun yang memang
+    dicari parser regex (semua akun P&L, BS_ACCOUNTS untuk Balance Sheet).
+    """
+    correct = total = 0
+    for section, values in truth.items():
+        for account, value in values.items():
+            if known_only and section == "bs" and account not in BS_ACCOUNTS:
+                continue
+            total += 1
+            correct += got[section].get(account) == value
+    return f"{correct}/{total} ({correct / total:.0%})"
+
+
+def best_time(fn, repeat):
+    best = None
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+if __name__ == "__main__":
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+
+    print(f"{'case':<14} {'path':<6} {'ms':>9} {'known accounts':>16} {'all accounts':>16}")
+    for name, kwargs in CASES.items():
+        pdf, expected = synthetic_pdf(seed=1, **kwargs)
+        truth = expected["statements"]
+
+        for path_name, fn in (("text", text_path), ("table", table_path)):
+            got, elapsed = best_time(lambda: fn(pdf), repeat)
+            print(
+                f"{name:<14} {path_name:<6} {elapsed * 1000:>9.1f} "
+                f"{accuracy(got, truth, known_only=True):>16} {accuracy(got, truth):>16}"
+            )
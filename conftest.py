@@ -0,0 +1,9 @@
+import pytest
+
+import store
+
+
+@pytest.fixture(autouse=True)
+def isolated_store(tmp_path, monkeypatch):
+    # tiap test pakai store lokal sendiri, biar status sync tidak bocor antar test
+    monkeypatch.setattr(store, "STORE_DB_PATH", str(tmp_path / "store.sqlite3"))
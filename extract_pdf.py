@@ -1,10 +1,436 @@
+import hashlib
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
 import pdfplumber
+import pypdfium2
+
+from pdf_source import digest, is_path, open_input, read_bytes
+from sections import PAGE_HEADING_RE, SECTION_HEADINGS
+
+# =========================
+# CONFIG
+# =========================
+# Jumlah proses untuk ekstraksi paralel.
+# 0 / 1 = serial (default), bisa diubah lewat env EXTRACT_WORKERS
+EXTRACT_WORKERS = int(os.environ.get("EXTRACT_WORKERS", "0"))
+
+# Di bawah jumlah halaman ini, overhead process pool lebih mahal
+# daripada ekstraksi serial biasa
+MIN_PAGES_FOR_PARALLEL = 8
+
+# Halaman yang diekstrak penuh = halaman dengan heading section
+# (sections.SECTION_HEADINGS, sumber yang sama dengan split_sections).
+# Halaman tanpa heading (chart, notes, penjelasan KPI) dilewati.
+
+# Halaman yang selalu ikut diekstrak: cover (tempat period laporan)
+ALWAYS_PAGES = (0,)
+
+# Engine ekstraksi teks default (lihat ENGINES), bisa diubah lewat env
+# EXTRACT_ENGINE. Bandingkan engine dengan bench_engines.py.
+EXTRACT_ENGINE = os.environ.get("EXTRACT_ENGINE", "pdfplumber")
+
+# Cache hasil ekstraksi di disk, key = SHA-256 isi PDF + engine + versinya.
+# Matikan dengan EXTRACT_CACHE=0
+CACHE_ENABLED = os.environ.get("EXTRACT_CACHE", "1") != "0"
+CACHE_DIR = os.environ.get(
+    "EXTRACT_CACHE_DIR",
+    os.path.join(tempfile.gettempdir(), "financial_pdf_cache"),
+)
+# Budget ukuran cache (bytes); entry paling lama tidak dipakai dibuang duluan
+CACHE_MAX_BYTES = int(os.environ.get("EXTRACT_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+
+
+# =========================
+# HELPERS
+# =========================
+def _join_pages(page_texts) -> str:
+    """
+    Gabungkan teks per halaman dengan format yang sama persis
+    seperti loop serial: halaman kosong dilewati, tiap halaman diakhiri "\\n".
+    Pakai "".join (linear), bukan text += per halaman (bisa kuadratik).
+    """
+    return "".join(t + "\n" for t in page_texts if t)
+
+
+def _split_page_ranges(n_pages: int, n_chunks: int):
+    """
+    Bagi index halaman 0..n_pages-1 jadi n_chunks range berurutan
+    (ukuran tiap range selisih maksimal 1 halaman).
+    """
+    n_chunks = max(1, min(n_chunks, n_pages))
+    size, extra = divmod(n_pages, n_chunks)
+
+    ranges = []
+    start = 0
+    for i in range(n_chunks):
+        stop = start + size + (1 if i < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+def _extract_pages(pdf_source, page_indexes: list, engine: str = None) -> list:
+    """
+    Worker: buka PDF sendiri, ekstrak halaman page_indexes (urut).
+    Return list teks per halaman (None / "" kalau halaman kosong).
+    """
+    return [t for _, t in iter_page_texts(pdf_source, page_indexes, engine=engine)]
+
+
+def _count_pages(pdf_source) -> int:
+    # pdfium: tidak perlu bikin objek Page pdfplumber untuk semua halaman
+    doc = pypdfium2.PdfDocument(open_input(pdf_source))
+    try:
+        return len(doc)
+    finally:
+        doc.close()
+
+
+def _pdfium_page_text(doc, idx: int) -> str:
+    page = doc[idx]
+    textpage = page.get_textpage()
+    try:
+        return textpage.get_text_range()
+    finally:
+        textpage.close()
+        page.close()
+
 
-def extract_text(pdf_path):
-    text = ""
-    with pdfplumber.open(pdf_path) as pdf:
+# =========================
+# ENGINES
+# =========================
+# Engine = generator fn(pdf_source, page_indexes) -> yield (index_halaman, teks)
+# page_indexes: list index 0-based, None = semua halaman.
+
+
+def _pdfplumber_pages(pdf_source, page_indexes=None):
+    """
+    Layout analysis pdfplumber: lambat, tapi posisi kata / spasi paling rapi.
+    Ini engine referensi, semua parser ditulis berdasarkan output ini.
+
+    Tiap halaman di-close() setelah diekstrak: tanpa itu, char / layout /
+    textmap semua halaman tetap hidup sampai PDF ditutup (beberapa MB per
+    halaman, PDF ratusan halaman bisa makan beberapa GB).
+    """
+    pages = None
+    if page_indexes is not None:
+        pages = [i + 1 for i in page_indexes]  # pdfplumber 1-based
+
+    with pdfplumber.open(open_input(pdf_source), pages=pages) as pdf:
         for page in pdf.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text + "\n"
+            try:
+                text = page.extract_text()
+            finally:
+                page.close()
+            yield page.page_number - 1, text
+
+
+def _pdfium_pages(pdf_source, page_indexes=None):
+    """
+    Teks mentah pdfium (C++), beberapa kali lebih cepat dari pdfplumber.
+    Baris dari pdfium diakhiri "\\r\\n", dinormalkan ke "\\n" biar sama
+    dengan format pdfplumber.
+    """
+    doc = pypdfium2.PdfDocument(open_input(pdf_source))
+    try:
+        if page_indexes is None:
+            page_indexes = range(len(doc))
+        for idx in page_indexes:
+            raw = _pdfium_page_text(doc, idx)
+            yield idx, raw.replace("\r\n", "\n").replace("\r", "\n")
+    finally:
+        doc.close()
+
+
+# name -> (fn, versi). Versi ikut masuk key cache.
+ENGINES = {
+    "pdfplumber": (_pdfplumber_pages, pdfplumber.__version__),
+    "pdfium": (_pdfium_pages, str(pypdfium2.version.PDFIUM_INFO)),
+}
+
+
+def register_engine(name: str, fn, version: str = ""):
+    """
+    Tambah engine baru (misal OCR). fn harus generator dengan signature
+    sama seperti _pdfplumber_pages. Untuk extract_text_parallel, engine
+    harus sudah terdaftar saat modul ini di-import di proses worker.
+    """
+    ENGINES[name] = (fn, str(version))
+
+
+def _get_engine(engine: str = None):
+    """
+    Return (nama, fn, versi). engine None = pakai EXTRACT_ENGINE.
+    """
+    name = engine or EXTRACT_ENGINE
+    try:
+        fn, version = ENGINES[name]
+    except KeyError:
+        raise ValueError(f"Engine ekstraksi tidak dikenal: {name!r} (pilihan: {', '.join(ENGINES)})")
+    return name, fn, version
+
+
+# =========================
+# SECTION-AWARE (LAZY) EXTRACTION
+# =========================
+def find_section_pages(pdf_source, headings=None) -> list:
+    """
+    Pass murah: ambil teks mentah tiap halaman pakai pdfium (jauh lebih cepat
+    dari layout analysis pdfplumber), lalu catat halaman yang mengandung
+    salah satu heading section.
+
+    headings : None = heading sections.SECTION_HEADINGS, atau list teks
+               judul sendiri (dicari sebagai substring, huruf besar/kecil sama).
+    Return list index halaman (0-based), urut.
+    """
+    if headings is None:
+        has_heading = PAGE_HEADING_RE.search
+    else:
+        titles = [h.upper() for h in headings]
+
+        def has_heading(flat):
+            flat = flat.upper()
+            return any(h in flat for h in titles)
+
+    pages = []
+    doc = pypdfium2.PdfDocument(open_input(pdf_source))
+    try:
+        for idx in range(len(doc)):
+            raw = _pdfium_page_text(doc, idx)
+
+            # rapikan whitespace biar "PROFIT  &\r\nLOSS" tetap ketemu
+            flat = " ".join(raw.split())
+
+            # halaman tanpa teks di pdfium (aneh / scan) tetap diikutkan,
+            # biar tidak ada section yang hilang
+            if idx in ALWAYS_PAGES or not flat or has_heading(flat):
+                pages.append(idx)
+    finally:
+        doc.close()
+
+    return pages
+
+
+def iter_page_texts(pdf_source, page_indexes=None, engine: str = None):
+    """
+    Generator: yield (index_halaman, teks) satu per satu.
+    page_indexes : list index 0-based, None = semua halaman.
+    engine       : nama engine (lihat ENGINES), None = EXTRACT_ENGINE.
+
+    Mode streaming: yang ditahan di memori hanya halaman yang sedang
+    diproses, jadi aman untuk PDF ratusan halaman kalau pemanggil juga
+    tidak mengumpulkan semua teks (lihat bench_memory.py).
+    """
+    _, fn, _ = _get_engine(engine)
+    if page_indexes is not None:
+        page_indexes = list(page_indexes)
+    return fn(pdf_source, page_indexes)
+
+
+def iter_section_page_texts(pdf_source, headings=None, engine: str = None):
+    """
+    Generator: hanya halaman yang berisi section yang dibutuhkan parser
+    yang diekstrak penuh.
+    """
+    return iter_page_texts(pdf_source, find_section_pages(pdf_source, headings), engine=engine)
+
+
+def extract_section_text(pdf_source, use_cache: bool = None, engine: str = None, workers: int = None) -> str:
+    """
+    Sama seperti extract_text(), tapi hanya berisi halaman section
+    (P&L, Balance Sheet, Cash Flow, KPI). Format gabungan identik,
+    jadi bisa langsung dipakai semua parse_*.
+
+    workers : seperti extract_text(); halaman section yang terpilih
+              dibagi ke process pool kalau jumlahnya >= MIN_PAGES_FOR_PARALLEL.
+    """
+    if use_cache is None:
+        use_cache = CACHE_ENABLED
+    if workers is None:
+        workers = EXTRACT_WORKERS
+
+    key = None
+    if use_cache:
+        key = f"{pdf_cache_key(pdf_source, engine)}-sections{section_filter_key()}"
+        cached = cache_get(key)
+        if cached is not None:
+            return cached
+
+    pages = find_section_pages(pdf_source)
+    if workers > 1 and len(pages) >= MIN_PAGES_FOR_PARALLEL:
+        text = extract_text_parallel(pdf_source, workers, engine=engine, page_indexes=pages)
+    else:
+        text = _join_pages(t for _, t in iter_page_texts(pdf_source, pages, engine=engine))
+
+    if key is not None:
+        cache_put(key, text)
+    return text
+
+
+# =========================
+# EXTRACTION CACHE
+# =========================
+def pdf_cache_key(pdf_source, engine: str = None) -> str:
+    """
+    SHA-256 dari isi file PDF + nama & versi engine
+    (ikut masuk key karena hasil extract_text beda antar engine / versi).
+    """
+    name, _, version = _get_engine(engine)
+    return f"{digest(pdf_source)}-{name}{version}"
+
+
+def section_filter_key() -> str:
+    """
+    Hash config filter halaman (heading section + ALWAYS_PAGES), ikut
+    key cache extract_section_text: config berubah -> cache lama tidak dipakai.
+    """
+    config = json.dumps([SECTION_HEADINGS, list(ALWAYS_PAGES)], sort_keys=True)
+    return hashlib.sha256(config.encode("utf-8")).hexdigest()[:12]
+
+
+def _cache_path(key: str) -> str:
+    return os.path.join(CACHE_DIR, f"{key}.txt")
+
+
+def cache_get(key: str):
+    """
+    Return teks dari cache, atau None kalau belum ada.
+    Hit akan update mtime file (dipakai sebagai urutan LRU).
+    """
+    path = _cache_path(key)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+    except FileNotFoundError:
+        return None
+
+    try:
+        os.utime(path)
+    except OSError:
+        # bisa saja sudah di-evict worker lain, hasil tetap valid
+        pass
     return text
+
+
+def cache_put(key: str, text: str):
+    """
+    Tulis atomik: tulis ke file temp di folder yang sama, lalu os.replace.
+    Worker lain tidak akan pernah membaca file setengah jadi.
+    """
+    os.makedirs(CACHE_DIR, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, _cache_path(key))
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    _evict_cache(CACHE_MAX_BYTES)
+
+
+def _evict_cache(max_bytes: int):
+    """
+    Buang entry dengan mtime paling lama sampai total ukuran <= max_bytes.
+    """
+    entries = []
+    total = 0
+    with os.scandir(CACHE_DIR) as it:
+        for entry in it:
+            if not entry.name.endswith(".txt"):
+                continue
+            try:
+                st = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, entry.path))
+            total += st.st_size
+
+    entries.sort()
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            # sudah dihapus worker lain
+            pass
+        total -= size
+
+
+# =========================
+# EXTRACT TEXT
+# =========================
+def extract_text_parallel(pdf_source, workers: int, n_pages: int = None, engine: str = None,
+                          page_indexes: list = None) -> str:
+    """
+    Ekstrak teks dengan membagi range halaman ke beberapa proses.
+    Hasil digabung lagi sesuai urutan halaman, jadi output identik
+    dengan extract_text() versi serial.
+    page_indexes : hanya halaman ini (urut), None = semua halaman.
+    """
+    if not is_path(pdf_source):
+        # stream / bytes tidak bisa dibuka ulang oleh proses lain,
+        # jadi isi PDF dikirim ke worker sebagai bytes
+        pdf_source = read_bytes(pdf_source)
+
+    if page_indexes is None:
+        if n_pages is None:
+            n_pages = _count_pages(pdf_source)
+        page_indexes = range(n_pages)
+    page_indexes = list(page_indexes)
+    # nama (bukan fn) yang dikirim ke worker
+    engine, _, _ = _get_engine(engine)
+    ranges = _split_page_ranges(len(page_indexes), workers)
+
+    with ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+        futures = [
+            pool.submit(_extract_pages, pdf_source, page_indexes[start:stop], engine)
+            for start, stop in ranges
+        ]
+        # ambil hasil sesuai urutan submit (= urutan halaman)
+        page_texts = [t for f in futures for t in f.result()]
+
+    return _join_pages(page_texts)
+
+
+def extract_text(pdf_source, workers: int = None, use_cache: bool = None, engine: str = None) -> str:
+    """
+    pdf_source: path, bytes, atau file-like (misal upload Streamlit)
+    workers   : jumlah proses. None = pakai EXTRACT_WORKERS,
+                0 / 1 = serial.
+    engine    : engine ekstraksi (lihat ENGINES). None = pakai EXTRACT_ENGINE.
+    use_cache : None = pakai CACHE_ENABLED. Kalau PDF yang sama persis
+                sudah pernah diekstrak, teks diambil dari cache tanpa
+                membuka PDF sama sekali.
+    """
+    if use_cache is None:
+        use_cache = CACHE_ENABLED
+
+    if use_cache:
+        key = pdf_cache_key(pdf_source, engine)
+        cached = cache_get(key)
+        if cached is not None:
+            return cached
+
+        text = extract_text(pdf_source, workers=workers, use_cache=False, engine=engine)
+        cache_put(key, text)
+        return text
+
+    if workers is None:
+        workers = EXTRACT_WORKERS
+
+    if workers > 1:
+        n_pages = _count_pages(pdf_source)
+        if n_pages >= MIN_PAGES_FOR_PARALLEL:
+            return extract_text_parallel(pdf_source, workers, n_pages, engine=engine)
+
+    return _join_pages(t for _, t in iter_page_texts(pdf_source, engine=engine))
@@ -0,0 +1,417 @@
+# fake_google.py
+# Backend Google Sheets & Drive palsu di memory, untuk benchmark / test
+# offline tanpa kredensial. Latency per request dan kuota bisa diatur,
+# jadi jumlah request & waktu process_pdf bisa diukur dan diulang persis.
+#
+# Aktifkan lewat env GOOGLE_BACKEND=fake (lihat google_clients.py):
+#   FAKE_GOOGLE_LATENCY       detik per request (default 0)
+#   FAKE_SHEETS_QUOTA         maks request Sheets per FAKE_QUOTA_WINDOW detik
+#   FAKE_DRIVE_QUOTA          maks request Drive per FAKE_QUOTA_WINDOW detik
+#   FAKE_QUOTA_WINDOW         default 60 (kuota Google dihitung per menit)
+#   FAKE_THROTTLE=1           token bucket scheduler.API_RATES seperti API asli
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from collections import Counter, deque
+
+import gspread
+import httplib2
+import requests
+from googleapiclient.errors import HttpError
+from gspread.utils import a1_range_to_grid_range, a1_to_rowcol
+
+from scheduler import API_RATES, Scheduler
+from tracing import record_api_call
+
+
+# =========================
+# BACKEND (LATENCY, KUOTA, COUNTER)
+# =========================
+# request yang di API asli tidak aman diulang (scheduler idempotent=False)
+NON_IDEMPOTENT_METHODS = {
+    "sheets.batch_update",
+    "drive.files.create",
+}
+
+
+def _quota_error(api: str):
+    """
+    Error 429 dengan tipe yang sama seperti library aslinya,
+    supaya kode retry / backoff bisa dites offline.
+    """
+    body = {"error": {"code": 429, "message": f"Quota exceeded ({api})", "status": "RESOURCE_EXHAUSTED"}}
+
+    if api == "sheets":
+        response = requests.Response()
+        response.status_code = 429
+        response._content = json.dumps(body).encode()
+        return gspread.exceptions.APIError(response)
+
+    return HttpError(httplib2.Response({"status": 429}), json.dumps(body).encode())
+
+
+class FakeBackend:
+    """
+    Pusat semua spreadsheet & file Drive palsu.
+
+    latency      : detik per request, atau dict {"sheets.<method>" / "drive.<method>": detik}
+                   (key yang tidak ada pakai latency["default"], kalau ada)
+    sheets_quota : maks request Sheets per quota_window detik (None = tanpa batas)
+                   -> lebih dari itu server palsu menjawab 429
+    drive_quota  : idem untuk Drive
+    scheduler    : Scheduler yang dilewati semua request palsu (seperti
+                   API asli). Default tanpa token bucket, hanya retry.
+    """
+
+    def __init__(self, latency=0.0, sheets_quota=None, drive_quota=None, quota_window=60.0, scheduler=None):
+        self.latency = latency
+        self.quotas = {"sheets": sheets_quota, "drive": drive_quota}
+        self.quota_window = quota_window
+        self.scheduler = scheduler if scheduler is not None else Scheduler()
+
+        self.counts = Counter()  # "sheets.values_batch_get" -> n
+        self.rejected = Counter()  # request yang kena 429
+        self.spreadsheets = {}  # key -> FakeSpreadsheet
+        self.drive_files = {}  # id -> metadata
+
+        self._windows = {"sheets": deque(), "drive": deque()}
+        self._lock = threading.Lock()
+
+    def _latency_for(self, name: str) -> float:
+        if isinstance(self.latency, dict):
+            return self.latency.get(name, self.latency.get("default", 0.0))
+        return self.latency
+
+    def call(self, api: str, method: str, bytes_sent: int = 0):
+        """
+        Dipanggil di awal tiap request palsu, lewat scheduler: cek kuota,
+        hitung, lalu tidur selama latency (di luar lock, jadi request
+        paralel tetap paralel). 429 di-retry scheduler seperti API asli.
+        bytes_sent : perkiraan ukuran body request (untuk tracing).
+        """
+        self.scheduler.run(
+            api,
+            lambda: self._request(api, method, bytes_sent),
+            idempotent=f"{api}.{method}" not in NON_IDEMPOTENT_METHODS,
+        )
+
+    def _request(self, api: str, method: str, bytes_sent: int):
+        record_api_call(api, bytes_sent=bytes_sent)
+        name = f"{api}.{method}"
+        with self._lock:
+            limit = self.quotas[api]
+            if limit is not None:
+                window = self._windows[api]
+                now = time.monotonic()
+                while window and now - window[0] >= self.quota_window:
+                    window.popleft()
+                if len(window) >= limit:
+                    self.rejected[name] += 1
+                    raise _quota_error(api)
+                window.append(now)
+            self.counts[name] += 1
+
+        delay = self._latency_for(name)
+        if delay:
+            time.sleep(delay)
+
+    def request_counts(self) -> dict:
+        """
+        {"sheets": n, "drive": n} -> total request per API.
+        """
+        totals = {"sheets": 0, "drive": 0}
+        for name, n in self.counts.items():
+            totals[name.split(".", 1)[0]] += n
+        return totals
+
+    def reset_counts(self):
+        with self._lock:
+            self.counts.clear()
+            self.rejected.clear()
+            for window in self._windows.values():
+                window.clear()
+
+    # ---------- SHEETS ----------
+    def spreadsheet(self, name: str = None, key: str = None):
+        """
+        Spreadsheet palsu berdasarkan key (atau nama), dibuat kalau belum ada.
+        """
+        key = key or name or "fake-spreadsheet"
+        with self._lock:
+            if key not in self.spreadsheets:
+                self.spreadsheets[key] = FakeSpreadsheet({}, backend=self, key=key)
+            return self.spreadsheets[key]
+
+    # ---------- DRIVE ----------
+    def drive_service(self):
+        return FakeDriveService(self)
+
+
+# =========================
+# GOOGLE SHEETS (gspread)
+# =========================
+class FakeWorksheet:
+    """Worksheet minimal di memory; semua request lewat FakeSpreadsheet."""
+
+    def __init__(self, rows=None):
+        self.rows = [list(r) for r in (rows or [])]
+
+
+class FakeSpreadsheet:
+    """Spreadsheet minimal: hanya batch API yang dipakai SheetWriteBatch."""
+
+    def __init__(self, sheets, backend=None, key="fake-spreadsheet"):
+        self.id = key
+        self.title = key
+        self.backend = backend
+        self.sheets = {}
+        for title, rows in sheets.items():
+            self._add(title, rows)
+        self.calls = []
+
+    def _call(self, method: str, body=None):
+        self.calls.append(method)
+        if self.backend is not None:
+            sent = len(json.dumps(body, default=str)) if body is not None else 0
+            self.backend.call("sheets", method, bytes_sent=sent)
+
+    def _add(self, title, rows, row_count=None):
+        ws = FakeWorksheet(rows)
+        ws.title = title
+        ws.id = len(self.sheets) + 100
+        ws.row_count = row_count if row_count is not None else max(len(ws.rows), 1)
+        self.sheets[title] = ws
+        return ws
+
+    def _by_id(self, sheet_id):
+        return next(ws for ws in self.sheets.values() if ws.id == sheet_id)
+
+    @staticmethod
+    def _split(range_name):
+        title, a1 = range_name.rsplit("!", 1)
+        return title.strip("'"), a1
+
+    def worksheets(self):
+        self._call("worksheets")
+        return list(self.sheets.values())
+
+    def values_batch_get(self, ranges, params=None):
+        self._call("values_batch_get")
+        columns = (params or {}).get("majorDimension") == "COLUMNS"
+        out = []
+        for r in ranges:
+            title, a1 = self._split(r)
+            values = self._read_range(self.sheets[title], a1, columns)
+            out.append({"values": values} if values else {})
+        return {"valueRanges": out}
+
+    @staticmethod
+    def _read_range(ws, a1, columns):
+        # seperti API asli: cell / baris kosong di ujung range tidak dikirim
+        grid = a1_range_to_grid_range(a1)
+        rows = ws.rows[grid.get("startRowIndex", 0):grid.get("endRowIndex")]
+        c0, c1 = grid.get("startColumnIndex", 0), grid.get("endColumnIndex")
+        width = max((len(row) for row in rows), default=0)
+        cells = [(list(row) + [""] * width)[c0:c1 if c1 is not None else width] for row in rows]
+        if columns:
+            cells = [list(col) for col in zip(*cells)]
+
+        def trim(values):
+            while values and values[-1] in ("", []):
+                values.pop()
+            return values
+
+        return trim([trim(v) for v in cells])
+
+    def batch_update(self, body):
+        self._call("batch_update", body)
+        replies = []
+        for req in body["requests"]:
+            (kind, b), = req.items()
+            if kind == "addSheet":
+                title = b["properties"]["title"]
+                rc = b["properties"]["gridProperties"]["rowCount"]
+                ws = self._add(title, [], row_count=rc)
+                ws.hidden = b["properties"].get("hidden", False)
+                replies.append({"addSheet": {"properties": {
+                    "title": title, "sheetId": ws.id, "gridProperties": {"rowCount": rc},
+                }}})
+                continue
+            if kind == "appendDimension":
+                self._by_id(b["sheetId"]).row_count += b["length"]
+                continue
+            if kind == "updateCells":
+                ws = self._by_id(b["range"]["sheetId"])
+                for offset, row in enumerate(b["rows"]):
+                    idx = b["range"]["startRowIndex"] + offset
+                    while len(ws.rows) <= idx:
+                        ws.rows.append([])
+                    cells = ws.rows[idx]
+                    for c, value in enumerate(row["values"], start=b["range"]["startColumnIndex"]):
+                        cells.extend([""] * (c + 1 - len(cells)))
+                        cells[c] = next(iter(value["userEnteredValue"].values()))
+                replies.append({})
+                continue
+            ws = self._by_id(b["range"]["sheetId"])
+            start, end = b["range"]["startIndex"], b["range"]["endIndex"]
+            assert end <= ws.row_count
+            if kind == "insertDimension":
+                ws.rows[start:start] = [[] for _ in range(end - start)]
+                ws.row_count += end - start
+            else:
+                del ws.rows[start:end]
+                ws.row_count -= end - start
+            replies.append({})
+        return {"replies": replies}
+
+    def values_batch_update(self, body):
+        self._call("values_batch_update", body)
+        for item in body["data"]:
+            title, a1 = self._split(item["range"])
+            ws = self.sheets[title]
+            start, col = a1_to_rowcol(a1)
+            assert start - 1 + len(item["values"]) <= ws.row_count
+            for offset, row in enumerate(item["values"]):
+                idx = start - 1 + offset
+                while len(ws.rows) <= idx:
+                    ws.rows.append([])
+                if col == 1:
+                    ws.rows[idx] = list(row)
+                    continue
+                # mulai dari kolom tengah: cell lain di baris itu tidak berubah
+                cells = ws.rows[idx]
+                cells.extend([""] * (col - 1 + len(row) - len(cells)))
+                cells[col - 1:col - 1 + len(row)] = list(row)
+
+
+# =========================
+# GOOGLE DRIVE (googleapiclient)
+# =========================
+_QUERY_NAME = re.compile(r"name='([^']*)'")
+_QUERY_PARENT = re.compile(r"'([^']*)' in parents")
+_QUERY_MIME = re.compile(r"mimeType='([^']*)'")
+
+
+class _FakeRequest:
+    """Pengganti HttpRequest: kerja baru dilakukan saat execute()."""
+
+    def __init__(self, backend, method, fn, media_body=None):
+        self._backend = backend
+        self._method = method
+        self._fn = fn
+        self._media_body = media_body
+
+    def execute(self):
+        sent = self._media_body.size() if self._media_body is not None else 0
+        self._backend.call("drive", self._method, bytes_sent=sent)
+        return self._fn()
+
+
+class _FakeFiles:
+    """Subset files() yang dipakai upload_to_drive.py: list / create / update."""
+
+    def __init__(self, backend):
+        self._backend = backend
+
+    def _store(self, file_id, metadata, media_body):
+        files = self._backend.drive_files
+        with self._backend._lock:
+            meta = files.setdefault(file_id, {"id": file_id, "parents": []})
+            meta.update(metadata)
+            meta["webViewLink"] = f"https://drive.google.com/file/d/{file_id}/view"
+            if media_body is not None:
+                content = media_body.getbytes(0, media_body.size())
+                meta["md5Checksum"] = hashlib.md5(content).hexdigest()
+                meta["size"] = str(len(content))
+            return dict(meta)
+
+    def list(self, q="", spaces=None, fields=None, **kwargs):
+        def run():
+            name = _QUERY_NAME.search(q)
+            parent = _QUERY_PARENT.search(q)
+            mime = _QUERY_MIME.search(q)
+            with self._backend._lock:
+                found = [
+                    dict(f)
+                    for f in self._backend.drive_files.values()
+                    if (name is None or f.get("name") == name.group(1))
+                    and (parent is None or parent.group(1) in f.get("parents", []))
+                    and (mime is None or f.get("mimeType") == mime.group(1))
+                ]
+            return {"files": found}
+
+        return _FakeRequest(self._backend, "files.list", run)
+
+    def create(self, body=None, media_body=None, fields=None, **kwargs):
+        file_id = uuid.uuid4().hex
+        return _FakeRequest(
+            self._backend,
+            "files.create",
+            lambda: self._store(file_id, dict(body or {}), media_body),
+            media_body,
+        )
+
+    def update(self, fileId=None, body=None, media_body=None, fields=None, **kwargs):
+        return _FakeRequest(
+            self._backend,
+            "files.update",
+            lambda: self._store(fileId, dict(body or {}), media_body),
+            media_body,
+        )
+
+
+class FakeDriveService:
+    def __init__(self, backend):
+        self._backend = backend
+
+    def files(self):
+        return _FakeFiles(self._backend)
+
+
+# =========================
+# SINGLETON (DIPAKAI google_clients.py)
+# =========================
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def _optional_int(value):
+    return int(value) if value else None
+
+
+def backend_from_env() -> FakeBackend:
+    return FakeBackend(
+        latency=float(os.environ.get("FAKE_GOOGLE_LATENCY", "0")),
+        sheets_quota=_optional_int(os.environ.get("FAKE_SHEETS_QUOTA")),
+        drive_quota=_optional_int(os.environ.get("FAKE_DRIVE_QUOTA")),
+        quota_window=float(os.environ.get("FAKE_QUOTA_WINDOW", "60")),
+        scheduler=Scheduler(API_RATES) if os.environ.get("FAKE_THROTTLE") == "1" else None,
+    )
+
+
+def get_backend() -> FakeBackend:
+    """
+    Backend palsu bersama 1 proses (dibuat dari env saat pertama dipakai).
+    """
+    global _backend
+
+    with _backend_lock:
+        if _backend is None:
+            _backend = backend_from_env()
+        return _backend
+
+
+def set_backend(backend: FakeBackend = None):
+    """
+    Ganti backend bersama (misal dengan latency / kuota tertentu di benchmark).
+    None = buat ulang dari env saat dipakai berikutnya.
+    """
+    global _backend
+
+    with _backend_lock:
+        _backend = backend
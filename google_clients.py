@@ -0,0 +1,271 @@
+# google_clients.py
+# Pool client Google API (Sheets & Drive) yang dipakai ulang antar run
+# dalam 1 proses: credentials, token, discovery document, dan handle
+# Spreadsheet cukup dibuat sekali.
+
+import json
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+
+import gspread
+import streamlit as st
+from google.auth.transport.requests import Request
+from google.oauth2 import service_account
+from google.oauth2.credentials import Credentials as UserCredentials
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient import discovery_cache
+from googleapiclient.discovery import build, build_from_document
+from googleapiclient.http import build_http
+from gspread.http_client import HTTPClient
+
+from scheduler import get_scheduler
+from tracing import record_api_call
+
+# =========================
+# CONFIG
+# =========================
+# Token di-refresh kalau sisa umurnya kurang dari ini
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+
+# "google" = API asli, "fake" = backend di memory (fake_google.py) untuk
+# benchmark / test offline tanpa kredensial
+BACKEND = os.environ.get("GOOGLE_BACKEND", "google")
+
+# =========================
+# STATE (PROCESS-WIDE)
+# =========================
+_lock = threading.RLock()
+
+_sheets_creds = None
+_sheets_client = None
+_spreadsheets = {}  # key -> Spreadsheet
+_spreadsheet_keys = {}  # nama -> key (hasil 1x pencarian di Drive)
+
+_drive_creds = None
+_drive_generation = 0  # naik tiap reset_clients(), service lama dibuang
+_drive_discovery_doc = None
+# service googleapiclient (httplib2) tidak thread-safe -> 1 service per thread
+_drive_local = threading.local()
+
+
+# =========================
+# TOKEN
+# =========================
+def _utcnow():
+    # google-auth menyimpan expiry sebagai datetime UTC tanpa tzinfo
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def refresh_if_needed(creds) -> bool:
+    """
+    Refresh access token SEBELUM kadaluarsa (bukan menunggu 401).
+    Return True kalau token baru saja di-refresh.
+    """
+    with _lock:
+        expiry = getattr(creds, "expiry", None)
+        if creds.token and expiry is not None and expiry - _utcnow() > TOKEN_REFRESH_MARGIN:
+            return False
+
+        creds.refresh(Request())
+        return True
+
+
+# =========================
+# HTTP TRACING + SCHEDULER
+# =========================
+class TracedHTTPClient(HTTPClient):
+    """
+    HTTP client gspread: tiap request lewat scheduler (token bucket +
+    retry 429 / 5xx, lihat scheduler.py) dan dicatat (jumlah & bytes)
+    ke span tracing yang sedang aktif, termasuk percobaan yang gagal.
+    """
+
+    def request(self, method, endpoint, *args, **kwargs):
+        return get_scheduler().run(
+            "sheets",
+            lambda: self._send(method, endpoint, *args, **kwargs),
+            idempotent=_sheets_idempotent(method, endpoint),
+        )
+
+    def _send(self, *args, **kwargs):
+        try:
+            response = super().request(*args, **kwargs)
+        except gspread.exceptions.APIError as e:
+            _record_response("sheets", e.response)
+            raise
+        _record_response("sheets", response)
+        return response
+
+
+def _sheets_idempotent(method: str, endpoint: str) -> bool:
+    """
+    True kalau request Sheets aman diulang walaupun server sudah
+    menjalankannya: baca, dan tulis nilai ke range absolut
+    (values:batchUpdate / update / clear). batchUpdate spreadsheet
+    (insert / delete / append baris, addSheet) dan values:append tidak.
+    """
+    if method.upper() in ("GET", "PUT"):
+        return True
+    return "/values" in endpoint and endpoint.rsplit(":", 1)[-1] in ("batchUpdate", "batchClear", "clear")
+
+
+def _record_response(api: str, response):
+    body = response.request.body if response.request is not None else None
+    record_api_call(api, bytes_sent=len(body or b""), bytes_received=len(response.content or b""))
+
+
+class TracedHttp:
+    """
+    Pembungkus http (httplib2) untuk googleapiclient, sama seperti
+    TracedHTTPClient tapi untuk Drive. httplib2 tidak raise untuk 429 /
+    5xx, jadi status response yang dicek scheduler.
+    """
+
+    def __init__(self, api: str, http):
+        self._api = api
+        self._http = http
+
+    def request(self, uri, method="GET", body=None, headers=None, **kwargs):
+        def send():
+            resp, content = self._http.request(uri, method=method, body=body, headers=headers, **kwargs)
+            sent = len(body) if isinstance(body, (bytes, str)) else 0
+            record_api_call(self._api, bytes_sent=sent, bytes_received=len(content or b""))
+            return resp, content
+
+        # POST = buat file / folder baru, retry setelah 5xx bisa bikin duplikat
+        return get_scheduler().run(
+            self._api, send, status=lambda result: result[0].status, idempotent=method.upper() != "POST"
+        )
+
+    def __getattr__(self, name):
+        return getattr(self._http, name)
+
+
+# =========================
+# GOOGLE SHEETS
+# =========================
+def get_sheets_client(scopes: list):
+    """
+    gspread client dari service account di st.secrets, dibuat sekali per proses.
+    """
+    global _sheets_creds, _sheets_client
+
+    with _lock:
+        if _sheets_client is None:
+            # Ambil JSON mentah dari secrets, lalu parse jadi dict
+            info = json.loads(st.secrets["gcp_service_account"]["json"])
+
+            _sheets_creds = service_account.Credentials.from_service_account_info(
+                info,
+                scopes=scopes,
+            )
+            _sheets_client = gspread.authorize(_sheets_creds, http_client=TracedHTTPClient)
+
+        refresh_if_needed(_sheets_creds)
+        return _sheets_client
+
+
+def get_spreadsheet(scopes: list, name: str = None, key: str = None):
+    """
+    Handle Spreadsheet yang di-cache berdasarkan KEY.
+
+    Kalau cuma ada nama, pencarian nama -> key (query ke Drive) hanya
+    dilakukan sekali; run berikutnya langsung pakai key.
+    """
+    if BACKEND == "fake":
+        import fake_google
+
+        return fake_google.get_backend().spreadsheet(name=name, key=key)
+
+    client = get_sheets_client(scopes)
+
+    with _lock:
+        if key is None:
+            key = _spreadsheet_keys.get(name)
+
+        if key is not None and key in _spreadsheets:
+            return _spreadsheets[key]
+
+        if key is not None:
+            spreadsheet = client.open_by_key(key)
+        else:
+            spreadsheet = client.open(name)
+            _spreadsheet_keys[name] = spreadsheet.id
+
+        _spreadsheets[spreadsheet.id] = spreadsheet
+        return spreadsheet
+
+
+# =========================
+# GOOGLE DRIVE
+# =========================
+def _get_drive_creds(scopes: list):
+    global _drive_creds
+
+    with _lock:
+        if _drive_creds is None:
+            oauth = st.secrets["gcp_oauth"]
+            _drive_creds = UserCredentials(
+                token=None,  # di-refresh dari refresh_token
+                refresh_token=oauth["refresh_token"],
+                token_uri=oauth["token_uri"],
+                client_id=oauth["client_id"],
+                client_secret=oauth["client_secret"],
+                scopes=scopes,
+            )
+
+        refresh_if_needed(_drive_creds)
+        return _drive_creds
+
+
+def _get_drive_discovery_doc():
+    global _drive_discovery_doc
+
+    with _lock:
+        if _drive_discovery_doc is None:
+            # discovery doc bawaan googleapiclient, tanpa request ke network
+            _drive_discovery_doc = discovery_cache.get_static_doc("drive", "v3")
+        return _drive_discovery_doc
+
+
+def get_drive_service(scopes: list):
+    """
+    Drive v3 service milik thread ini. Credentials & discovery doc
+    dipakai bersama oleh semua thread.
+    """
+    if BACKEND == "fake":
+        import fake_google
+
+        return fake_google.get_backend().drive_service()
+
+    creds = _get_drive_creds(scopes)
+
+    cached = getattr(_drive_local, "service", None)
+    if cached is not None and cached[0] == _drive_generation:
+        return cached[1]
+
+    http = TracedHttp("drive", AuthorizedHttp(creds, http=build_http()))
+    doc = _get_drive_discovery_doc()
+    if doc is None:
+        service = build("drive", "v3", http=http)
+    else:
+        service = build_from_document(doc, http=http)
+
+    _drive_local.service = (_drive_generation, service)
+    return service
+
+
+def reset_clients():
+    """
+    Lupakan semua client yang di-cache (misal setelah ganti secrets).
+    """
+    global _sheets_creds, _sheets_client, _drive_creds, _drive_generation
+
+    with _lock:
+        _sheets_creds = None
+        _sheets_client = None
+        _spreadsheets.clear()
+        _spreadsheet_keys.clear()
+        _drive_creds = None
+        _drive_generation += 1
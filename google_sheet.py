@@ -1,7 +1,9 @@
-import json
-import gspread
-import streamlit as st
-from google.oauth2.service_account import Credentials
+import os
+import threading
+
+from gspread.utils import a1_to_rowcol, absolute_range_name, rowcol_to_a1
+
+from google_clients import get_spreadsheet
 
 # =========================
 # CONFIG
@@ -11,186 +13,721 @@ SCOPES = [
     "https://www.googleapis.com/auth/drive",
 ]
 
+FINANCIAL_HEADER = ["Period", "Account", "Value"]
+
+KPI_HEADER = [
+    "Period",
+    "Category",
+    "KPI Name",
+    "Result",
+    "Result Unit",
+    "Target",
+    "Target Unit",
+    "Trend",
+    "Trend Unit",
+    "Importance",
+]
+
+META_HEADER = ["Period", "PDF Drive Link"]
+
+# Index period -> range baris tiap worksheet, disimpan di worksheet
+# tersembunyi PERIOD_INDEX_SHEET dan di-update SheetWriteBatch di setiap
+# commit. Posisi period dibaca dari index (bersama header, 1 request),
+# bukan dari kolom A, jadi ukuran yang dibaca tidak ikut membesar
+# dengan jumlah baris history. SHEET_PERIOD_INDEX=0 -> baca kolom A.
+PERIOD_INDEX = os.environ.get("SHEET_PERIOD_INDEX", "1") != "0"
+PERIOD_INDEX_SHEET = "_INDEX"
+PERIOD_INDEX_HEADER = ["Worksheet", "Period", "First Row", "Last Row"]
+# baris index per worksheet untuk jumlah baris terpakai (termasuk header)
+PERIOD_INDEX_EXTENT = "*"
+# Cell penanda index basi: diisi bersama insert / delete baris (1 batch_update,
+# atomic), dikosongkan bersama tulis nilai + index baru (1 values_batch_update).
+# Kalau tulis nilai gagal, penanda tetap ada dan commit berikutnya membangun
+# ulang index dari kolom A.
+PERIOD_INDEX_DIRTY_CELL = "E1"
+PERIOD_INDEX_DIRTY = "dirty"
+
 
 # =========================
 # CONNECT TO GOOGLE SHEET
 # =========================
-def connect_sheet(spreadsheet_name: str):
+def connect_sheet(spreadsheet_name: str = None, key: str = None):
     """
-    Connect to Google Spreadsheet by NAME
+    Connect to Google Spreadsheet by KEY (atau NAMA kalau key belum ada)
     (Streamlit Cloud compatible)
 
     Di secrets.toml:
 
     [gcp_service_account]
     json = \"\"\"{ ...JSON service account dari Google... }\"\"\"
+
+    Client gspread & handle Spreadsheet di-cache per proses
+    (lihat google_clients.py), jadi run berikutnya tidak perlu
+    authorize / cari spreadsheet lagi.
     """
+    return get_spreadsheet(SCOPES, name=spreadsheet_name, key=key)
 
-    # Ambil JSON mentah dari secrets, lalu parse jadi dict
-    info = json.loads(st.secrets["gcp_service_account"]["json"])
 
-    # Buat credentials dari dict JSON
-    creds = Credentials.from_service_account_info(
-        info,
-        scopes=SCOPES,
-    )
+# =========================
+# ROW HELPERS
+# =========================
+def _row_runs(row_numbers: list) -> list:
+    """
+    [5, 6, 7, 10, 11] -> [(5, 7), (10, 11)]
+    """
+    runs = []
+    for n in row_numbers:
+        if runs and n == runs[-1][1] + 1:
+            runs[-1] = (runs[-1][0], n)
+        else:
+            runs.append((n, n))
+    return runs
 
-    # Authorize gspread dengan credentials ini
-    client = gspread.authorize(creds)
 
-    # Buka spreadsheet berdasarkan NAMA
-    return client.open(spreadsheet_name)
+def _to_cells(rows: list) -> list:
+    # None di values.update artinya "skip cell", bukan "kosongkan cell"
+    return [["" if v is None else v for v in row] for row in rows]
+
+
+def financial_rows(period: str, data: dict) -> list:
+    """
+    dict {Account: value} -> baris [Period, Account, Value]
+    """
+    return [[period, account, value] for account, value in data.items()]
 
 
 # =========================
-# GET OR CREATE WORKSHEET
+# BATCH WRITE (SEMUA WORKSHEET SEKALIGUS)
 # =========================
-def get_or_create_worksheet(sheet, title: str, rows: int = 1000, cols: int = 10):
+_spreadsheet_locks = {}
+_spreadsheet_locks_guard = threading.Lock()
+# spreadsheet id -> jumlah commit; kalau berubah sejak commit terakhir
+# batch ini, metadata worksheet (row_count) yang di-cache sudah basi
+_spreadsheet_commits = {}
+
+
+def spreadsheet_lock(sheet) -> threading.Lock:
     """
-    Get worksheet if exists, otherwise create it.
+    Lock per spreadsheet (per proses). SheetWriteBatch membaca posisi
+    baris lalu menulis ke nomor baris absolut, jadi commit lain ke
+    spreadsheet yang sama tidak boleh menyelip di antaranya.
+    Tidak melindungi dari proses lain yang menulis ke spreadsheet sama.
     """
-    try:
-        return sheet.worksheet(title)
-    except gspread.exceptions.WorksheetNotFound:
-        return sheet.add_worksheet(
-            title=title,
-            rows=rows,
-            cols=cols,
-        )
+    with _spreadsheet_locks_guard:
+        return _spreadsheet_locks.setdefault(sheet.id, threading.Lock())
+
+
+class SheetWriteBatch:
+    """
+    Kumpulkan upsert per period untuk beberapa worksheet, lalu kirim
+    sekaligus di commit():
+
+        1. worksheets()            -> daftar worksheet + sheetId   (1 request)
+        2. batch_update addSheet   -> worksheet yang belum ada    (0/1 request)
+        3. values_batch_get        -> header + index period       (1 request)
+        4. batch_update            -> insert / delete / append row
+                                      + tandai index basi          (0/1 request)
+        5. values_batch_update     -> header + baris / cell baru
+                                      + index period baru          (0/1 request)
+
+    Posisi baris tiap period diambil dari index period (PERIOD_INDEX_SHEET),
+    jadi berapapun history-nya langkah 3 tetap 1 request dan tidak membaca
+    kolom A. Worksheet lama yang belum ada di index dibaca kolom A-nya
+    sekali (1 request tambahan), setelah itu masuk index. Index yang
+    ditandai basi (langkah 5 gagal setelah langkah 4) dibangun ulang dari
+    kolom A untuk semua worksheet di index, termasuk yang tidak ikut commit.
+    rebuild_index=True : abaikan index, baca kolom A semua worksheet dan
+    tulis ulang index (setelah sheet diedit manual / ditulis tanpa batch).
+
+    Jumlah request yang benar-benar dikirim dicatat di self.requests,
+    ukuran perubahan (cell / baris) di self.diff_stats.
+    commit() bisa dipanggil lebih dari sekali; metadata worksheet dari
+    commit pertama dipakai ulang (langkah 1 tidak diulang), kecuali ada
+    batch lain yang commit ke spreadsheet yang sama di antaranya.
+    """
+
+    def __init__(self, sheet, use_index: bool = None, rebuild_index: bool = False):
+        self.sheet = sheet
+        self.use_index = PERIOD_INDEX if use_index is None else use_index
+        self.rebuild_index = rebuild_index
+        self.requests = 0
+        self.diff_stats = {
+            "cells_updated": 0,
+            "rows_inserted": 0,
+            "rows_deleted": 0,
+            "rows_unchanged": 0,
+            "rows_rewritten": 0,
+        }
+        self._pending = []  # (title, header, period, rows, previous)
+        self._props = None  # {title: {"id": ..., "row_count": ...}}
+        self._commit_seen = None  # _spreadsheet_commits saat commit terakhir batch ini
+        self._created = set()  # worksheet yang dibuat batch ini (pasti kosong)
+        self._index = {}  # {title: (jumlah baris, [(period, first, last)])}
+        self._index_length = 0  # jumlah baris index di sheet saat dibaca
+        self._index_dirty = False  # index dibangun ulang dari kolom A di commit ini
+
+    def upsert_period(self, title: str, header: list, period: str, rows: list):
+        """
+        Antrikan: ganti semua baris `period` di worksheet `title` dengan `rows`.
+        """
+        self._pending.append((title, list(header), period, _to_cells(rows), None))
+
+    def diff_period(self, title: str, header: list, period: str, old_rows: list, rows: list, key_columns: int):
+        """
+        Seperti upsert_period, tapi `old_rows` = isi period ini di sheet
+        saat ini (snapshot sync terakhir). Yang dikirim hanya cell yang
+        berubah + baris yang ditambah / dihapus, dicocokkan lewat
+        key_columns kolom pertama, misal 2 = (Period, Account).
+        Kalau sheet ternyata tidak sesuai snapshot, period ditulis ulang
+        penuh seperti upsert_period.
+        """
+        previous = (_to_cells(old_rows), key_columns)
+        self._pending.append((title, list(header), period, _to_cells(rows), previous))
+
+    def pending_rows(self) -> dict:
+        """
+        {title: jumlah baris} yang menunggu commit (untuk tracing / log).
+        """
+        counts = {}
+        for title, _, _, rows, _ in self._pending:
+            counts[title] = counts.get(title, 0) + len(rows)
+        return counts
+
+    def commit(self) -> int:
+        """
+        Kirim semua perubahan yang diantrikan. Return total request.
+        Baca + tulis dijalankan di dalam spreadsheet_lock(), jadi commit
+        dari job / thread lain ke spreadsheet yang sama menunggu giliran.
+        """
+        if not self._pending:
+            return self.requests
+
+        with spreadsheet_lock(self.sheet):
+            if _spreadsheet_commits.get(self.sheet.id, 0) != self._commit_seen:
+                self._props = None
+            try:
+                return self._commit()
+            finally:
+                # gagal di tengah pun posisi baris mungkin sudah berubah
+                self._commit_seen = _spreadsheet_commits.get(self.sheet.id, 0) + 1
+                _spreadsheet_commits[self.sheet.id] = self._commit_seen
+
+    def _commit(self) -> int:
+        headers = {}
+        for title, header, _, _, _ in self._pending:
+            headers.setdefault(title, header)
+
+        titles = list(headers)
+        if self.use_index:
+            titles.append(PERIOD_INDEX_SHEET)
+        props = self._ensure_worksheets(titles)
+        grids = self._read_grids(headers)
+
+        dim_requests = []
+        for title, header, period, rows, previous in self._pending:
+            grid = grids[title]
+            # header kosong / tidak sesuai -> tulis ulang header
+            if not grid:
+                grid.append(("new", header))
+            elif grid[0][0] == "old" and grid[0][1][: len(header)] != header:
+                grid[0] = ("new", header)
+
+            requests = None
+            if previous is not None:
+                requests = _plan_grid_diff(grid, props[title], period, previous, rows, self.diff_stats)
+            if requests is None:
+                requests = _plan_grid_upsert(grid, props[title], period, rows)
+                self.diff_stats["rows_rewritten"] += len(rows)
+            dim_requests += requests
+
+        if self.use_index:
+            index_grid = self._index_grid(grids, force=self._index_dirty)
+            if index_grid is not None:
+                grids[PERIOD_INDEX_SHEET] = index_grid
+
+        value_data = []
+        for title, grid in grids.items():
+            sheet_props = props[title]
+
+            # data di bawah grid -> tambah baris kosong di akhir sheet
+            if len(grid) > sheet_props["row_count"]:
+                dim_requests.append({
+                    "appendDimension": {
+                        "sheetId": sheet_props["id"],
+                        "dimension": "ROWS",
+                        "length": len(grid) - sheet_props["row_count"],
+                    }
+                })
+                sheet_props["row_count"] = len(grid)
+
+            value_data += _grid_value_ranges(title, grid)
+
+        if self.use_index and (dim_requests or self._index_dirty):
+            # posisi baris berubah di request terpisah dari tulis index:
+            # tandai basi bersama perubahan baris, hapus tanda bersama index baru
+            if dim_requests:
+                dim_requests.append(_index_dirty_request(props[PERIOD_INDEX_SHEET]["id"]))
+            value_data.append({
+                "range": absolute_range_name(PERIOD_INDEX_SHEET, PERIOD_INDEX_DIRTY_CELL),
+                "values": [[""]],
+            })
+
+        if dim_requests:
+            self.sheet.batch_update({"requests": dim_requests})
+            self.requests += 1
+
+        if value_data:
+            self.sheet.values_batch_update({
+                "valueInputOption": "USER_ENTERED",
+                "data": value_data,
+            })
+            self.requests += 1
+
+        self._pending = []
+        return self.requests
+
+    def _ensure_worksheets(self, titles: list) -> dict:
+        """
+        Return {title: {"id": sheetId, "row_count": jumlah baris grid}},
+        worksheet yang belum ada dibuat dalam 1 batch_update.
+        """
+        if self._props is None:
+            self._props = {
+                ws.title: {"id": ws.id, "row_count": ws.row_count}
+                for ws in self.sheet.worksheets()
+            }
+            self.requests += 1
+        props = self._props
+
+        missing = [t for t in titles if t not in props]
+        if missing:
+            res = self.sheet.batch_update({
+                "requests": [
+                    {
+                        "addSheet": {
+                            "properties": {
+                                "title": t,
+                                "gridProperties": {"rowCount": 1000, "columnCount": 10},
+                                "hidden": t == PERIOD_INDEX_SHEET,
+                            }
+                        }
+                    }
+                    for t in missing
+                ]
+            })
+            self.requests += 1
+            self._created.update(missing)
+
+            for reply in res.get("replies", []):
+                p = reply["addSheet"]["properties"]
+                props[p["title"]] = {
+                    "id": p["sheetId"],
+                    "row_count": p["gridProperties"]["rowCount"],
+                }
+
+        return props
+
+    def _read_grids(self, headers: dict) -> dict:
+        """
+        1 request untuk header semua worksheet + index period
+        (atau + kolom A kalau index tidak dipakai).
+        Return {title: [("old", period / None) / ("old", header_row), ...]}
+        """
+        ranges = [
+            absolute_range_name(title, f"A1:{rowcol_to_a1(1, len(header))}")
+            for title, header in headers.items()
+        ]
+        if self.use_index:
+            ranges.append(absolute_range_name(PERIOD_INDEX_SHEET, "A2:D"))
+            ranges.append(absolute_range_name(PERIOD_INDEX_SHEET, PERIOD_INDEX_DIRTY_CELL))
+        else:
+            ranges += [absolute_range_name(title, "A:A") for title in headers]
+
+        value_ranges = self._values_batch_get(ranges)
+        n = len(headers)
+
+        if self.use_index:
+            index_rows = value_ranges[n].get("values", [])
+            self._index = _parse_period_index(index_rows)
+            self._index_length = len(index_rows[0]) if index_rows else 0
+            self._index_dirty = self.rebuild_index or bool(value_ranges[n + 1].get("values"))
+            if self._index_dirty:
+                # penanda basi berlaku untuk seluruh spreadsheet: semua worksheet
+                # di index dibangun ulang, bukan cuma yang ikut commit ini
+                others = [t for t in self._index if t not in headers and t in self._props]
+                scan = list(headers) + others
+            else:
+                others = []
+                scan = [t for t in headers if t not in self._index and t not in self._created]
+            col_a = self._read_col_a(scan) if scan else {}
+            if self._index_dirty:
+                self._index = {t: _grid_period_runs([("old", v) for v in col_a[t]]) for t in others}
+        else:
+            col_a = {
+                title: (value_ranges[n + i].get("values") or [[]])[0]
+                for i, title in enumerate(headers)
+            }
+
+        grids = {}
+        for i, title in enumerate(headers):
+            if title in col_a:
+                grid = [("old", v) for v in col_a[title]]
+            else:
+                grid = _grid_from_index(*self._index.get(title, (0, [])))
+            if grid:
+                header_cols = value_ranges[i].get("values", [])
+                grid[0] = ("old", [c[0] if c else "" for c in header_cols])
+            grids[title] = grid
+
+        return grids
+
+    def _read_col_a(self, titles: list) -> dict:
+        """
+        {title: isi kolom A} dalam 1 request (worksheet di luar index /
+        index basi).
+        """
+        value_ranges = self._values_batch_get([absolute_range_name(t, "A:A") for t in titles])
+        return {t: (value_ranges[i].get("values") or [[]])[0] for i, t in enumerate(titles)}
+
+    def _values_batch_get(self, ranges: list) -> list:
+        res = self.sheet.values_batch_get(ranges, params={"majorDimension": "COLUMNS"})
+        self.requests += 1
+        return res.get("valueRanges", [])
+
+    def _index_grid(self, grids: dict, force: bool = False):
+        """
+        Grid worksheet index setelah perubahan di batch ini, None kalau
+        index tidak berubah (dan tidak force). Worksheet yang tidak disentuh
+        tetap seperti yang dibaca; baris index yang tidak terpakai lagi
+        dikosongkan.
+        """
+        index = dict(self._index)
+        for title, grid in grids.items():
+            index[title] = _grid_period_runs(grid)
+        if index == self._index and not force and PERIOD_INDEX_SHEET not in self._created:
+            return None
+
+        rows = []
+        for title, (extent, runs) in index.items():
+            rows.append([title, PERIOD_INDEX_EXTENT, 1, extent])
+            rows += [[title, period, first, last] for period, first, last in runs]
+        rows += [[""] * len(PERIOD_INDEX_HEADER)] * (self._index_length - len(rows))
+
+        self._index = index
+        self._index_length = len(rows)
+        return [("new", PERIOD_INDEX_HEADER)] + [("new", row) for row in rows]
+
+
+# Entry grid (simulasi isi sheet, 1 entry per baris):
+#   ("old", nilai_kolom_A)              baris lama, tidak disentuh
+#   ("new", row)                        baris yang ditulis penuh
+#   ("patch", (period, {kolom: nilai})) baris lama, hanya cell tertentu ditulis
+def _grid_key(entry):
+    kind, value = entry
+    return value if kind == "old" else value[0]
 
 
 # =========================
-# UPSERT FINANCIAL DATA
-# (P&L, Balance Sheet, Cash Flow)
-# FORMAT: long seperti KPI
-# Period | Account | Value
+# INDEX PERIOD
+# Worksheet PERIOD_INDEX_SHEET, 1 baris per blok period:
+#   Worksheet | Period | First Row | Last Row
+# plus 1 baris Period = PERIOD_INDEX_EXTENT per worksheet: jumlah baris
+# terpakai (First Row = 1, Last Row = baris terakhir).
 # =========================
-def upsert_financial_data(ws, period: str, data: dict):
-    """
-    ws      : worksheet object
-    period  : "Nov 2025"
-    data    : dict {Account: value}
+def _index_number(value) -> int:
+    # dibaca sebagai FORMATTED_VALUE: "12", "1,234"
+    return int(float(str(value).replace(",", "")))
 
-    Format sheet:
-    A: Period
-    B: Account
-    C: Value
 
-    - Kalau sheet kosong: tulis header + semua baris
-    - Kalau sudah ada data: hapus semua baris untuk period tsb, lalu tulis ulang
-      (overwrite, bukan menumpuk)
+def _parse_period_index(columns: list) -> dict:
+    """
+    Isi index (majorDimension COLUMNS, tanpa header)
+    -> {title: (jumlah baris, [(period, first, last)])}
+    """
+    columns = [list(c) for c in columns] + [[] for _ in range(len(PERIOD_INDEX_HEADER) - len(columns))]
+    length = max(len(c) for c in columns)
+    for c in columns:
+        c.extend([""] * (length - len(c)))
+
+    index = {}
+    for title, period, first, last in zip(*columns):
+        if title == "":
+            continue
+        extent, runs = index.get(title, (0, []))
+        if period == PERIOD_INDEX_EXTENT:
+            extent = _index_number(last)
+        else:
+            runs = runs + [(period, _index_number(first), _index_number(last))]
+        index[title] = (extent, runs)
+    return index
+
+
+def _index_dirty_request(sheet_id: int) -> dict:
+    """
+    updateCells: isi PERIOD_INDEX_DIRTY di cell penanda worksheet index.
     """
+    row, col = a1_to_rowcol(PERIOD_INDEX_DIRTY_CELL)
+    return {
+        "updateCells": {
+            "range": {
+                "sheetId": sheet_id,
+                "startRowIndex": row - 1,
+                "endRowIndex": row,
+                "startColumnIndex": col - 1,
+                "endColumnIndex": col,
+            },
+            "rows": [{"values": [{"userEnteredValue": {"stringValue": PERIOD_INDEX_DIRTY}}]}],
+            "fields": "userEnteredValue",
+        }
+    }
+
+
+def _grid_from_index(extent: int, runs: list) -> list:
+    """
+    Grid dari index: baris period = ("old", period), baris lain
+    (header / baris di luar period mana pun) = ("old", None).
+    """
+    grid = [("old", None)] * extent
+    for period, first, last in runs:
+        if last > len(grid):
+            grid += [("old", None)] * (last - len(grid))
+        grid[first - 1:last] = [("old", period)] * (last - first + 1)
+    return grid
 
-    # ===== ENSURE HEADER =====
-    header = ws.row_values(1)
-    if not header:
-        header = ["Period", "Account", "Value"]
-        ws.update("A1", [header])
+
+def _grid_period_runs(grid: list) -> tuple:
+    """
+    Kebalikan _grid_from_index: (jumlah baris, [(period, first, last)])
+    dari grid setelah upsert, nomor baris 1-based.
+    """
+    runs = []
+    for i in range(1, len(grid)):
+        period = _grid_key(grid[i])
+        if period is None or period == "":
+            continue
+        if runs and runs[-1][0] == period and runs[-1][2] == i:
+            runs[-1] = (period, runs[-1][1], i + 1)
+        else:
+            runs.append((period, i + 1, i + 1))
+    return len(grid), runs
+
+
+def _dim_request(sheet_props: dict, kind: str, start: int, end: int) -> dict:
+    """
+    insertDimension / deleteDimension baris [start, end), row_count ikut disesuaikan.
+    Insert tepat di bawah baris terakhir grid dikirim sebagai appendDimension
+    (insertDimension tidak boleh melewati ukuran grid).
+    """
+    if kind == "insertDimension":
+        at_end = start >= sheet_props["row_count"]
+        sheet_props["row_count"] += end - start
+        if at_end:
+            return {
+                "appendDimension": {
+                    "sheetId": sheet_props["id"],
+                    "dimension": "ROWS",
+                    "length": end - start,
+                }
+            }
     else:
-        # kalau header lama bukan 3 kolom, paksa jadi format baru
-        if header[:3] != ["Period", "Account", "Value"]:
-            header = ["Period", "Account", "Value"]
-            ws.update("A1", [header])
+        sheet_props["row_count"] -= end - start
+    body = {
+        "range": {
+            "sheetId": sheet_props["id"],
+            "dimension": "ROWS",
+            "startIndex": start,
+            "endIndex": end,
+        }
+    }
+    if kind == "insertDimension":
+        body["inheritFromBefore"] = True
+    return {kind: body}
+
+
+def _plan_grid_upsert(grid: list, sheet_props: dict, period: str, rows: list) -> list:
+    """
+    Terapkan upsert 1 period ke simulasi grid (list entry per baris),
+    return request insertDimension / deleteDimension yang setara.
+
+    Request disusun berurutan dan dari bawah ke atas, jadi bisa dikirim
+    apa adanya dalam satu batch_update. grid diubah in-place supaya
+    upsert berikutnya ke sheet yang sama melihat posisi baris terbaru.
+    """
+    new_entries = [("new", row) for row in rows]
 
-    # ===== EXISTING DATA =====
-    all_values = ws.get_all_values()  # termasuk header
-    existing_rows = all_values[1:] if len(all_values) > 1 else []
+    rows_idx = [i for i in range(1, len(grid)) if _grid_key(grid[i]) == period]
+    if not rows_idx:
+        grid.extend(new_entries)
+        return []
 
-    # Filter: simpan hanya baris yang period-nya BUKAN period sekarang
-    keep_rows = [r for r in existing_rows if r and r[0] != period]
+    def dim(kind, start, end):
+        return _dim_request(sheet_props, kind, start, end)
 
-    # ===== NEW ROWS UNTUK PERIOD INI =====
-    new_rows = []
-    for account, value in data.items():
-        # convert ke string supaya tampil rapi, tapi tetap bisa di-format number di Sheet
-        new_rows.append([period, account, value])
+    requests = []
+    runs = _row_runs(rows_idx)
 
-    # Gabungkan: baris lama (periode lain) + baris baru (periode ini)
-    final_rows = keep_rows + new_rows
+    # blok period yang terpisah-pisah: sisakan blok pertama
+    for start, end in reversed(runs[1:]):
+        requests.append(dim("deleteDimension", start, end + 1))
+        del grid[start:end + 1]
 
-    # ===== TULIS ULANG KE SHEET (MINIM REQUEST) =====
-    # 1) clear semua kecuali header
-    ws.resize(rows=1)  # sisakan baris header saja
+    start, end = runs[0]
+    n_old = end - start + 1
+    n_new = len(new_entries)
 
-    # 2) append semua data sekaligus
-    if final_rows:
-        ws.append_rows(final_rows, value_input_option="USER_ENTERED")
+    if n_new > n_old:
+        requests.append(dim("insertDimension", end + 1, end + 1 + n_new - n_old))
+    elif n_old > n_new:
+        requests.append(dim("deleteDimension", start + n_new, end + 1))
+
+    grid[start:end + 1] = new_entries
+    return requests
+
+
+def _grid_value_ranges(title: str, grid: list) -> list:
+    """
+    Baris "new" yang berurutan digabung jadi 1 range values.
+    Cell "patch" yang bersebelahan di 1 baris juga digabung jadi 1 range.
+    """
+    data = []
+    run_start = None
+    for i, entry in enumerate(grid + [("old", None)]):
+        if entry[0] == "new":
+            if run_start is None:
+                run_start = i
+            continue
+        if run_start is not None:
+            data.append({
+                "range": absolute_range_name(title, f"A{run_start + 1}"),
+                "values": [e[1] for e in grid[run_start:i]],
+            })
+            run_start = None
+        if entry[0] == "patch":
+            for col, values in _column_runs(entry[1][1]):
+                data.append({
+                    "range": absolute_range_name(title, rowcol_to_a1(i + 1, col + 1)),
+                    "values": [values],
+                })
+    return data
+
+
+def _column_runs(cells: dict) -> list:
+    """
+    {1: a, 2: b, 5: c} -> [(1, [a, b]), (5, [c])]
+    """
+    runs = []
+    for col in sorted(cells):
+        if runs and col == runs[-1][0] + len(runs[-1][1]):
+            runs[-1][1].append(cells[col])
+        else:
+            runs.append((col, [cells[col]]))
+    return runs
 
 
 # =========================
-# KPI RESULT (LONG FORMAT)
+# DIFF PER PERIOD
 # =========================
-def append_kpi_rows(ws, rows: list):
-    """
-    rows format (setiap elemen list adalah 1 baris):
-    [
-        Period,
-        Category,
-        KPI Name,
-        Result,
-        Result Unit,
-        Target,
-        Target Unit,
-        Trend,
-        Trend Unit,
-        Importance
-    ]
-
-    Behaviour:
-    - Header fixed
-    - Semua baris untuk period yang sama akan di-overwrite
-      (hapus dulu period tsb, lalu tulis ulang)
-    """
-
-    if not rows:
-        return
-
-    target_period = rows[0][0]
-
-    # ===== ENSURE HEADER =====
-    header = ws.row_values(1)
-    if not header:
-        header = [
-            "Period",
-            "Category",
-            "KPI Name",
-            "Result",
-            "Result Unit",
-            "Target",
-            "Target Unit",
-            "Trend",
-            "Trend Unit",
-            "Importance",
-        ]
-        ws.update("A1", [header])
-    else:
-        # Kalau header tidak sesuai, paksa jadi header baru
-        expected = [
-            "Period",
-            "Category",
-            "KPI Name",
-            "Result",
-            "Result Unit",
-            "Target",
-            "Target Unit",
-            "Trend",
-            "Trend Unit",
-            "Importance",
-        ]
-        if header[: len(expected)] != expected:
-            ws.update("A1", [expected])
-
-    # ===== EXISTING DATA =====
-    all_values = ws.get_all_values()
-    existing_rows = all_values[1:] if len(all_values) > 1 else []
+def _row_key(row: list, key_columns: int) -> tuple:
+    return tuple(str(v) for v in row[:key_columns])
 
-    # Simpan hanya baris dengan period ≠ target_period
-    keep_rows = [r for r in existing_rows if r and r[0] != target_period]
 
-    # Gabungkan: baris lama (periode lain) + baris baru utk target_period
-    final_rows = keep_rows + rows
+def diff_rows(old_rows: list, new_rows: list, key_columns: int):
+    """
+    Bandingkan baris 1 period, dicocokkan lewat key_columns kolom pertama
+    (key dobel dicocokkan sesuai urutan kemunculan).
+
+    Return list per baris baru, urut sesuai new_rows:
+        ("keep", index_lama, {kolom: nilai_baru})   ({} = tidak berubah)
+        ("insert", row)
+    plus list index baris lama yang dihapus.
+    Return None kalau urutan baris yang sama berubah (tidak bisa
+    dijadikan insert / delete saja, lebih murah tulis ulang period).
+    """
+    old_index = {}
+    seen = {}
+    for i, row in enumerate(old_rows):
+        key = _row_key(row, key_columns)
+        seen[key] = seen.get(key, 0) + 1
+        old_index[(key, seen[key])] = i
+
+    plan = []
+    matched = set()
+    last = -1
+    seen = {}
+    for row in new_rows:
+        key = _row_key(row, key_columns)
+        seen[key] = seen.get(key, 0) + 1
+        i = old_index.get((key, seen[key]))
+        if i is None:
+            plan.append(("insert", row))
+            continue
+        if i < last:
+            return None
+        last = i
+        matched.add(i)
+
+        old = old_rows[i]
+        width = max(len(old), len(row))
+        old = list(old) + [""] * (width - len(old))
+        new = list(row) + [""] * (width - len(row))
+        plan.append(("keep", i, {c: new[c] for c in range(width) if new[c] != old[c]}))
+
+    deleted = [i for i in range(len(old_rows)) if i not in matched]
+    return plan, deleted
+
+
+def _plan_grid_diff(grid: list, sheet_props: dict, period: str, previous: tuple, rows: list, stats: dict):
+    """
+    Seperti _plan_grid_upsert, tapi hanya cell yang berubah yang ditulis
+    (entry "patch"), baris baru di-insert di posisinya, baris yang hilang
+    dihapus. Hasil akhir blok period = `rows`, urutan sama persis.
 
-    # ===== TULIS ULANG KE SHEET =====
-    ws.resize(rows=1)  # sisakan header
-    if final_rows:
-        ws.append_rows(final_rows, value_input_option="USER_ENTERED")
+    Return None (grid tidak diubah) kalau blok period di sheet tidak
+    sesuai snapshot `previous`: jumlah baris beda, terpisah-pisah, atau
+    sudah diubah upsert lain di batch ini.
+    """
+    old_rows, key_columns = previous
+    rows_idx = [i for i in range(1, len(grid)) if _grid_key(grid[i]) == period]
+    if not rows_idx or len(rows_idx) != len(old_rows):
+        return None
+    start = rows_idx[0]
+    if rows_idx[-1] - start + 1 != len(rows_idx) or any(grid[i][0] != "old" for i in rows_idx):
+        return None
+
+    diff = diff_rows(old_rows, rows, key_columns)
+    if diff is None:
+        return None
+    plan, deleted = diff
+
+    requests = []
+    # hapus dari bawah ke atas, index baris di atasnya tidak bergeser
+    for first, last in reversed(_row_runs(deleted)):
+        requests.append(_dim_request(sheet_props, "deleteDimension", start + first, start + last + 1))
+        del grid[start + first:start + last + 1]
+
+    # sisa blok = baris "keep" dengan urutan yang sama seperti plan
+    pos = start
+    inserts = []
+    for entry in plan + [None]:
+        if entry is not None and entry[0] == "insert":
+            inserts.append(("new", entry[1]))
+            continue
+        if inserts:
+            requests.append(_dim_request(sheet_props, "insertDimension", pos, pos + len(inserts)))
+            grid[pos:pos] = inserts
+            pos += len(inserts)
+            stats["rows_inserted"] += len(inserts)
+            inserts = []
+        if entry is None:
+            break
+
+        changes = entry[2]
+        if changes:
+            grid[pos] = ("patch", (period, changes))
+            stats["cells_updated"] += len(changes)
+        else:
+            stats["rows_unchanged"] += 1
+        pos += 1
+
+    stats["rows_deleted"] += len(deleted)
+    return requests
@@ -0,0 +1,251 @@
+# jobs.py
+# Job queue sederhana untuk process_pdf:
+# - tabel job di SQLite (status, tahap, progress, hasil / error)
+# - worker pool terbatas, jadi banyak user sekaligus tidak rebutan CPU / kuota API
+# - app.py cukup submit lalu polling, UI tidak ke-block selama proses
+
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from pdf_source import is_path, iter_chunks
+
+# =========================
+# CONFIG
+# =========================
+JOBS_DB_PATH = os.environ.get(
+    "JOBS_DB_PATH",
+    os.path.join(tempfile.gettempdir(), "financial_pdf_jobs.sqlite3"),
+)
+# Maksimal job yang jalan bersamaan di 1 proses server. Extract / parse /
+# upload Drive jalan paralel; commit ke Google Sheet tetap satu per satu
+# (spreadsheet_lock di google_sheet.py). Server multi-proses ke spreadsheet
+# yang sama tidak ikut terkunci.
+MAX_CONCURRENT_JOBS = int(os.environ.get("MAX_CONCURRENT_JOBS", "2"))
+# Maksimal job yang antri + jalan; lebih dari ini submit ditolak
+MAX_PENDING_JOBS = int(os.environ.get("MAX_PENDING_JOBS", "20"))
+
+# PDF job di atas ukuran ini disimpan ke file sementara, sisanya di memory
+SPILL_TO_DISK_BYTES = 8 * 1024 * 1024
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+ACTIVE_STATUSES = (QUEUED, RUNNING)
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class JobQueueFull(Exception):
+    pass
+
+
+# =========================
+# DATABASE
+# =========================
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    file_name TEXT,
+    status TEXT NOT NULL,
+    stage TEXT,
+    progress REAL NOT NULL DEFAULT 0,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+)
+"""
+
+
+@contextmanager
+def _connect():
+    """
+    Koneksi baru per operasi (aman dipakai dari thread mana saja),
+    commit otomatis lalu ditutup.
+    """
+    conn = sqlite3.connect(JOBS_DB_PATH, timeout=30)
+    conn.row_factory = sqlite3.Row
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def _init_db():
+    with _connect() as conn:
+        # WAL: UI bisa baca status sementara worker menulis progress
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(_SCHEMA)
+        # job yang masih "aktif" dari proses server sebelumnya tidak akan
+        # pernah selesai -> tandai gagal
+        conn.execute(
+            "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE status IN (?, ?)",
+            (FAILED, "Server restart sebelum job selesai", time.time(), *ACTIVE_STATUSES),
+        )
+
+
+def _update(job_id: str, **fields):
+    fields["updated_at"] = time.time()
+    columns = ", ".join(f"{k} = ?" for k in fields)
+    with _connect() as conn:
+        conn.execute(f"UPDATE jobs SET {columns} WHERE id = ?", (*fields.values(), job_id))
+
+
+def _row_to_job(row) -> dict:
+    job = dict(row)
+    job["result"] = json.loads(job["result"]) if job["result"] else None
+    job["cancel_requested"] = bool(job["cancel_requested"])
+    return job
+
+
+# =========================
+# WORKER POOL
+# =========================
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+
+    with _pool_lock:
+        if _pool is None:
+            _init_db()
+            _pool = ThreadPoolExecutor(
+                max_workers=MAX_CONCURRENT_JOBS,
+                thread_name_prefix="pdf-job",
+            )
+        return _pool
+
+
+def _materialize(pdf_source):
+    """
+    Job jalan di luar script Streamlit, jadi isi upload harus disalin:
+    kecil -> bytes di memory, besar -> file sementara (ditulis per chunk).
+    Return (pdf_source_untuk_job, path_temp_atau_None).
+    """
+    if is_path(pdf_source):
+        return pdf_source, None
+
+    buf = bytearray()
+    f = None
+    path = None
+    try:
+        for chunk in iter_chunks(pdf_source):
+            if f is None and len(buf) + len(chunk) <= SPILL_TO_DISK_BYTES:
+                buf += chunk
+                continue
+            if f is None:
+                fd, path = tempfile.mkstemp(prefix="financial_job_", suffix=".pdf")
+                f = os.fdopen(fd, "wb")
+                f.write(buf)
+                buf = None
+            f.write(chunk)
+    finally:
+        if f is not None:
+            f.close()
+
+    if path is not None:
+        return path, path
+    return bytes(buf), None
+
+
+def _run_job(job_id: str, pdf_source, tmp_path):
+    # import di sini supaya jobs.py bisa dipakai tanpa load semua client Google
+    from main import process_pdf
+
+    def progress(stage, fraction):
+        _update(job_id, stage=stage, progress=fraction)
+        if get_job(job_id)["cancel_requested"]:
+            raise JobCancelled()
+
+    try:
+        if get_job(job_id)["cancel_requested"]:
+            raise JobCancelled()
+
+        _update(job_id, status=RUNNING, stage="start")
+        result = process_pdf(pdf_source, progress=progress)
+        _update(job_id, status=DONE, stage="done", progress=1.0, result=json.dumps(result))
+    except JobCancelled:
+        _update(job_id, status=CANCELLED)
+    except Exception:
+        _update(job_id, status=FAILED, error=traceback.format_exc())
+    finally:
+        if tmp_path is not None:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+# =========================
+# PUBLIC API
+# =========================
+def submit_job(pdf_source, file_name: str = "") -> str:
+    """
+    Antrikan process_pdf untuk 1 PDF. Return job_id.
+    Raise JobQueueFull kalau antrian sudah penuh.
+    """
+    pool = _get_pool()
+
+    with _connect() as conn:
+        (pending,) = conn.execute(
+            "SELECT COUNT(*) FROM jobs WHERE status IN (?, ?)", ACTIVE_STATUSES
+        ).fetchone()
+    if pending >= MAX_PENDING_JOBS:
+        raise JobQueueFull(f"{pending} job masih antri / berjalan")
+
+    job_source, tmp_path = _materialize(pdf_source)
+
+    job_id = uuid.uuid4().hex
+    now = time.time()
+    with _connect() as conn:
+        conn.execute(
+            "INSERT INTO jobs (id, file_name, status, stage, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (job_id, file_name, QUEUED, "queued", now, now),
+        )
+
+    pool.submit(_run_job, job_id, job_source, tmp_path)
+    return job_id
+
+
+def get_job(job_id: str):
+    """
+    Return dict job (status, stage, progress, result, error, ...) atau None.
+    """
+    _get_pool()
+    with _connect() as conn:
+        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    return _row_to_job(row) if row else None
+
+
+def cancel_job(job_id: str):
+    """
+    Minta job berhenti. Job yang masih antri tidak akan dijalankan;
+    job yang sedang jalan berhenti di pergantian tahap berikutnya.
+    """
+    _update(job_id, cancel_requested=1)
+
+
+def list_jobs(limit: int = 20) -> list:
+    _get_pool()
+    with _connect() as conn:
+        rows = conn.execute(
+            "SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+        ).fetchall()
+    return [_row_to_job(r) for r in rows]
@@ -1,137 +1,566 @@
 # main.py
 # Orkestrasi: baca PDF, parse, upload ke Drive, tulis ke Google Sheet
 
-from extract_pdf import extract_text
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+from extract_pdf import extract_section_text
+from sections import split_sections
 
 from parse_pl import detect_period, parse_profit_loss
 from parse_bs import parse_balance_sheet
 from parse_cashflow import parse_cashflow
 from parse_kpi import parse_kpi_result
 
-from upload_to_drive import upload_pdf_to_drive
+from upload_to_drive import parse_period, upload_pdf_to_drive
+
+import store
+from scheduler import HIGH, priority
+
+from tracing import Trace, bind
+from profiling import PROFILE_ENABLED, format_hotspots, profile_call
 
-from google_sheet import (
-    connect_sheet,
-    get_or_create_worksheet,
-    upsert_financial_data,
-    append_kpi_rows,
-)
+from google_sheet import SheetWriteBatch, connect_sheet
 
 # =========================
 # CONFIG
 # =========================
 SPREADSHEET_NAME = "FINANCIAL_REPORT"
+# Kalau diisi, spreadsheet dibuka langsung by key (tanpa cari nama di Drive)
+SPREADSHEET_KEY = os.environ.get("SPREADSHEET_KEY")
+
+# Batch: jumlah proses extract + parse, dan thread upload Drive
+BATCH_WORKERS = int(os.environ.get("BATCH_WORKERS", str(os.cpu_count() or 1)))
+BATCH_UPLOAD_THREADS = 4
 
 
 # =========================
 # CORE FUNCTION
 # (dipanggil dari Streamlit: app.py)
 # =========================
-def process_pdf(pdf_path: str = "report.pdf"):
+def _no_progress(stage, fraction):
+    pass
+
+
+def _drive_link(drive_info):
+    # upload_pdf_to_drive biasanya return dict:
+    # { "file_id": ..., "file_name": ..., "link": ... }
+    if isinstance(drive_info, dict):
+        return drive_info.get("link")
+    # jaga-jaga kalau fungsinya cuma return string
+    return str(drive_info)
+
+
+def parse_report(text: str, period: str, trace: Trace = None) -> dict:
+    """
+    Parse semua section dari teks hasil extract_section_text().
+    Return dict biasa (bisa di-pickle, dipakai juga oleh worker batch).
+    """
+    if trace is None:
+        trace = Trace("parse_report")
+
+    # Teks dipecah sekali per section, tiap parser cuma baca bagiannya.
+    # Kalau heading section tidak ketemu, fallback ke teks penuh.
+    with trace.span("split_sections"):
+        sections = split_sections(text)
+
+    print("📊 Parsing P&L...")
+    with trace.span("parse_pl") as span:
+        pl_data = parse_profit_loss(sections.get("pl", text))
+        span.attrs["rows"] = len(pl_data)
+
+    print("🏦 Parsing Balance Sheet...")
+    with trace.span("parse_bs") as span:
+        bs_data = parse_balance_sheet(sections.get("bs", text))
+        span.attrs["rows"] = len(bs_data)
+
+    print("💰 Parsing Cash Flow...")
+    with trace.span("parse_cf") as span:
+        cf_data = parse_cashflow(sections.get("cf", text))
+        span.attrs["rows"] = len(cf_data)
+
+    print("📈 Parsing KPI Result...")
+    with trace.span("parse_kpi") as span:
+        kpi_rows = parse_kpi_result(sections.get("kpi", text), period)
+        span.attrs["rows"] = len(kpi_rows)
+
+    return {
+        "period": period,
+        "pl": pl_data,
+        "bs": bs_data,
+        "cf": cf_data,
+        "kpi_rows": kpi_rows,
+    }
+
+
+def queue_sync(batch, periods: list, worksheets=None, force: bool = False) -> list:
+    """
+    Antrikan (worksheet, period) yang isinya di store berubah sejak sync
+    terakhir ke batch. Setelah batch.commit() berhasil, panggil
+    store.mark_synced() dengan hasil fungsi ini.
+    """
+    items = store.queue_sync(batch, periods, worksheets, force)
+    for item in items:
+        print(f"⬆️ Updating {item.worksheet} ({item.period})...")
+    if not items:
+        print("✔️ Tidak ada perubahan untuk Google Sheet")
+    return items
+
+
+def _traced(trace: Trace, name: str, fn):
+    """
+    fn yang dijalankan di thread pool, dibungkus span `name`.
+    """
+    def run(*args, **kwargs):
+        with trace.span(name):
+            return fn(*args, **kwargs)
+
+    return bind(run)
+
+
+def _row_counts(parsed: dict) -> dict:
+    return {
+        "period": parsed["period"],
+        "pl_rows": len(parsed["pl"]),
+        "bs_rows": len(parsed["bs"]),
+        "cf_rows": len(parsed["cf"]),
+        "kpi_rows": len(parsed["kpi_rows"]),
+    }
+
+
+def process_pdf(pdf_source="report.pdf", progress=None, profile: bool = None):
     """
     Baca PDF, parse semua section, upload PDF ke Drive,
     lalu update Google Sheet. Return dict ringkasan.
+
+    pdf_source : path, bytes, atau file-like (upload Streamlit bisa
+                 langsung dioper tanpa ditulis ke disk).
+    progress   : opsional, callable(stage, fraction) dipanggil tiap pindah
+                 tahap (dipakai job queue). Exception dari callback
+                 (misal job dibatalkan) menghentikan proses di tahap itu.
+
+    Alur (network I/O yang independen jalan paralel):
+
+        extract -> detect_period -+-> upload Drive -----------------------+
+                                  +-> connect Sheet ------+                |
+                                  +-> parse -> store -----+-> sync         |
+                                                             P&L/BS/       |
+                                                             CF/KPI        +-> META
+
+    Data disimpan dulu ke store lokal (store.py); ke Google Sheet hanya
+    dikirim worksheet / period yang isinya berubah sejak sync terakhir.
+
+    Hasil juga berisi "trace": durasi tiap tahap + jumlah request & bytes
+    ke Google API per tahap (lihat tracing.py).
+
+    profile    : True = jalankan di bawah profiler (lihat profiling.py),
+                 hasil berisi "profile". None = pakai env PROFILE_PDF.
     """
+    if profile is None:
+        profile = PROFILE_ENABLED
+
+    if not profile:
+        return _process_pdf(pdf_source, progress)
+
+    result, report = profile_call(_source_name(pdf_source), _process_pdf, pdf_source, progress)
+    if report is not None:
+        print(format_hotspots(report))
+        result["profile"] = report
+    return result
+
+
+def _source_name(pdf_source) -> str:
+    if isinstance(pdf_source, (str, os.PathLike)):
+        return os.path.basename(os.fspath(pdf_source))
+    return getattr(pdf_source, "name", None) or "upload"
+
 
+def _process_pdf(pdf_source, progress):
+    if progress is None:
+        progress = _no_progress
+
+    trace = Trace("process_pdf")
+
+    progress("extract", 0.05)
     print("📄 Reading PDF...")
-    text = extract_text(pdf_path)
+    # hanya halaman yang berisi section P&L / BS / CF / KPI yang diekstrak
+    with trace.span("extract") as span:
+        text = extract_section_text(pdf_source)
+        span.attrs["chars"] = len(text)
 
+    progress("detect_period", 0.35)
     print("🗓️ Detecting period...")
-    period = detect_period(text)
+    with trace.span("detect_period"):
+        period = detect_period(text)
     print(f"Period: {period}")
+    # period tidak terbaca -> gagal di sini, sebelum ada yang ditulis
+    # ke store / Sheets (upload Drive butuh bulan + tahun)
+    parse_period(period)
 
-    # ---------- PARSING ----------
-    print("📊 Parsing P&L...")
-    pl_data = parse_profit_loss(text)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        # ---------- UPLOAD PDF -> DRIVE (background) ----------
+        # cuma butuh period, jadi bisa jalan sambil parsing & tulis sheet
+        print("☁️ Uploading PDF to Google Drive (background)...")
+        drive_future = pool.submit(_traced(trace, "drive_upload", upload_pdf_to_drive), pdf_source, period)
 
-    print("🏦 Parsing Balance Sheet...")
-    bs_data = parse_balance_sheet(text)
+        print("🔗 Connecting to Google Sheet (background)...")
+        sheet_future = pool.submit(
+            _traced(trace, "connect_sheet", connect_sheet), SPREADSHEET_NAME, key=SPREADSHEET_KEY
+        )
 
-    print("💰 Parsing Cash Flow...")
-    cf_data = parse_cashflow(text)
+        # ---------- PARSING ----------
+        progress("parse", 0.45)
+        with trace.span("parse"):
+            parsed = parse_report(text, period, trace)
 
-    print("📈 Parsing KPI Result...")
-    kpi_rows = parse_kpi_result(text, period)
+        # ---------- STORE LOKAL (SUMBER DATA UTAMA) ----------
+        with trace.span("store") as span:
+            span.attrs["changed"] = store.save_report(parsed, source=_source_name(pdf_source))
 
-    # ---------- UPLOAD PDF -> DRIVE ----------
-    print("☁️ Uploading PDF to Google Drive...")
-    drive_info = upload_pdf_to_drive(pdf_path, period)
+        # ---------- WORKSHEETS ----------
+        # Semua perubahan worksheet dikumpulkan dulu,
+        # lalu dikirim dalam beberapa batch request saja
+        with trace.span("wait_connect_sheet"):
+            batch = SheetWriteBatch(sheet_future.result())
+        synced = queue_sync(batch, [period], store.REPORT_WORKSHEETS)
 
-    # upload_pdf_to_drive biasanya return dict:
-    # { "file_id": ..., "file_name": ..., "link": ... }
-    if isinstance(drive_info, dict):
-        drive_link = drive_info.get("link")
-    else:
-        # jaga-jaga kalau fungsinya cuma return string
-        drive_link = str(drive_info)
-
-    print("🔗 Connecting to Google Sheet...")
-    sheet = connect_sheet(SPREADSHEET_NAME)
-
-    # ---------- WORKSHEETS ----------
-    pl_ws = get_or_create_worksheet(sheet, "P&L")
-    bs_ws = get_or_create_worksheet(sheet, "Balance Sheet")
-    cf_ws = get_or_create_worksheet(sheet, "Cash Flow")
-    kpi_ws = get_or_create_worksheet(sheet, "KPI Result")
-
-    # ---------- TULIS FINANCIAL DATA ----------
-    print("⬆️ Updating P&L...")
-    upsert_financial_data(pl_ws, period, pl_data)
-
-    print("⬆️ Updating Balance Sheet...")
-    upsert_financial_data(bs_ws, period, bs_data)
-
-    print("⬆️ Updating Cash Flow...")
-    upsert_financial_data(cf_ws, period, cf_data)
-
-    # ---------- KPI (SUDAH HANDLE OVERWRITE DI DALAM append_kpi_rows) ----------
-    print("➕ Upserting KPI Result...")
-    append_kpi_rows(kpi_ws, kpi_rows)
-
-    # ---------- META SHEET: SIMPAN LINK DRIVE PER PERIOD ----------
-    print("🔗 Saving Drive link to META sheet...")
-    meta_ws = get_or_create_worksheet(sheet, "META")
-
-    # Pastikan header
-    header = meta_ws.row_values(1)
-    if not header:
-        meta_ws.update("A1:B1", [["Period", "PDF Drive Link"]])
-        existing_periods = []
-    else:
-        existing_periods = meta_ws.col_values(1)
-
-    # Cari apakah period sudah pernah ada di META
-    row_to_update = None
-    # skip header (row 1)
-    for idx, p in enumerate(existing_periods[1:], start=2):
-        if p == period:
-            row_to_update = idx
-            break
-
-    if row_to_update is None:
-        # belum ada -> append row baru
-        meta_ws.append_row([period, drive_link])
-    else:
-        # sudah ada -> overwrite baris tersebut
-        meta_ws.update(f"A{row_to_update}:B{row_to_update}", [[period, drive_link]])
+        progress("sheets", 0.65)
+        print("📤 Sending batch to Google Sheet...")
+        with trace.span("sheets_commit", rows=batch.pending_rows()):
+            batch.commit()
+        store.mark_synced(synced)
+
+        # ---------- META SHEET: SIMPAN LINK DRIVE PER PERIOD ----------
+        # satu-satunya langkah yang harus menunggu upload Drive selesai
+        progress("drive", 0.8)
+        with trace.span("wait_drive_upload"):
+            drive_link = _drive_link(drive_future.result())
+
+        progress("meta", 0.9)
+        print("🔗 Saving Drive link to META sheet...")
+        store.save_meta(period, drive_link)
+        meta_synced = queue_sync(batch, [period], ["META"])
+        # META duluan kalau antri kuota Sheets dengan job lain
+        with trace.span("meta_commit", rows=batch.pending_rows()), priority(HIGH):
+            sheets_requests = batch.commit()
+        store.mark_synced(meta_synced)
 
     print("✅ ALL FINANCIAL DATA SUCCESSFULLY UPDATED")
 
     return {
-        "period": period,
-        "pl_rows": len(pl_data),
-        "bs_rows": len(bs_data),
-        "cf_rows": len(cf_data),
-        "kpi_rows": len(kpi_rows),
+        **_row_counts(parsed),
         "drive_link": drive_link,
+        "sheets_requests": sheets_requests,
+        "synced": len(synced) + len(meta_synced),
+        "diff": batch.diff_stats,
+        "trace": trace.summary(),
+    }
+
+
+# =========================
+# SYNC STORE -> GOOGLE SHEET
+# =========================
+def sync_store(periods: list = None, force: bool = False) -> dict:
+    """
+    Kirim semua (worksheet, period) di store yang belum ter-sync ke
+    Google Sheet, misal setelah commit sebelumnya gagal (quota / jaringan).
+    force=True kirim ulang semuanya (sheet dikosongkan / diedit manual),
+    posisi period dibaca ulang dari kolom A dan index period dibangun ulang.
+    """
+    trace = Trace("sync_store")
+    with trace.span("connect_sheet"):
+        sheet = connect_sheet(SPREADSHEET_NAME, key=SPREADSHEET_KEY)
+        batch = SheetWriteBatch(sheet, rebuild_index=force)
+
+    synced = queue_sync(batch, periods, force=force)
+    with trace.span("sheets_commit", rows=batch.pending_rows()):
+        sheets_requests = batch.commit()
+    store.mark_synced(synced)
+
+    return {
+        "synced": len(synced),
+        "diff": batch.diff_stats,
+        "sheets_requests": sheets_requests,
+        "trace": trace.summary(),
     }
 
 
+# =========================
+# BATCH (BANYAK PDF SEKALIGUS)
+# =========================
+def resolve_pdf_paths(patterns: list) -> list:
+    """
+    Argumen CLI -> daftar file PDF (urut, tanpa duplikat).
+    Tiap argumen boleh folder (semua *.pdf di dalamnya), glob, atau path file.
+    """
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = [
+                os.path.join(pattern, name)
+                for name in os.listdir(pattern)
+                if name.lower().endswith(".pdf")
+            ]
+        else:
+            matches = glob.glob(pattern)
+        paths += sorted(m for m in matches if os.path.isfile(m))
+
+    return list(dict.fromkeys(paths))
+
+
+def _extract_and_parse(path: str, extract_workers: int = None) -> dict:
+    """
+    Worker batch (jalan di proses terpisah): extract + parse 1 PDF.
+    extract_workers : seperti extract_section_text(workers=...), None = EXTRACT_WORKERS.
+    """
+    text = extract_section_text(path, workers=extract_workers)
+    period = detect_period(text)
+    parse_period(period)  # file tanpa period valid masuk "errors", tidak ditulis
+    return parse_report(text, period)
+
+
+def process_batch(pdf_paths: list, workers: int = None, profile: bool = None) -> dict:
+    """
+    Proses banyak PDF sekaligus:
+
+        - extract + parse paralel di process pool (CPU-bound)
+        - upload Drive di thread pool, mulai begitu period file itu diketahui
+        - semua period ditulis ke Google Sheet dalam 1 commit
+          (1x baca + 1x tulis untuk semua worksheet), lalu META 1 commit
+
+    Kalau ada 2 file dengan period sama, file yang urutannya terakhir menang
+    (baris Sheets dan isi file di Drive; upload 1 period berurutan).
+    File yang gagal dicatat di "errors", file lain tetap diproses.
+
+    workers : jumlah proses extract + parse; 0 / 1 = jalan di proses ini.
+    profile : seperti process_pdf. Worker process tidak ikut terprofil,
+              jadi pakai workers=1 untuk melihat hotspot extract / parse.
+    """
+    if profile is None:
+        profile = PROFILE_ENABLED
+
+    if not profile:
+        return _process_batch(pdf_paths, workers)
+
+    summary, report = profile_call("batch", _process_batch, pdf_paths, workers)
+    if report is not None:
+        print(format_hotspots(report))
+        summary["profile"] = report
+    return summary
+
+
+def _extract_and_parse_all(pdf_paths: list, workers: int):
+    """
+    Generator (path, parsed, error) — urutan selesai, bukan urutan input.
+    """
+    if workers <= 1:
+        for path in pdf_paths:
+            try:
+                yield path, _extract_and_parse(path), None
+            except Exception as e:
+                yield path, None, e
+        return
+
+    # sudah paralel per file: halaman tiap file diekstrak serial
+    # (tidak bikin process pool di dalam process pool)
+    with ProcessPoolExecutor(max_workers=workers) as cpu_pool:
+        futures = {cpu_pool.submit(_extract_and_parse, p, 0): p for p in pdf_paths}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result(), None
+            except Exception as e:
+                yield futures[future], None, e
+
+
+def _upload_after(previous, upload, path: str, period: str):
+    """
+    Upload period yang sama dijalankan berurutan: tunggu upload
+    sebelumnya (berhasil / gagal) dulu, jadi isi file Drive terakhir
+    = file yang urutannya terakhir.
+    """
+    if previous is not None:
+        try:
+            previous.result()
+        except Exception:
+            pass
+    return upload(path, period)
+
+
+def _process_batch(pdf_paths: list, workers: int):
+    if workers is None:
+        workers = BATCH_WORKERS
+
+    started = time.perf_counter()
+    trace = Trace("process_batch")
+    parsed_by_path = {}
+    errors = {}
+
+    with ThreadPoolExecutor(max_workers=BATCH_UPLOAD_THREADS + 1) as io_pool:
+        sheet_future = io_pool.submit(
+            _traced(trace, "connect_sheet", connect_sheet), SPREADSHEET_NAME, key=SPREADSHEET_KEY
+        )
+        drive_upload = _traced(trace, "drive_upload", upload_pdf_to_drive)
+        order = {p: i for i, p in enumerate(pdf_paths)}
+        # period -> (urutan file yang di-upload terakhir, future upload-nya)
+        drive_futures = {}
+        drive_uploads = 0
+
+        # ---------- EXTRACT + PARSE (PROCESS POOL) ----------
+        with trace.span("extract_parse", files=len(pdf_paths)):
+            for path, parsed, error in _extract_and_parse_all(pdf_paths, workers):
+                if error is not None:
+                    errors[path] = f"{type(error).__name__}: {error}"
+                    print(f"❌ {path}: {errors[path]}")
+                    continue
+
+                parsed_by_path[path] = parsed
+                period = parsed["period"]
+                print(f"📄 {path} -> {period}")
+
+                # period sama di beberapa file: file yang urutannya lebih awal
+                # dari yang sudah di-upload tidak perlu di-upload lagi
+                previous = drive_futures.get(period)
+                if previous is None or order[path] > previous[0]:
+                    future = io_pool.submit(
+                        _upload_after, previous and previous[1], drive_upload, path, period
+                    )
+                    drive_futures[period] = (order[path], future)
+                    drive_uploads += 1
+
+        # urutan tulis = urutan file di argumen, bukan urutan selesai
+        ordered = [p for p in pdf_paths if p in parsed_by_path]
+        periods = list(dict.fromkeys(parsed_by_path[p]["period"] for p in ordered))
+
+        with trace.span("store", files=len(ordered)):
+            for path in ordered:
+                store.save_report(parsed_by_path[path], source=os.path.basename(path))
+
+        # ---------- SHEETS: 1 COMMIT UNTUK SEMUA PERIOD ----------
+        with trace.span("wait_connect_sheet"):
+            batch = SheetWriteBatch(sheet_future.result())
+        synced = queue_sync(batch, periods, store.REPORT_WORKSHEETS)
+
+        print(f"📤 Sending batch for {len(ordered)} PDF(s) to Google Sheet...")
+        with trace.span("sheets_commit", rows=batch.pending_rows()):
+            batch.commit()
+        store.mark_synced(synced)
+
+        # ---------- META: 1 COMMIT SETELAH SEMUA UPLOAD SELESAI ----------
+        results = []
+        for path in ordered:
+            parsed = parsed_by_path[path]
+            try:
+                with trace.span("wait_drive_upload", file=path):
+                    drive_link = _drive_link(drive_futures[parsed["period"]][1].result())
+            except Exception as e:
+                errors[path] = f"Drive upload: {type(e).__name__}: {e}"
+                print(f"❌ {path}: {errors[path]}")
+                continue
+
+            store.save_meta(parsed["period"], drive_link)
+            results.append({"file": path, **_row_counts(parsed), "drive_link": drive_link})
+
+        print("🔗 Saving Drive links to META sheet...")
+        meta_synced = queue_sync(batch, periods, ["META"])
+        with trace.span("meta_commit", rows=batch.pending_rows()), priority(HIGH):
+            sheets_requests = batch.commit()
+        store.mark_synced(meta_synced)
+
+    elapsed = time.perf_counter() - started
+    return {
+        "files": len(pdf_paths),
+        "processed": len(ordered),
+        "results": results,
+        "errors": errors,
+        "seconds": elapsed,
+        "files_per_sec": len(ordered) / elapsed if elapsed > 0 else 0.0,
+        "sheets_requests": sheets_requests,
+        "synced": len(synced) + len(meta_synced),
+        "diff": batch.diff_stats,
+        "drive_uploads": drive_uploads,
+        "trace": trace.summary(),
+    }
+
+
+def print_batch_summary(summary: dict):
+    print()
+    print("========== BATCH SUMMARY ==========")
+    print(f"Files           : {summary['processed']}/{summary['files']} OK")
+    print(f"Elapsed         : {summary['seconds']:.2f} s")
+    print(f"Throughput      : {summary['files_per_sec']:.2f} files/sec")
+    print(f"Sheets requests : {summary['sheets_requests']}")
+    print(f"Synced sheets   : {summary['synced']} (worksheet x period)")
+    print("Diff            : " + ", ".join(f"{k}={v}" for k, v in summary["diff"].items()))
+    print(f"Drive uploads   : {summary['drive_uploads']}")
+    api = summary["trace"]["api_requests"]
+    if api:
+        print("API requests    : " + ", ".join(f"{k}={v}" for k, v in sorted(api.items())))
+    counters = summary["trace"].get("counters")
+    if counters:
+        print("Throttle/retry  : " + ", ".join(f"{k}={v}" for k, v in sorted(counters.items())))
+    for path, error in summary["errors"].items():
+        print(f"FAILED {path}: {error}")
+
+
 # =========================
 # CLI SUPPORT (opsional)
 # =========================
+def _cli(argv: list):
+    """
+    python main.py                          -> proses report.pdf
+    python main.py path/ke/file.pdf         -> proses 1 PDF
+    python main.py --profile file.pdf       -> + profile (.prof & hotspot)
+    python main.py batch reports/ [--workers N] [--profile]
+    python main.py batch "reports/2025-*.pdf" ...
+    python main.py sync [--period P ...] [--all]
+                                            -> kirim ulang data store ke Sheet
+    """
+    import argparse
+
+    if argv and argv[0] == "sync":
+        parser = argparse.ArgumentParser(prog="main.py sync")
+        parser.add_argument("--period", nargs="+", default=None, help="default: semua period")
+        parser.add_argument("--all", action="store_true", help="kirim semua, berubah atau tidak")
+        args = parser.parse_args(argv[1:])
+
+        result = sync_store(args.period, force=args.all)
+        print(result)
+        return 0
+
+    if argv and argv[0] == "batch":
+        parser = argparse.ArgumentParser(prog="main.py batch")
+        parser.add_argument("inputs", nargs="+", help="folder, glob, atau file PDF")
+        parser.add_argument("--workers", type=int, default=None)
+        parser.add_argument("--profile", action="store_true", default=None)
+        args = parser.parse_args(argv[1:])
+
+        paths = resolve_pdf_paths(args.inputs)
+        if not paths:
+            parser.error("tidak ada file PDF yang cocok")
+
+        workers = args.workers
+        if args.profile and workers is None:
+            # worker process tidak terprofil -> extract / parse di proses ini
+            workers = 1
+
+        summary = process_batch(paths, workers=workers, profile=args.profile)
+        print_batch_summary(summary)
+        return 1 if summary["errors"] else 0
+
+    parser = argparse.ArgumentParser(prog="main.py")
+    parser.add_argument("pdf", nargs="?", default="report.pdf")
+    parser.add_argument("--profile", action="store_true", default=None)
+    args = parser.parse_args(argv)
+
+    result = process_pdf(args.pdf, profile=args.profile)
+    print(result)
+    return 0
+
+
 if __name__ == "__main__":
     # Jalankan manual dari terminal:
     # python main.py
-    result = process_pdf("report.pdf")
-    print(result)
+    sys.exit(_cli(sys.argv[1:]))
@@ -0,0 +1,58 @@
+import re
+
+# =============================
+# SINGLE-PASS ACCOUNT MATCHER
+# (dipakai parse_bs & parse_cashflow)
+# =============================
+def build_account_matcher(accounts):
+    """
+    Compile SEMUA label akun jadi satu regex alternation:
+
+        (Akun A|Akun B|...)\\s+Rp([\\d\\.]+)
+
+    lalu return fungsi match(text) -> dict {Akun: value}.
+
+    Teks cukup discan sekali (bukan sekali per akun). Hasil sama dengan
+    re.search per akun: yang diambil adalah kemunculan PERTAMA tiap akun,
+    urutan key mengikuti urutan `accounts`.
+    """
+    accounts = list(accounts)
+
+    # Akun yang merupakan akhiran akun lain (misal "Current Assets" vs
+    # "Total Current Assets") bisa "tertelan" match akun yang lebih panjang,
+    # jadi akun seperti ini dicari terpisah.
+    suffix_accounts = [
+        a for a in accounts
+        if any(b != a and b.endswith(a) for b in accounts)
+    ]
+    main_accounts = [a for a in accounts if a not in suffix_accounts]
+
+    def compile_pattern(names):
+        # label terpanjang dulu supaya alternation tidak berhenti di prefix
+        names = sorted(names, key=len, reverse=True)
+        alternation = "|".join(re.escape(n) for n in names)
+        return re.compile(rf"({alternation})\s+Rp([\d\.]+)")
+
+    main_pattern = compile_pattern(main_accounts) if main_accounts else None
+    suffix_patterns = [(a, compile_pattern([a])) for a in suffix_accounts]
+    n_main = len(main_accounts)
+
+    def match(text: str) -> dict:
+        found = {}
+
+        if main_pattern is not None:
+            for m in main_pattern.finditer(text):
+                acc = m.group(1)
+                if acc not in found:
+                    found[acc] = int(m.group(2).replace(".", ""))
+                    if len(found) == n_main:
+                        break
+
+        for acc, pattern in suffix_patterns:
+            m = pattern.search(text)
+            if m:
+                found[acc] = int(m.group(2).replace(".", ""))
+
+        return {acc: found[acc] for acc in accounts if acc in found}
+
+    return match
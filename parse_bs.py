@@ -1,4 +1,4 @@
-import re
+from parse_accounts import build_account_matcher
 
 BS_ACCOUNTS = [
     "Cash & Equivalents",
@@ -23,14 +23,9 @@ BS_ACCOUNTS = [
     "Total Liabilities & Equity",
 ]
 
-def parse_balance_sheet(text):
-    data = {}
+# dicompile sekali saat import, teks discan sekali untuk semua akun
+_match_bs_accounts = build_account_matcher(BS_ACCOUNTS)
 
-    for acc in BS_ACCOUNTS:
-        pattern = rf"{acc}\s+Rp([\d\.]+)"
-        match = re.search(pattern, text)
-        if match:
-            value = int(match.group(1).replace(".", ""))
-            data[acc] = value
 
-    return data
+def parse_balance_sheet(text):
+    return _match_bs_accounts(text)
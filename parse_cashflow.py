@@ -1,4 +1,4 @@
-import re
+from parse_accounts import build_account_matcher
 
 CF_ACCOUNTS = [
     "Operating Cash Flow",
@@ -7,13 +7,9 @@ CF_ACCOUNTS = [
     "Change in Cash on Hand",
 ]
 
-def parse_cashflow(text):
-    data = {}
+# dicompile sekali saat import, teks discan sekali untuk semua akun
+_match_cf_accounts = build_account_matcher(CF_ACCOUNTS)
 
-    for acc in CF_ACCOUNTS:
-        pattern = rf"{acc}\s+Rp([\d\.]+)"
-        match = re.search(pattern, text)
-        if match:
-            data[acc] = int(match.group(1).replace(".", ""))
 
-    return data
+def parse_cashflow(text):
+    return _match_cf_accounts(text)
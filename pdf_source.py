@@ -0,0 +1,67 @@
+# pdf_source.py
+# PDF bisa datang sebagai path di disk, bytes, atau file-like
+# (misal UploadedFile Streamlit). Helper di sini menyamakan cara bacanya
+# supaya upload tidak perlu ditulis ke disk dulu.
+
+import hashlib
+import io
+import os
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def is_path(pdf_source) -> bool:
+    return isinstance(pdf_source, (str, os.PathLike))
+
+
+def open_input(pdf_source):
+    """
+    Bentuk yang bisa langsung dipakai pdfplumber.open / pypdfium2:
+    - path     -> path apa adanya
+    - bytes    -> BytesIO (tanpa copy ke disk)
+    - file-like-> stream yang sama, di-seek ke awal
+    """
+    if is_path(pdf_source):
+        return pdf_source
+    if isinstance(pdf_source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(pdf_source)
+    pdf_source.seek(0)
+    return pdf_source
+
+
+def iter_chunks(pdf_source, chunk_size: int = CHUNK_SIZE):
+    """
+    Baca isi PDF per chunk (tidak pernah load seluruh file sekaligus
+    kalau sumbernya path / stream). Stream dikembalikan ke posisi awal.
+    """
+    if is_path(pdf_source):
+        with open(pdf_source, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                yield chunk
+        return
+
+    if isinstance(pdf_source, (bytes, bytearray, memoryview)):
+        view = memoryview(pdf_source)
+        for start in range(0, len(view), chunk_size):
+            yield bytes(view[start:start + chunk_size])
+        return
+
+    pdf_source.seek(0)
+    try:
+        for chunk in iter(lambda: pdf_source.read(chunk_size), b""):
+            yield chunk
+    finally:
+        pdf_source.seek(0)
+
+
+def read_bytes(pdf_source) -> bytes:
+    if isinstance(pdf_source, bytes):
+        return pdf_source
+    return b"".join(iter_chunks(pdf_source))
+
+
+def digest(pdf_source, algorithm: str = "sha256") -> str:
+    h = hashlib.new(algorithm)
+    for chunk in iter_chunks(pdf_source):
+        h.update(chunk)
+    return h.hexdigest()
@@ -0,0 +1,126 @@
+# profiling.py
+# Mode profiling opsional untuk process_pdf / batch: 1 run dibungkus
+# cProfile, hasilnya disimpan ke file .prof per run (bisa dibuka dengan
+# snakeviz / `python -m pstats`), plus ringkasan fungsi paling mahal di
+# extract_pdf, parser, dan google_sheet.
+#
+# Aktifkan dengan env PROFILE_PDF=1 atau `python main.py --profile ...`.
+#
+# Catatan: cProfile hanya memprofil thread pemanggil. Upload Drive /
+# connect Sheet (thread pool) dan worker batch (process pool) tidak ikut,
+# durasinya bisa dilihat di trace (tracing.py).
+
+import cProfile
+import os
+import pstats
+import re
+import tempfile
+import threading
+import time
+
+# =========================
+# CONFIG
+# =========================
+PROFILE_ENABLED = os.environ.get("PROFILE_PDF", "0") == "1"
+PROFILE_DIR = os.environ.get(
+    "PROFILE_DIR",
+    os.path.join(tempfile.gettempdir(), "financial_pdf_profiles"),
+)
+# Jumlah fungsi teratas per grup di ringkasan
+PROFILE_TOP_N = 8
+
+# grup -> nama file modul yang dilaporkan
+PROFILE_GROUPS = {
+    "extract": ("extract_pdf.py", "pdf_source.py"),
+    "parse": ("parse_pl.py", "parse_bs.py", "parse_cashflow.py", "parse_kpi.py", "parse_accounts.py", "sections.py"),
+    "sheets": ("google_sheet.py",),
+}
+
+# Python 3.12+: cuma 1 profiler aktif per proses
+_profile_lock = threading.Lock()
+
+
+# =========================
+# HOTSPOTS
+# =========================
+def hotspots(stats: pstats.Stats, top_n: int = PROFILE_TOP_N) -> dict:
+    """
+    {grup: [{"function", "calls", "own_ms", "cumulative_ms"}, ...]}
+    diurutkan berdasarkan waktu kumulatif (termasuk fungsi yang dipanggil,
+    misal pdfplumber di dalam extract_pdf).
+    """
+    groups = {name: [] for name in PROFILE_GROUPS}
+
+    for (filename, line, func), (_, n_calls, own, cumulative, _) in stats.stats.items():
+        base = os.path.basename(filename)
+        for name, files in PROFILE_GROUPS.items():
+            if base in files:
+                groups[name].append({
+                    "function": f"{base}:{line}({func})",
+                    "calls": n_calls,
+                    "own_ms": round(own * 1000, 2),
+                    "cumulative_ms": round(cumulative * 1000, 2),
+                })
+                break
+
+    for name in groups:
+        groups[name].sort(key=lambda f: f["cumulative_ms"], reverse=True)
+        groups[name] = groups[name][:top_n]
+    return groups
+
+
+def format_hotspots(report: dict) -> str:
+    lines = [f"🔥 Profile: {report['path']}  ({report['total_ms']:.0f} ms)"]
+    for group, funcs in report["hotspots"].items():
+        lines.append(f"-- {group} --")
+        if not funcs:
+            lines.append("   (tidak terpanggil)")
+        for f in funcs:
+            lines.append(
+                f"   {f['cumulative_ms']:>9.2f} ms cum  {f['own_ms']:>8.2f} ms own  "
+                f"{f['calls']:>7}x  {f['function']}"
+            )
+    return "\n".join(lines)
+
+
+# =========================
+# RUN
+# =========================
+def _profile_path(name: str) -> str:
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    safe = re.sub(r"[^A-Za-z0-9_.-]+", "_", name)[:60]
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return os.path.join(PROFILE_DIR, f"{stamp}-{os.getpid()}-{safe}.prof")
+
+
+def profile_call(name: str, fn, *args, **kwargs):
+    """
+    Jalankan fn di bawah cProfile. Return (hasil_fn, report):
+        report = {"path": file .prof, "total_ms": ..., "hotspots": {...}}
+    Kalau profiler lain sedang aktif (job lain), fn dijalankan biasa
+    dan report = None.
+    """
+    if not _profile_lock.acquire(blocking=False):
+        return fn(*args, **kwargs), None
+
+    try:
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            result = fn(*args, **kwargs)
+        finally:
+            profiler.disable()
+        total_ms = (time.perf_counter() - started) * 1000
+    finally:
+        _profile_lock.release()
+
+    path = _profile_path(name)
+    profiler.dump_stats(path)
+
+    report = {
+        "path": path,
+        "total_ms": round(total_ms, 2),
+        "hotspots": hotspots(pstats.Stats(profiler)),
+    }
+    return result, report
@@ -0,0 +1,254 @@
+# scheduler.py
+# Semua request ke Google API (Sheets & Drive) lewat sini, dipakai bersama
+# semua thread / job dalam 1 proses:
+#
+# - token bucket per API: request ditahan di client sebelum kena kuota
+#   per menit, bukan menunggu 429 dari server
+# - 429 / 408 / 5xx di-retry dengan exponential backoff + jitter
+#   (header Retry-After dihormati). Request yang tidak aman diulang
+#   (insert / delete baris, buat file) hanya di-retry untuk 429
+# - prioritas: saat antri token, request HIGH (tulis META / link Drive)
+#   dilayani duluan, jadi tidak kalah oleh burst upload / tulis data
+#
+#   with priority(HIGH):
+#       batch.commit()
+#
+# Dipanggil dari HTTP client gspread / Drive di google_clients.py dan
+# dari backend palsu fake_google.py. Jumlah request yang ditahan (throttled)
+# dan di-retry dicatat di Scheduler.stats() dan di span tracing aktif.
+
+import contextvars
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+import gspread
+from googleapiclient.errors import HttpError
+
+from tracing import record_counter
+
+# =========================
+# CONFIG
+# =========================
+# api -> (request per menit, burst). Default mengikuti kuota per user
+# Sheets (60/menit); Drive jauh lebih longgar.
+API_RATES = {
+    "sheets": (
+        float(os.environ.get("SHEETS_REQUESTS_PER_MINUTE", "60")),
+        int(os.environ.get("SHEETS_BURST", "10")),
+    ),
+    "drive": (
+        float(os.environ.get("DRIVE_REQUESTS_PER_MINUTE", "600")),
+        int(os.environ.get("DRIVE_BURST", "20")),
+    ),
+}
+
+MAX_RETRIES = int(os.environ.get("API_MAX_RETRIES", "5"))
+# backoff attempt n = random(0, min(BACKOFF_MAX, BACKOFF_BASE * 2^n)) detik
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 32.0
+
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+# idempotent=False: kalau server sudah menjalankan request tapi response
+# timeout / 5xx, retry bikin baris / file dobel. 429 = ditolak sebelum
+# dijalankan, jadi tetap aman di-retry.
+NON_IDEMPOTENT_RETRY_STATUSES = {429}
+
+# Prioritas (angka kecil dilayani duluan)
+HIGH = 0
+NORMAL = 1
+LOW = 2
+
+_priority = contextvars.ContextVar("api_priority", default=NORMAL)
+
+
+@contextmanager
+def priority(level: int):
+    """
+    Semua request Google di dalam blok ini (dan thread yang di-bind()
+    dari sini) antri token dengan prioritas `level`.
+    """
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+# =========================
+# TOKEN BUCKET
+# =========================
+class TokenBucket:
+    """
+    rate token per detik, maksimal `capacity` token tersimpan (burst).
+    Yang menunggu dilayani urut (prioritas, urutan datang).
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+        self._waiters = []  # heap (prioritas, urutan)
+        self._seq = itertools.count()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, level: int = NORMAL) -> float:
+        """
+        Ambil 1 token, tunggu kalau habis. Return lama menunggu (detik).
+        """
+        started = time.monotonic()
+        with self._cond:
+            ticket = (level, next(self._seq))
+            heapq.heappush(self._waiters, ticket)
+            try:
+                while True:
+                    self._refill()
+                    head = self._waiters[0] == ticket
+                    if head and self.tokens >= 1:
+                        heapq.heappop(self._waiters)
+                        self.tokens -= 1
+                        self._cond.notify_all()
+                        return time.monotonic() - started
+                    # hanya antrian terdepan yang menunggu token terisi,
+                    # sisanya menunggu dibangunkan
+                    self._cond.wait((1 - self.tokens) / self.rate if head else None)
+            except BaseException:
+                if ticket in self._waiters:
+                    self._waiters.remove(ticket)
+                    heapq.heapify(self._waiters)
+                    self._cond.notify_all()
+                raise
+
+
+# =========================
+# SCHEDULER
+# =========================
+def _error_status(error):
+    """
+    Status HTTP dari exception gspread / googleapiclient, None kalau bukan.
+    """
+    if isinstance(error, gspread.exceptions.APIError):
+        return error.response.status_code
+    if isinstance(error, HttpError):
+        return error.resp.status
+    return None
+
+
+def _retry_after(error) -> float:
+    if isinstance(error, gspread.exceptions.APIError):
+        value = error.response.headers.get("Retry-After")
+    elif isinstance(error, HttpError):
+        value = error.resp.get("retry-after")
+    else:
+        value = None
+    try:
+        return float(value) if value else 0.0
+    except ValueError:
+        return 0.0
+
+
+class Scheduler:
+    """
+    rates : {api: (request per menit, burst)}. API yang tidak ada di
+            rates tidak dibatasi (tetap di-retry).
+    """
+
+    def __init__(self, rates: dict = None, max_retries: int = MAX_RETRIES,
+                 backoff_base: float = BACKOFF_BASE, backoff_max: float = BACKOFF_MAX):
+        self.buckets = {
+            api: TokenBucket(per_minute / 60.0, burst)
+            for api, (per_minute, burst) in (rates or {}).items()
+        }
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def _count(self, api: str, name: str, n=1):
+        with self._lock:
+            stats = self._stats.setdefault(api, {
+                "requests": 0, "throttled": 0, "throttle_wait_ms": 0.0, "retried": 0, "failed": 0,
+            })
+            stats[name] += n
+
+    def stats(self) -> dict:
+        """
+        {api: {"requests", "throttled", "throttle_wait_ms", "retried", "failed"}}
+        """
+        with self._lock:
+            return {api: dict(s) for api, s in self._stats.items()}
+
+    def backoff(self, attempt: int, retry_after: float = 0.0) -> float:
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        return max(delay, retry_after)
+
+    def run(self, api: str, send, status=None, idempotent: bool = True):
+        """
+        Jalankan send() (1 request HTTP) lewat token bucket `api`.
+
+        Retry kalau send() raise APIError / HttpError dengan status di
+        RETRY_STATUSES, atau kalau status(hasil) (untuk client yang tidak
+        raise, misal httplib2) ada di RETRY_STATUSES. Setelah retry habis,
+        error / hasil terakhir dikembalikan apa adanya.
+        idempotent=False : hanya NON_IDEMPOTENT_RETRY_STATUSES yang di-retry.
+        """
+        retry_statuses = RETRY_STATUSES if idempotent else NON_IDEMPOTENT_RETRY_STATUSES
+        bucket = self.buckets.get(api)
+        attempt = 0
+        while True:
+            if bucket is not None:
+                waited = bucket.acquire(_priority.get())
+                if waited > 0.001:
+                    self._count(api, "throttled")
+                    self._count(api, "throttle_wait_ms", waited * 1000)
+                    record_counter(f"{api}.throttled")
+            self._count(api, "requests")
+
+            try:
+                result = send()
+            except Exception as e:
+                code = _error_status(e)
+                if code not in retry_statuses or attempt >= self.max_retries:
+                    self._count(api, "failed")
+                    raise
+                delay = self.backoff(attempt, _retry_after(e))
+            else:
+                code = status(result) if status is not None else None
+                if code not in retry_statuses:
+                    return result
+                if attempt >= self.max_retries:
+                    self._count(api, "failed")
+                    return result
+                delay = self.backoff(attempt)
+
+            attempt += 1
+            self._count(api, "retried")
+            record_counter(f"{api}.retried")
+            time.sleep(delay)
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def get_scheduler() -> Scheduler:
+    """
+    Scheduler bersama untuk API Google asli (API_RATES, 1 per proses).
+    """
+    global _default
+
+    with _default_lock:
+        if _default is None:
+            _default = Scheduler(API_RATES)
+        return _default
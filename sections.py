@@ -0,0 +1,110 @@
+import re
+
+# =============================
+# CONFIG
+# =============================
+# Heading (1 baris penuh) yang membuka section di template laporan.
+# Section berlaku dari baris heading sampai heading berikutnya.
+SECTION_HEADINGS = {
+    "pl": [
+        r"(?i:PROFIT & LOSS)\b.*",
+        r"(?i:STATEMENT OF PROFIT OR LOSS)\b.*",
+    ],
+    "bs": [
+        r"(?i:BALANCE SHEET)\b.*",
+        r"(?i:STATEMENT OF FINANCIAL POSITION)\b.*",
+    ],
+    "cf": [
+        r"Cash Flow",
+        r"Cash Flow Charts",
+        r"(?i:STATEMENT OF CASH FLOWS?)\b.*",
+    ],
+    "kpi": [
+        r"KPI Results",
+        # halaman lanjutan tabel KPI cuma punya header kolom
+        r".*RESULT TARGET TREND IMPORTANCE",
+    ],
+    # judul halaman lain di template: cuma jadi batas akhir section di atasnya
+    "other": [
+        r"Basis of Preparation",
+        r"Executive Summary",
+        r"Alerts",
+        r"Revenue Analysis",
+        r"Profitability",
+        r"Profitability Charts",
+        r"Growth",
+        r"Financials",
+        r"KPIs Explained",
+    ],
+}
+
+# Pass halaman murah (extract_pdf.find_section_pages) pakai heading yang
+# sama, tapi dicari di mana saja dalam teks halaman: susunan baris teks
+# mentah pdfium tidak sama dengan pdfplumber. Section "other" tidak perlu.
+PAGE_HEADING_RE = re.compile(
+    "|".join(
+        f"(?:{p})"
+        for name, patterns in SECTION_HEADINGS.items()
+        if name != "other"
+        for p in patterns
+    ),
+    re.IGNORECASE,
+)
+
+# Semua heading digabung jadi 1 regex (named group per section),
+# jadi seluruh teks cukup discan sekali
+_HEADING_RE = re.compile(
+    r"^[ \t]*(?:"
+    + "|".join(
+        f"(?P<{name}>{'|'.join(f'(?:{p})' for p in patterns)})"
+        for name, patterns in SECTION_HEADINGS.items()
+    )
+    + r")[ \t]*$",
+    re.MULTILINE,
+)
+
+
+# =============================
+# SECTION INDEX
+# =============================
+def index_sections(text: str) -> dict:
+    """
+    Scan teks sekali, return offset tiap section:
+
+        {"pl": [(start, end)], "bs": [(start, end)], "kpi": [(s1, e1), (s2, e2)], ...}
+
+    Satu section bisa punya beberapa span (misal tabel KPI yang
+    nyambung ke halaman berikutnya). Section "other" tidak ikut di-return.
+    """
+    index = {}
+    current = None
+    start = 0
+
+    for m in _HEADING_RE.finditer(text):
+        if m.lastgroup == current:
+            # heading lanjutan section yang sama -> span diteruskan
+            continue
+        if current is not None and current != "other":
+            index.setdefault(current, []).append((start, m.start()))
+        current = m.lastgroup
+        start = m.start()
+
+    if current is not None and current != "other":
+        index.setdefault(current, []).append((start, len(text)))
+
+    return index
+
+
+def split_sections(text: str, index: dict = None) -> dict:
+    """
+    Return {"pl": teks, "bs": teks, "cf": teks, "kpi": teks}
+    (hanya section yang ketemu). Span yang lebih dari satu digabung
+    sesuai urutan di dokumen.
+    """
+    if index is None:
+        index = index_sections(text)
+
+    return {
+        name: "".join(text[start:end] for start, end in spans)
+        for name, spans in index.items()
+    }
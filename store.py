@@ -0,0 +1,320 @@
+# store.py
+# Penyimpanan lokal (SQLite) untuk semua data hasil parse:
+# P&L, Balance Sheet, Cash Flow, KPI Result dan META, per period.
+#
+# Ini sumber data utama. Google Sheet cuma "tampilan" yang di-sync:
+#   process_pdf -> simpan ke store -> sync period yang berubah ke Sheets
+#
+# Tiap (worksheet, period) punya hash isi. Sync hanya mengirim yang
+# hash-nya beda dengan hash saat sync terakhir, jadi PDF yang diproses
+# ulang tanpa perubahan tidak menulis apa-apa ke Sheets. Baca history /
+# diff / retry cukup dari file lokal, tanpa request ke Sheets API.
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+from google_sheet import FINANCIAL_HEADER, KPI_HEADER, META_HEADER, financial_rows
+
+# =========================
+# CONFIG
+# =========================
+STORE_DB_PATH = os.environ.get("STORE_DB_PATH", "financial_report.sqlite3")
+
+# worksheet -> (tabel, header sheet, jumlah kolom key untuk diff).
+# Kolom tabel = header tanpa "Period". Key: (Period, Account),
+# (Period, Category, KPI Name), META cukup (Period).
+WORKSHEETS = {
+    "P&L": ("financial", FINANCIAL_HEADER, 2),
+    "Balance Sheet": ("financial", FINANCIAL_HEADER, 2),
+    "Cash Flow": ("financial", FINANCIAL_HEADER, 2),
+    "KPI Result": ("kpi", KPI_HEADER, 3),
+    "META": ("meta", META_HEADER, 1),
+}
+# worksheet hasil parse (META diisi setelah upload Drive)
+REPORT_WORKSHEETS = ("P&L", "Balance Sheet", "Cash Flow", "KPI Result")
+
+# key hasil parse_report -> worksheet laporan keuangan
+_FINANCIAL_KEYS = {"pl": "P&L", "bs": "Balance Sheet", "cf": "Cash Flow"}
+
+# 1 (worksheet, period) yang diantrikan ke Sheets; rows = isi yang dikirim
+SyncItem = namedtuple("SyncItem", "worksheet period content_hash rows")
+
+
+def _column_name(label: str) -> str:
+    # "KPI Name" -> kpi_name, "PDF Drive Link" -> pdf_drive_link
+    return label.lower().replace(" ", "_")
+
+
+def _table_columns(header: list) -> list:
+    return [_column_name(h) for h in header[1:]]
+
+
+# =========================
+# DATABASE
+# =========================
+_SYNC_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sync_state (
+    worksheet TEXT NOT NULL,
+    period TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    source TEXT,
+    updated_at REAL NOT NULL,
+    synced_hash TEXT,
+    synced_rows TEXT,
+    synced_at REAL,
+    PRIMARY KEY (worksheet, period)
+)
+"""
+
+_initialized = set()
+_init_lock = threading.Lock()
+
+
+def _table_schemas() -> list:
+    schemas = {}
+    for table, header, _ in WORKSHEETS.values():
+        columns = "".join(f"    {c},\n" for c in _table_columns(header))
+        schemas[table] = (
+            f"CREATE TABLE IF NOT EXISTS {table} (\n"
+            "    worksheet TEXT NOT NULL,\n"
+            "    period TEXT NOT NULL,\n"
+            "    seq INTEGER NOT NULL,\n"
+            f"{columns}"
+            "    PRIMARY KEY (worksheet, period, seq)\n"
+            ")"
+        )
+    return list(schemas.values())
+
+
+@contextmanager
+def _connect():
+    """
+    Koneksi baru per operasi (aman dari thread job mana saja),
+    1 operasi = 1 transaksi, commit otomatis lalu ditutup.
+    """
+    path = STORE_DB_PATH
+    with _init_lock:
+        if path not in _initialized:
+            _init_db(path)
+            _initialized.add(path)
+
+    conn = sqlite3.connect(path, timeout=30)
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def _init_db(path: str):
+    conn = sqlite3.connect(path, timeout=30)
+    try:
+        with conn:
+            # WAL: baca history sementara job lain menulis
+            conn.execute("PRAGMA journal_mode=WAL")
+            for schema in _table_schemas():
+                conn.execute(schema)
+            conn.execute(_SYNC_SCHEMA)
+            # store lama belum punya snapshot baris -> sync pertama tulis penuh
+            columns = [r[1] for r in conn.execute("PRAGMA table_info(sync_state)")]
+            if "synced_rows" not in columns:
+                conn.execute("ALTER TABLE sync_state ADD COLUMN synced_rows TEXT")
+    finally:
+        conn.close()
+
+
+def content_hash(rows: list) -> str:
+    return hashlib.sha256(json.dumps(rows, default=str).encode("utf-8")).hexdigest()
+
+
+# =========================
+# WRITE
+# =========================
+def save_rows(worksheet: str, period: str, rows: list, source: str = None) -> bool:
+    """
+    Ganti semua baris `period` di worksheet dengan `rows`
+    (format baris sama dengan di sheet, kolom pertama = Period).
+    Return True kalau isinya berubah.
+    """
+    table, header, _ = WORKSHEETS[worksheet]
+    columns = _table_columns(header)
+    new_hash = content_hash(rows)
+    now = time.time()
+
+    with _connect() as conn:
+        row = conn.execute(
+            "SELECT content_hash FROM sync_state WHERE worksheet = ? AND period = ?",
+            (worksheet, period),
+        ).fetchone()
+        if row is not None and row[0] == new_hash:
+            return False
+
+        conn.execute(f"DELETE FROM {table} WHERE worksheet = ? AND period = ?", (worksheet, period))
+        conn.executemany(
+            f"INSERT INTO {table} (worksheet, period, seq, {', '.join(columns)}) "
+            f"VALUES (?, ?, ?{', ?' * len(columns)})",
+            [(worksheet, period, seq, *r[1:]) for seq, r in enumerate(rows)],
+        )
+        conn.execute(
+            "INSERT INTO sync_state (worksheet, period, content_hash, source, updated_at) "
+            "VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (worksheet, period) DO UPDATE SET "
+            "content_hash = excluded.content_hash, source = excluded.source, "
+            "updated_at = excluded.updated_at",
+            (worksheet, period, new_hash, source, now),
+        )
+    return True
+
+
+def save_report(parsed: dict, source: str = None) -> list:
+    """
+    Simpan hasil parse_report() 1 period. Return worksheet yang berubah.
+    KPI kosong tidak menimpa KPI yang sudah ada (sama seperti upsert sheet).
+    """
+    period = parsed["period"]
+    changed = []
+    for key, worksheet in _FINANCIAL_KEYS.items():
+        if save_rows(worksheet, period, financial_rows(period, parsed[key]), source):
+            changed.append(worksheet)
+    if parsed["kpi_rows"] and save_rows("KPI Result", period, parsed["kpi_rows"], source):
+        changed.append("KPI Result")
+    return changed
+
+
+def save_meta(period: str, drive_link: str) -> bool:
+    return save_rows("META", period, [[period, drive_link]])
+
+
+# =========================
+# READ
+# =========================
+def period_rows(worksheet: str, period: str) -> list:
+    """
+    Baris 1 period persis seperti di sheet (kolom pertama = Period).
+    """
+    with _connect() as conn:
+        return _select_rows(conn, worksheet, period)
+
+
+def _select_rows(conn, worksheet: str, period: str) -> list:
+    table, header, _ = WORKSHEETS[worksheet]
+    rows = conn.execute(
+        f"SELECT period, {', '.join(_table_columns(header))} FROM {table} "
+        "WHERE worksheet = ? AND period = ? ORDER BY seq",
+        (worksheet, period),
+    ).fetchall()
+    return [list(r) for r in rows]
+
+
+def list_periods(worksheet: str = None) -> list:
+    """
+    Period yang tersimpan, urut waktu update (paling lama dulu).
+    """
+    sql = "SELECT period, MIN(updated_at) AS t FROM sync_state"
+    params = ()
+    if worksheet is not None:
+        sql += " WHERE worksheet = ?"
+        params = (worksheet,)
+    with _connect() as conn:
+        rows = conn.execute(sql + " GROUP BY period ORDER BY t", params).fetchall()
+    return [r[0] for r in rows]
+
+
+def account_history(account: str, worksheet: str = "P&L") -> dict:
+    """
+    {period: value} 1 akun di semua period (P&L / Balance Sheet / Cash Flow).
+    """
+    with _connect() as conn:
+        rows = conn.execute(
+            "SELECT f.period, f.value FROM financial f "
+            "JOIN sync_state s ON s.worksheet = f.worksheet AND s.period = f.period "
+            "WHERE f.worksheet = ? AND f.account = ? ORDER BY s.updated_at, f.seq",
+            (worksheet, account),
+        ).fetchall()
+    history = {}
+    for period, value in rows:
+        history.setdefault(period, value)
+    return history
+
+
+# =========================
+# SYNC KE GOOGLE SHEET
+# =========================
+def pending_sync(periods: list = None, worksheets: list = None, force: bool = False) -> list:
+    """
+    [(worksheet, period)] yang isinya berubah sejak sync terakhir
+    (atau belum pernah di-sync). force = semua, berubah atau tidak.
+    """
+    with _connect() as conn:
+        rows = conn.execute(
+            "SELECT worksheet, period, content_hash, synced_hash FROM sync_state ORDER BY updated_at"
+        ).fetchall()
+
+    return [
+        (worksheet, period)
+        for worksheet, period, h, synced in rows
+        if (force or h != synced)
+        and (periods is None or period in periods)
+        and (worksheets is None or worksheet in worksheets)
+    ]
+
+
+def _read_for_sync(worksheet: str, period: str):
+    """
+    (content_hash, baris sekarang, baris saat sync terakhir / None)
+    dibaca dalam 1 transaksi, jadi hash pasti cocok dengan barisnya.
+    """
+    with _connect() as conn:
+        conn.execute("BEGIN")
+        h, synced_rows = conn.execute(
+            "SELECT content_hash, synced_rows FROM sync_state WHERE worksheet = ? AND period = ?",
+            (worksheet, period),
+        ).fetchone()
+        rows = _select_rows(conn, worksheet, period)
+    return h, rows, json.loads(synced_rows) if synced_rows else None
+
+
+def queue_sync(batch, periods: list = None, worksheets: list = None, force: bool = False) -> list:
+    """
+    Antrikan (worksheet, period) yang berubah ke SheetWriteBatch.
+
+    Kalau ada snapshot sync terakhir, yang dikirim hanya selisihnya
+    (batch.diff_period, dicocokkan lewat key WORKSHEETS). force = tulis
+    ulang penuh, untuk sheet yang diedit manual / tidak sesuai snapshot.
+
+    Return SyncItem yang diantrikan; panggil mark_synced(items) setelah
+    batch.commit() berhasil. Kalau commit gagal, item tetap pending
+    dan ikut terkirim di sync berikutnya.
+    """
+    items = []
+    for worksheet, period in pending_sync(periods, worksheets, force):
+        _, header, key_columns = WORKSHEETS[worksheet]
+        h, rows, previous = _read_for_sync(worksheet, period)
+
+        if previous is None or force:
+            batch.upsert_period(worksheet, header, period, rows)
+        else:
+            batch.diff_period(worksheet, header, period, previous, rows, key_columns)
+        items.append(SyncItem(worksheet, period, h, rows))
+    return items
+
+
+def mark_synced(items: list):
+    now = time.time()
+    with _connect() as conn:
+        # yang dicatat hash saat diantrikan: kalau period ditulis ulang
+        # di tengah sync, content_hash != synced_hash -> tetap pending
+        conn.executemany(
+            "UPDATE sync_state SET synced_hash = ?, synced_rows = ?, synced_at = ? "
+            "WHERE worksheet = ? AND period = ?",
+            [
+                (item.content_hash, json.dumps(item.rows, default=str), now, item.worksheet, item.period)
+                for item in items
+            ],
+        )
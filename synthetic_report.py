@@ -0,0 +1,286 @@
+# synthetic_report.py
+# Generator laporan PDF sintetis dengan format yang sama seperti laporan
+# bulanan asli (cover, P&L, Balance Sheet, Cash Flow, tabel KPI, halaman
+# chart / penjelasan), untuk benchmark & test tanpa data klien.
+#
+# Ukuran bisa di-scale: jumlah halaman filler, jumlah akun P&L / BS,
+# jumlah baris KPI, dan period. PDF ditulis langsung (Helvetica standar),
+# jadi tidak butuh library tambahan.
+#
+# Jalankan:
+#   python synthetic_report.py out.pdf [filler_pages] [accounts] [kpi_rows] [period]
+
+import random
+import sys
+
+from parse_bs import BS_ACCOUNTS
+from parse_cashflow import CF_ACCOUNTS
+from parse_kpi import IMPORTANCE_LEVELS, KPI_CATEGORIES
+
+# =========================
+# CONFIG
+# =========================
+PAGE_WIDTH = 595  # A4, point
+PAGE_HEIGHT = 842
+FONT_SIZE = 9
+LINE_HEIGHT = 12
+MARGIN = 40
+LINES_PER_PAGE = (PAGE_HEIGHT - 2 * MARGIN) // LINE_HEIGHT
+
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+PL_ACCOUNTS = [
+    "Revenue",
+    "Cost of Sales",
+    "Gross Profit",
+    "Expenses",
+    "Operating Profit",
+    "Other Income",
+    "Other Expenses",
+    "Earnings Before Interest & Tax",
+    "Interest Income",
+    "Interest Expenses",
+    "Earnings Before Tax",
+    "Tax Expenses",
+    "Earnings After Tax",
+    "Dividends",
+    "Net Income",
+]
+# akun yang di laporan asli biasanya Rp0 (variance "-")
+PL_ZERO_ACCOUNTS = {"Other Expenses", "Interest Expenses", "Dividends"}
+
+KPI_UNITS = ["%", "times", "days"]
+
+LOREM = (
+    "This chart compares the current month against the previous months and "
+    "the same month last year so that movements in the business are easy to read"
+).split()
+
+
+# =========================
+# HELPERS
+# =========================
+def _rp(value: int) -> str:
+    """2722196641 -> 'Rp2.722.196.641', negatif -> '-Rp...'"""
+    sign = "-" if value < 0 else ""
+    return f"{sign}Rp{abs(value):,}".replace(",", ".")
+
+
+def _pct(value: float) -> str:
+    """59.67 -> '59,67'"""
+    return f"{value:.2f}".replace(".", ",")
+
+
+def _previous_period(period: str) -> str:
+    month, year = period.split()
+    idx = MONTHS.index(month[:3].title())
+    if idx == 0:
+        return f"Dec {int(year) - 1}"
+    return f"{MONTHS[idx - 1]} {year}"
+
+
+def _paginate(title: str, lines: list, continuation: str = None) -> list:
+    """
+    Pecah 1 section jadi beberapa halaman. Halaman lanjutan diberi
+    judul `continuation` (None = pakai title lagi).
+    """
+    per_page = LINES_PER_PAGE - 1
+    pages = []
+    for start in range(0, max(len(lines), 1), per_page):
+        heading = title if not pages else (continuation or title)
+        pages.append([heading] + lines[start:start + per_page])
+    return pages
+
+
+# =========================
+# REPORT CONTENT
+# =========================
+def generate_report(
+    period: str = "Nov 2025",
+    filler_pages: int = 10,
+    extra_accounts: int = 0,
+    kpi_rows: int = 28,
+    seed: int = 0,
+):
+    """
+    Susun isi laporan sintetis.
+
+    filler_pages   : halaman chart / penjelasan tanpa section (tidak diparse)
+    extra_accounts : akun tambahan di P&L dan Balance Sheet
+    kpi_rows       : jumlah baris tabel KPI (dibagi rata ke 8 kategori)
+
+    Return (pages, expected):
+        pages    : list halaman, tiap halaman list baris teks
+        expected : hasil parse_* yang seharusnya keluar dari PDF ini
+                   ({"period", "pl", "bs", "cf", "kpi_rows"}), plus
+                   "statements": {"pl": {...}, "bs": {...}} berisi SEMUA
+                   akun tabel dengan nilai bertanda (kolom period berjalan)
+    """
+    rng = random.Random(seed)
+    month, year = period.split()
+    previous = _previous_period(period)
+
+    def money(lo=0, hi=10**10):
+        return rng.randint(lo, hi)
+
+    pages = []
+    expected = {"period": period, "pl": {}, "bs": {}, "cf": {}, "kpi_rows": []}
+    expected["statements"] = {"pl": {}, "bs": {}}
+
+    # ---------- COVER ----------
+    pages.append([
+        "Monthly Performance Report",
+        "Synthetic Group",
+        f"{month} {year}",
+    ])
+
+    # ---------- P&L ----------
+    pl_lines = []
+    pl_accounts = PL_ACCOUNTS + [f"Other Revenue Stream {i:04d}" for i in range(extra_accounts)]
+    for account in pl_accounts:
+        if account in PL_ZERO_ACCOUNTS:
+            # parse_profit_loss cari angka ber-separator ribuan, "Rp0" terlewat
+            pl_lines.append(f"{account} Rp0 Rp0 -")
+            expected["statements"]["pl"][account] = 0
+            continue
+
+        current, last = money(1000), money(1000)
+        pl_lines.append(f"{account} {_rp(current)} {_rp(last)} {_pct(rng.uniform(-99, 99))}%")
+        expected["pl"][account] = current
+        expected["statements"]["pl"][account] = current
+    pages += _paginate(f"PROFIT & LOSS {period} {previous} Variance %", pl_lines)
+
+    # ---------- BALANCE SHEET ----------
+    bs_lines = []
+    bs_extra = [f"Sub Ledger Account {i:04d}" for i in range(extra_accounts)]
+    for account in BS_ACCOUNTS + bs_extra:
+        current, last = money(-10**9), money(-10**9)
+        bs_lines.append(f"{account} {_rp(current)} {_rp(last)} {_pct(rng.uniform(-99, 99))}%")
+        expected["statements"]["bs"][account] = current
+        if account in BS_ACCOUNTS and current >= 0:
+            # parser butuh "<akun> Rp<angka>", nilai "-Rp..." tidak diambil
+            expected["bs"][account] = current
+    pages += _paginate(f"BALANCE SHEET {period} {previous} Variance %", bs_lines)
+
+    # ---------- CASH FLOW ----------
+    cf_lines = ["OPERATING CASH FLOW FREE CASH FLOW NET CASH FLOW"]
+    for account in CF_ACCOUNTS:
+        current = money()
+        history = " ".join(_rp(money()) for _ in range(3))
+        cf_lines.append(f"{account} {_rp(current)} {history}")
+        expected["cf"][account] = current
+    pages += _paginate("Cash Flow", cf_lines)
+
+    # ---------- KPI TABLE ----------
+    kpi_lines = ["1 ALERT RESULT TARGET TREND IMPORTANCE"]
+    categories = list(KPI_CATEGORIES.items())
+    last_key = None
+    for i in range(kpi_rows):
+        key, category = categories[i * len(categories) // kpi_rows]
+        if key != last_key:
+            # baris kategori pertama juga memuat period pembanding
+            kpi_lines.append(f"{key} {period.upper()} vs {previous.upper()}" if last_key is None else key)
+            last_key = key
+
+        name = f"Synthetic Ratio {chr(65 + i % 26)}{i // 26}"
+        unit = KPI_UNITS[i % len(KPI_UNITS)]
+        values = [round(rng.uniform(-500, 500), 2) for _ in range(3)]
+        importance = IMPORTANCE_LEVELS[i % len(IMPORTANCE_LEVELS)]
+
+        if unit == "%":
+            cells = [f"{_pct(v)}%" for v in values]
+        else:
+            cells = [f"{_pct(v)} {unit}" for v in values]
+        kpi_lines.append(f"{name} {' '.join(cells)} {importance}")
+        expected["kpi_rows"].append([
+            period, category, name,
+            values[0], unit, values[1], unit, values[2], unit,
+            importance,
+        ])
+    pages += _paginate("KPI Results", kpi_lines, continuation="RESULT TARGET TREND IMPORTANCE")
+
+    # ---------- FILLER (CHART / PENJELASAN) ----------
+    for i in range(filler_pages):
+        lines = [
+            " ".join(rng.choice(LOREM) for _ in range(14))
+            for _ in range(LINES_PER_PAGE - 1)
+        ]
+        pages.append(["Growth" if i % 2 else "Revenue Analysis"] + lines)
+
+    return pages, expected
+
+
+# =========================
+# PDF WRITER
+# =========================
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _content_stream(lines: list) -> bytes:
+    ops = [f"BT /F1 {FONT_SIZE} Tf {LINE_HEIGHT} TL {MARGIN} {PAGE_HEIGHT - MARGIN} Td"]
+    for line in lines:
+        ops.append(f"({_escape(line)}) Tj T*")
+    ops.append("ET")
+    return "\n".join(ops).encode("latin-1")
+
+
+def build_pdf(pages: list) -> bytes:
+    """
+    list halaman (list baris teks) -> bytes PDF 1.4 minimal
+    (font Helvetica standar, 1 baris teks per baris PDF).
+    """
+    n = len(pages)
+    # nomor object: 1 catalog, 2 pages, 3 font, lalu (page, content) per halaman
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    }
+    kids = []
+    for i, lines in enumerate(pages):
+        page_id, content_id = 4 + 2 * i, 5 + 2 * i
+        kids.append(f"{page_id} 0 R")
+        stream = _content_stream(lines)
+        objects[page_id] = (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>"
+        ).encode()
+        objects[content_id] = (
+            f"<< /Length {len(stream)} >>\nstream\n".encode() + stream + b"\nendstream"
+        )
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {n} >>".encode()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for obj_id in sorted(objects):
+        offsets[obj_id] = len(out)
+        out += f"{obj_id} 0 obj\n".encode() + objects[obj_id] + b"\nendobj\n"
+
+    xref_at = len(out)
+    size = max(objects) + 1
+    out += f"xref\n0 {size}\n0000000000 65535 f \n".encode()
+    for obj_id in range(1, size):
+        out += f"{offsets[obj_id]:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {size} /Root 1 0 R >>\nstartxref\n{xref_at}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+def synthetic_pdf(**kwargs):
+    """
+    Return (pdf_bytes, expected). Argumen sama dengan generate_report().
+    """
+    pages, expected = generate_report(**kwargs)
+    return build_pdf(pages), expected
+
+
+if __name__ == "__main__":
+    out_path = sys.argv[1] if len(sys.argv) > 1 else "synthetic_report.pdf"
+    pdf, _ = synthetic_pdf(
+        filler_pages=int(sys.argv[2]) if len(sys.argv) > 2 else 10,
+        extra_accounts=int(sys.argv[3]) if len(sys.argv) > 3 else 0,
+        kpi_rows=int(sys.argv[4]) if len(sys.argv) > 4 else 28,
+        period=sys.argv[5] if len(sys.argv) > 5 else "Nov 2025",
+    )
+    with open(out_path, "wb") as f:
+        f.write(pdf)
+    print(f"📄 {out_path}: {len(pdf)} bytes")
@@ -0,0 +1,201 @@
+# table_extract.py
+# Backend ekstraksi kedua untuk tabel laporan keuangan (P&L, Balance Sheet):
+# tidak lewat teks gabungan + regex, tapi langsung dari koordinat kata
+# pdfplumber.
+#
+#   PROFIT & LOSS        Nov 2025      Oct 2025   Variance %   <- baris judul
+#   Revenue        Rp2.722.196.641 Rp1.900.532.746    43,23%   <- baris akun
+#
+# - baris = kata dengan posisi `top` yang (hampir) sama
+# - kolom = label header di baris judul; angka di tabel rata kanan, jadi
+#   tiap angka masuk ke kolom yang ujung kanannya paling dekat
+# - akun  = kata di kiri angka pertama
+# Hasilnya cell bertipe (account, column, value), termasuk nilai Rp0,
+# angka negatif (-Rp...) dan semua kolom, yang tidak bisa diambil
+# parse_profit_loss / parse_balance_sheet.
+
+import re
+from collections import namedtuple
+
+import pdfplumber
+
+from extract_pdf import find_section_pages
+from pdf_source import open_input
+
+# =========================
+# CONFIG
+# =========================
+# section -> judul tabel (awal baris judul, huruf besar)
+STATEMENT_TITLES = {
+    "pl": ("PROFIT & LOSS", "STATEMENT OF PROFIT OR LOSS"),
+    "bs": ("BALANCE SHEET", "STATEMENT OF FINANCIAL POSITION"),
+}
+
+# Kata dengan selisih `top` <= ini dianggap 1 baris (point)
+ROW_TOLERANCE = 3
+# Jarak horizontal antar kata header > ini = label kolom baru (point)
+HEADER_GAP = 8
+
+_RP_RE = re.compile(r"^(-?)Rp([\d.]+)$")
+_PCT_RE = re.compile(r"^(-?[\d.]*,?\d+)%$")
+
+Cell = namedtuple("Cell", "section group account column value unit")
+
+
+# =========================
+# HELPERS
+# =========================
+def parse_value(token: str):
+    """
+    Token angka -> (value, unit), atau None kalau bukan angka tabel.
+        'Rp1.900.532.746' -> (1900532746, 'Rp')
+        '-Rp404.888.017'  -> (-404888017, 'Rp')
+        '-55,08%'         -> (-55.08, '%')
+        '-'               -> (None, '')   (sel kosong)
+    """
+    m = _RP_RE.match(token)
+    if m:
+        value = int(m.group(2).replace(".", ""))
+        return (-value if m.group(1) else value), "Rp"
+
+    m = _PCT_RE.match(token)
+    if m:
+        return float(m.group(1).replace(".", "").replace(",", ".")), "%"
+
+    if token in ("-", "—"):
+        return None, ""
+    return None
+
+
+def group_rows(words: list) -> list:
+    """
+    Kelompokkan kata jadi baris (urut atas -> bawah, kiri -> kanan).
+    """
+    rows = []
+    for w in sorted(words, key=lambda w: (w["top"], w["x0"])):
+        if rows and abs(w["top"] - rows[-1][0]["top"]) <= ROW_TOLERANCE:
+            rows[-1].append(w)
+        else:
+            rows.append([w])
+    for row in rows:
+        row.sort(key=lambda w: w["x0"])
+    return rows
+
+
+def _row_text(row: list) -> str:
+    return " ".join(w["text"] for w in row)
+
+
+def _match_title(row: list):
+    """
+    Return (section, jumlah kata judul) kalau baris ini judul tabel.
+    """
+    text = _row_text(row).upper()
+    for section, titles in STATEMENT_TITLES.items():
+        for title in titles:
+            if text.startswith(title):
+                return section, len(title.split())
+    return None
+
+
+def _header_columns(words: list) -> list:
+    """
+    Kata header di kanan judul -> [(label, x1)], digabung per celah.
+    """
+    columns = []
+    for w in words:
+        if columns and w["x0"] - columns[-1][1] <= HEADER_GAP:
+            columns[-1] = (f"{columns[-1][0]} {w['text']}", w["x1"])
+        else:
+            columns.append((w["text"], w["x1"]))
+    return columns
+
+
+def _nearest_column(columns: list, x1: float) -> str:
+    return min(columns, key=lambda c: abs(c[1] - x1))[0]
+
+
+# =========================
+# EXTRACTION
+# =========================
+def cells_from_words(words: list) -> list:
+    """
+    Kata 1 halaman (hasil page.extract_words()) -> list Cell untuk semua
+    tabel laporan di halaman itu. Satu tabel = dari baris judul sampai
+    baris judul tabel berikutnya (bounding box section).
+    """
+    cells = []
+    section = None
+    columns = []
+    group = ""
+
+    for row in group_rows(words):
+        title = _match_title(row)
+        if title is not None:
+            section, n_title_words = title
+            columns = _header_columns(row[n_title_words:])
+            group = ""
+            continue
+
+        if section is None or not columns:
+            continue
+
+        # kata pertama selalu bagian nama akun, angka mulai dari kata berikutnya
+        parsed = [parse_value(w["text"]) for w in row]
+        first = next((i for i in range(1, len(row)) if parsed[i] is not None), None)
+
+        if first is None:
+            if _row_text(row).isupper():
+                # baris grup tanpa angka: ASSETS / LIABILITIES / EQUITY
+                group = _row_text(row)
+            continue
+
+        if any(p is None for p in parsed[first:]):
+            # ada teks setelah angka: bukan baris tabel
+            continue
+
+        account = " ".join(w["text"] for w in row[:first])
+        for w, (value, unit) in zip(row[first:], parsed[first:]):
+            cells.append(Cell(section, group, account, _nearest_column(columns, w["x1"]), value, unit))
+
+    return cells
+
+
+def extract_statement_cells(pdf_source, sections=None) -> list:
+    """
+    Ekstrak cell tabel P&L / Balance Sheet dari PDF.
+    Hanya halaman yang mengandung judul tabel yang dibaca (pass pdfium murah).
+    """
+    if sections is None:
+        sections = list(STATEMENT_TITLES)
+    titles = [t for s in sections for t in STATEMENT_TITLES[s]]
+
+    pages = [i + 1 for i in find_section_pages(pdf_source, titles)]  # 1-based
+
+    cells = []
+    with pdfplumber.open(open_input(pdf_source), pages=pages) as pdf:
+        for page in pdf.pages:
+            words = page.extract_words()
+            page.close()  # buang cache char / layout halaman ini
+            cells += [c for c in cells_from_words(words) if c.section in sections]
+    return cells
+
+
+def statement_values(cells: list, section: str, column_index: int = 0) -> dict:
+    """
+    {account: value} untuk 1 kolom (default kolom pertama = period
+    berjalan), urut sesuai tabel. Akun dengan nama sama diambil yang pertama.
+    """
+    columns = []
+    for c in cells:
+        if c.section == section and c.unit == "Rp" and c.column not in columns:
+            columns.append(c.column)
+    if column_index >= len(columns):
+        return {}
+
+    column = columns[column_index]
+    values = {}
+    for c in cells:
+        if c.section == section and c.column == column:
+            values.setdefault(c.account, c.value)
+    return values
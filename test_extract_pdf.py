@@ -0,0 +1,152 @@
+from extract_pdf import _split_page_ranges, extract_text
+
+
+def test_split_page_ranges_covers_all_pages_in_order():
+    ranges = _split_page_ranges(19, 4)
+    assert ranges == [(0, 5), (5, 10), (10, 15), (15, 19)]
+    assert _split_page_ranges(3, 8) == [(0, 1), (1, 2), (2, 3)]
+
+
+def test_parallel_matches_serial():
+    serial = extract_text("report.pdf", workers=1, use_cache=False)
+    parallel = extract_text("report.pdf", workers=3, use_cache=False)
+    assert parallel == serial
+
+
+def test_section_text_parallel_matches_serial(monkeypatch):
+    import extract_pdf
+
+    monkeypatch.setattr(extract_pdf, "MIN_PAGES_FOR_PARALLEL", 1)
+    serial = extract_pdf.extract_section_text("report.pdf", use_cache=False, workers=1)
+    parallel = extract_pdf.extract_section_text("report.pdf", use_cache=False, workers=2)
+    assert parallel == serial
+
+
+def test_cache_hit_skips_pdf_parsing(tmp_path, monkeypatch):
+    import extract_pdf
+
+    monkeypatch.setattr(extract_pdf, "CACHE_DIR", str(tmp_path))
+    first = extract_pdf.extract_text("report.pdf", use_cache=True)
+
+    def fail_open(*args, **kwargs):
+        raise AssertionError("pdfplumber.open dipanggil padahal cache hit")
+
+    monkeypatch.setattr(extract_pdf.pdfplumber, "open", fail_open)
+    assert extract_pdf.extract_text("report.pdf", use_cache=True) == first
+
+
+def test_cache_evicts_least_recently_used(tmp_path, monkeypatch):
+    import os
+
+    import extract_pdf
+
+    monkeypatch.setattr(extract_pdf, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(extract_pdf, "CACHE_MAX_BYTES", 25)
+
+    extract_pdf.cache_put("a", "x" * 10)
+    extract_pdf.cache_put("b", "y" * 10)
+    os.utime(tmp_path / "a.txt", (1, 1))
+    os.utime(tmp_path / "b.txt", (2, 2))
+    extract_pdf.cache_get("a")  # a jadi paling baru dipakai
+
+    extract_pdf.cache_put("c", "z" * 10)
+    assert extract_pdf.cache_get("b") is None
+    assert extract_pdf.cache_get("a") == "x" * 10
+    assert extract_pdf.cache_get("c") == "z" * 10
+
+
+def test_section_text_gives_same_parse_results():
+    from extract_pdf import extract_section_text
+    from parse_bs import parse_balance_sheet
+    from parse_cashflow import parse_cashflow
+    from parse_kpi import parse_kpi_result
+    from parse_pl import detect_period, parse_profit_loss
+
+    full = extract_text("report.pdf", use_cache=False)
+    lazy = extract_section_text("report.pdf", use_cache=False)
+    assert len(lazy) < len(full)
+
+    period = detect_period(full)
+    assert detect_period(lazy) == period
+    assert parse_profit_loss(lazy) == parse_profit_loss(full)
+    assert parse_balance_sheet(lazy) == parse_balance_sheet(full)
+    assert parse_cashflow(lazy) == parse_cashflow(full)
+    assert parse_kpi_result(lazy, period) == parse_kpi_result(full, period)
+
+
+def test_bytes_and_stream_input_match_path():
+    import io
+
+    with open("report.pdf", "rb") as f:
+        data = f.read()
+
+    from_path = extract_text("report.pdf", use_cache=False)
+    assert extract_text(data, use_cache=False) == from_path
+
+    stream = io.BytesIO(data)
+    stream.seek(123)
+    assert extract_text(stream, use_cache=False) == from_path
+    assert extract_text(stream, workers=2, use_cache=False) == from_path
+
+
+def test_pdfium_engine_gives_same_parse_results():
+    from bench_engines import parse_all
+
+    reference = parse_all(extract_text("report.pdf", use_cache=False, engine="pdfplumber"))
+    assert parse_all(extract_text("report.pdf", use_cache=False, engine="pdfium")) == reference
+
+
+def test_engine_selection_and_cache_key(monkeypatch):
+    import pytest
+
+    import extract_pdf
+
+    with pytest.raises(ValueError):
+        extract_text("report.pdf", use_cache=False, engine="ocr")
+
+    monkeypatch.setattr(extract_pdf, "ENGINES", dict(extract_pdf.ENGINES))
+    extract_pdf.register_engine("upper", lambda src, pages=None: iter([(0, "HALO")]), "1")
+    monkeypatch.setattr(extract_pdf, "EXTRACT_ENGINE", "upper")
+    assert extract_text("report.pdf", use_cache=False) == "HALO\n"
+
+    keys = {extract_pdf.pdf_cache_key("report.pdf", e) for e in ("pdfplumber", "pdfium", None)}
+    assert len(keys) == 3
+
+
+def test_pdfplumber_pages_closed_while_streaming(monkeypatch):
+    import pdfplumber.page
+
+    from extract_pdf import iter_page_texts
+
+    closed = []
+    original = pdfplumber.page.Page.close
+
+    def close(page):
+        closed.append(page.page_number)
+        original(page)
+
+    monkeypatch.setattr(pdfplumber.page.Page, "close", close)
+
+    pages = iter_page_texts("report.pdf", [0, 3, 5], engine="pdfplumber")
+    assert next(pages)[0] == 0
+    assert closed == [1]  # halaman selesai langsung dibuang, tidak nunggu PDF ditutup
+    assert next(pages)[0] == 3
+    assert closed == [1, 4]
+    assert [i for i, _ in pages] == [5]
+
+
+def test_section_cache_key_follows_page_filter(tmp_path, monkeypatch):
+    import extract_pdf
+
+    monkeypatch.setattr(extract_pdf, "CACHE_DIR", str(tmp_path))
+    before = extract_pdf.section_filter_key()
+    extract_pdf.extract_section_text("report.pdf", use_cache=True)
+
+    # config filter halaman berubah -> teks lama di cache tidak dipakai
+    monkeypatch.setattr(extract_pdf, "ALWAYS_PAGES", (0, 1))
+    assert extract_pdf.section_filter_key() != before
+    calls = []
+    find = extract_pdf.find_section_pages
+    monkeypatch.setattr(extract_pdf, "find_section_pages", lambda *a: calls.append(a) or find(*a))
+    extract_pdf.extract_section_text("report.pdf", use_cache=True)
+    assert calls
@@ -0,0 +1,159 @@
+import time
+
+import gspread
+import pytest
+
+import fake_google
+import google_clients
+import main
+import upload_to_drive
+from scheduler import Scheduler
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    monkeypatch.setattr(google_clients, "BACKEND", "fake")
+    monkeypatch.setattr(upload_to_drive, "_folder_cache", {})
+    backend = fake_google.FakeBackend(latency=0.05)
+    fake_google.set_backend(backend)
+    yield backend
+    fake_google.set_backend(None)
+
+
+def test_process_pdf_offline(backend, monkeypatch):
+    # ekstraksi di luar pengukuran: yang diukur cuma I/O ke Google palsu
+    text = main.extract_section_text("report.pdf", use_cache=False)
+    monkeypatch.setattr(main, "extract_section_text", lambda src: text)
+
+    started = time.perf_counter()
+    result = main.process_pdf("report.pdf")
+    elapsed = time.perf_counter() - started
+
+    counts = backend.request_counts()
+    assert result["sheets_requests"] == counts["sheets"]
+    assert result["trace"]["api_requests"] == counts
+    # folder tahun + bulan (list + create), cek file, upload
+    assert backend.counts["drive.files.list"] == 3
+    assert backend.counts["drive.files.create"] == 3
+    # upload Drive jalan paralel dengan Sheets, jadi wall time
+    # < total latency semua request
+    assert elapsed < 0.05 * (counts["sheets"] + counts["drive"])
+
+    sheet = backend.spreadsheet(key=main.SPREADSHEET_NAME)
+    assert len(sheet.sheets["P&L"].rows) == 1 + result["pl_rows"]
+    assert sheet.sheets["META"].rows[1] == [result["period"], result["drive_link"]]
+
+    # PDF sama diproses ulang: folder dari cache, file tidak di-upload lagi
+    backend.reset_counts()
+    again = main.process_pdf("report.pdf")
+    assert again["drive_link"] == result["drive_link"]
+    assert backend.counts["drive.files.list"] == 1
+    assert backend.counts["drive.files.create"] == 0
+    assert len(sheet.sheets["P&L"].rows) == 1 + result["pl_rows"]
+    # data sama dengan store lokal -> tidak ada yang dikirim ke Sheets
+    assert again["synced"] == 0
+    assert again["sheets_requests"] == 0
+
+
+def test_quota_exceeded_raises_429(backend):
+    backend.latency = 0
+    backend.quotas["sheets"] = 2
+    backend.scheduler = Scheduler(max_retries=0)
+
+    sheet = google_clients.get_spreadsheet([], key="k")
+    sheet.worksheets()
+    sheet.worksheets()
+    with pytest.raises(gspread.exceptions.APIError) as exc:
+        sheet.worksheets()
+    assert exc.value.code == 429
+    assert backend.rejected["sheets.worksheets"] == 1
+
+
+def test_concurrent_jobs_keep_both_periods(backend, monkeypatch, tmp_path):
+    import shutil
+    import threading
+
+    # 2 job jalan bersamaan (MAX_CONCURRENT_JOBS), period berbeda
+    text = main.extract_section_text("report.pdf", use_cache=False)
+    periods = {"nov.pdf": "Nov 2025", "dec.pdf": "Dec 2025"}
+    monkeypatch.setattr(main, "extract_section_text", lambda src: periods[src.name] + "\n" + text)
+    monkeypatch.setattr(main, "detect_period", lambda t: t.split("\n", 1)[0])
+
+    results = {}
+    threads = []
+    for name in periods:
+        path = tmp_path / name
+        shutil.copy("report.pdf", path)
+        t = threading.Thread(target=lambda p=path: results.setdefault(p.name, main.process_pdf(p)))
+        t.start()
+        threads.append(t)
+    for t in threads:
+        t.join()
+
+    sheet = backend.spreadsheet(key=main.SPREADSHEET_NAME)
+    pl = [r[0] for r in sheet.sheets["P&L"].rows[1:]]
+    for name, period in periods.items():
+        assert pl.count(period) == results[name]["pl_rows"]
+    assert sorted(r[0] for r in sheet.sheets["META"].rows[1:]) == ["Dec 2025", "Nov 2025"]
+
+
+def test_parallel_uploads_share_one_year_folder(backend):
+    from concurrent.futures import ThreadPoolExecutor
+
+    # batch: BATCH_UPLOAD_THREADS upload bersamaan ke folder tahun yang sama
+    service = upload_to_drive.get_drive_service()
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        ids = set(pool.map(
+            lambda _: upload_to_drive.get_or_create_folder(service, "2026", upload_to_drive.ROOT_FOLDER_ID),
+            range(4),
+        ))
+
+    folders = [f for f in backend.drive_files.values() if f["name"] == "2026"]
+    assert len(folders) == 1
+    assert ids == {folders[0]["id"]}
+
+
+def test_unknown_period_fails_before_any_write(backend, monkeypatch):
+    import store
+
+    monkeypatch.setattr(main, "extract_section_text", lambda src: "no period here")
+    with pytest.raises(ValueError):
+        main.process_pdf("report.pdf")
+
+    assert backend.request_counts() == {"sheets": 0, "drive": 0}
+    assert store.list_periods() == []
+
+
+def test_parallel_uploads_same_period_create_one_file(backend):
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        links = set(pool.map(lambda _: upload_to_drive.upload_pdf_to_drive("report.pdf", "Jan 2026"), range(2)))
+
+    files = [f for f in backend.drive_files.values() if f["name"] == "PL_Jan_2026.pdf"]
+    assert len(files) == 1
+    assert len(links) == 1
+
+
+def test_batch_overlapping_uploads(backend, monkeypatch, tmp_path):
+    import shutil
+
+    # upload Drive 2 period berbeda jalan bersamaan di thread pool batch
+    text = main.extract_section_text("report.pdf", use_cache=False)
+    periods = {"nov.pdf": "Nov 2025", "dec.pdf": "Dec 2025"}
+    monkeypatch.setattr(
+        main, "extract_section_text",
+        lambda src, **kwargs: periods[src.rsplit("/", 1)[-1]] + "\n" + text,
+    )
+    monkeypatch.setattr(main, "detect_period", lambda t: t.split("\n", 1)[0])
+    paths = []
+    for name in periods:
+        shutil.copy("report.pdf", tmp_path / name)
+        paths.append(str(tmp_path / name))
+
+    summary = main.process_batch(paths, workers=1)
+
+    assert summary["errors"] == {}
+    assert summary["drive_uploads"] == 2
+    sheet = backend.spreadsheet(key=main.SPREADSHEET_NAME)
+    assert sorted(r[0] for r in sheet.sheets["META"].rows[1:]) == ["Dec 2025", "Nov 2025"]
@@ -0,0 +1,74 @@
+from datetime import timedelta
+
+import google_clients
+
+
+class FakeCreds:
+    def __init__(self, token, expires_in):
+        self.token = token
+        self.expiry = google_clients._utcnow() + expires_in
+        self.refreshed = 0
+
+    def refresh(self, request):
+        self.refreshed += 1
+        self.token = "new-token"
+        self.expiry = google_clients._utcnow() + timedelta(hours=1)
+
+
+def test_token_refreshed_before_expiry():
+    fresh = FakeCreds("tok", timedelta(minutes=30))
+    assert google_clients.refresh_if_needed(fresh) is False
+    assert fresh.refreshed == 0
+
+    # sisa umur < TOKEN_REFRESH_MARGIN -> refresh duluan
+    almost = FakeCreds("tok", timedelta(minutes=2))
+    assert google_clients.refresh_if_needed(almost) is True
+    assert almost.refreshed == 1
+
+    missing = FakeCreds(None, timedelta(hours=1))
+    assert google_clients.refresh_if_needed(missing) is True
+
+
+def test_spreadsheet_opened_by_name_only_once(monkeypatch):
+    class FakeSpreadsheet:
+        id = "key-123"
+
+    class FakeClient:
+        def __init__(self):
+            self.calls = []
+
+        def open(self, name):
+            self.calls.append(("open", name))
+            return FakeSpreadsheet()
+
+        def open_by_key(self, key):
+            self.calls.append(("open_by_key", key))
+            return FakeSpreadsheet()
+
+    client = FakeClient()
+    google_clients.reset_clients()
+    monkeypatch.setattr(google_clients, "get_sheets_client", lambda scopes: client)
+
+    first = google_clients.get_spreadsheet([], name="FINANCIAL_REPORT")
+    second = google_clients.get_spreadsheet([], name="FINANCIAL_REPORT")
+    third = google_clients.get_spreadsheet([], key="key-123")
+
+    assert first is second is third
+    assert client.calls == [("open", "FINANCIAL_REPORT")]
+    google_clients.reset_clients()
+
+
+def test_sheets_idempotent_endpoints():
+    from gspread.urls import (
+        SPREADSHEET_BATCH_UPDATE_URL,
+        SPREADSHEET_VALUES_APPEND_URL,
+        SPREADSHEET_VALUES_BATCH_UPDATE_URL,
+        SPREADSHEET_VALUES_URL,
+    )
+
+    idempotent = google_clients._sheets_idempotent
+    assert idempotent("get", SPREADSHEET_VALUES_URL % ("k", "A:A"))
+    assert idempotent("post", SPREADSHEET_VALUES_BATCH_UPDATE_URL % "k")
+    # insert / delete baris, addSheet, append: jangan diulang setelah 5xx
+    assert not idempotent("post", SPREADSHEET_BATCH_UPDATE_URL % "k")
+    assert not idempotent("post", SPREADSHEET_VALUES_APPEND_URL % ("k", "A1"))
@@ -0,0 +1,232 @@
+from fake_google import FakeSpreadsheet
+from google_sheet import (
+    FINANCIAL_HEADER,
+    KPI_HEADER,
+    META_HEADER,
+    PERIOD_INDEX_HEADER,
+    SheetWriteBatch,
+    financial_rows,
+)
+
+
+HEADER = ["Period", "Account", "Value"]
+
+
+def test_batch_merges_scattered_rows_and_shrinks_period():
+    sheet = FakeSpreadsheet({
+        "P&L": [
+            HEADER,
+            ["Nov 2025", "Revenue", 2],
+            ["Oct 2025", "Revenue", 1],
+            ["Nov 2025", "Cost", 3],
+            ["Nov 2025", "Tax", 4],
+        ],
+    })
+
+    batch = SheetWriteBatch(sheet)
+    batch.upsert_period("P&L", FINANCIAL_HEADER, "Nov 2025",
+                        financial_rows("Nov 2025", {"Revenue": 5, "Cost": 6}))
+    batch.commit()
+
+    assert sheet.sheets["P&L"].rows == [
+        HEADER,
+        ["Nov 2025", "Revenue", 5],
+        ["Nov 2025", "Cost", 6],
+        ["Oct 2025", "Revenue", 1],
+    ]
+
+    batch = SheetWriteBatch(sheet)
+    batch.upsert_period("P&L", FINANCIAL_HEADER, "Nov 2025",
+                        financial_rows("Nov 2025", {"Revenue": 7}))
+    batch.commit()
+
+    assert sheet.sheets["P&L"].rows == [
+        HEADER,
+        ["Nov 2025", "Revenue", 7],
+        ["Oct 2025", "Revenue", 1],
+    ]
+
+
+def test_batch_writes_all_sheets_in_few_requests():
+    sheet = FakeSpreadsheet({
+        "P&L": [
+            HEADER,
+            ["Oct 2025", "Revenue", 1],
+            ["Nov 2025", "Revenue", 2],
+            ["Nov 2025", "Cost", 3],
+            ["Dec 2025", "Revenue", 4],
+        ],
+        "Balance Sheet": [HEADER, ["Nov 2025", "Cash", 1], ["Nov 2025", "Debt", 2]],
+        "META": [META_HEADER, ["Nov 2025", "old-link"]],
+    })
+
+    batch = SheetWriteBatch(sheet)
+    batch.upsert_period("P&L", FINANCIAL_HEADER, "Nov 2025",
+                        financial_rows("Nov 2025", {"Revenue": 20, "Cost": 30, "Tax": 40}))
+    batch.upsert_period("Balance Sheet", FINANCIAL_HEADER, "Nov 2025",
+                        financial_rows("Nov 2025", {"Cash": 5}))
+    batch.upsert_period("Cash Flow", FINANCIAL_HEADER, "Nov 2025",
+                        financial_rows("Nov 2025", {"Free Cash Flow": 7}))
+    batch.upsert_period("KPI Result", KPI_HEADER, "Nov 2025",
+                        [["Nov 2025", "LIQUIDITY", "Quick Ratio", None, "", 1.0, "", None, "", "Low"]])
+    batch.upsert_period("META", META_HEADER, "Nov 2025", [["Nov 2025", "new-link"]])
+
+    # metadata + addSheet + batchGet header/index + kolom A (sheet lama
+    # belum ada di index) + dimensions + values
+    assert batch.commit() == 6
+    assert sheet.calls == [
+        "worksheets", "batch_update", "values_batch_get", "values_batch_get",
+        "batch_update", "values_batch_update",
+    ]
+
+    assert sheet.sheets["P&L"].rows == [
+        HEADER,
+        ["Oct 2025", "Revenue", 1],
+        ["Nov 2025", "Revenue", 20],
+        ["Nov 2025", "Cost", 30],
+        ["Nov 2025", "Tax", 40],
+        ["Dec 2025", "Revenue", 4],
+    ]
+    assert sheet.sheets["Balance Sheet"].rows == [HEADER, ["Nov 2025", "Cash", 5]]
+    assert sheet.sheets["Cash Flow"].rows == [HEADER, ["Nov 2025", "Free Cash Flow", 7]]
+    assert sheet.sheets["KPI Result"].rows[1][3] == ""
+    assert sheet.sheets["META"].rows == [META_HEADER, ["Nov 2025", "new-link"]]
+
+
+def test_batch_handles_several_periods_on_same_sheet():
+    sheet = FakeSpreadsheet({
+        "P&L": [HEADER, ["Oct 2025", "Revenue", 1], ["Nov 2025", "Revenue", 2]],
+    })
+
+    batch = SheetWriteBatch(sheet)
+    batch.upsert_period("P&L", FINANCIAL_HEADER, "Oct 2025",
+                        financial_rows("Oct 2025", {"Revenue": 10, "Cost": 11}))
+    batch.upsert_period("P&L", FINANCIAL_HEADER, "Nov 2025",
+                        financial_rows("Nov 2025", {"Revenue": 20}))
+    batch.upsert_period("P&L", FINANCIAL_HEADER, "Dec 2025",
+                        financial_rows("Dec 2025", {"Revenue": 30}))
+    batch.commit()
+
+    assert sheet.sheets["P&L"].rows == [
+        HEADER,
+        ["Oct 2025", "Revenue", 10],
+        ["Oct 2025", "Cost", 11],
+        ["Nov 2025", "Revenue", 20],
+        ["Dec 2025", "Revenue", 30],
+    ]
+
+
+def test_diff_period_sends_only_changed_cells():
+    old = financial_rows("Nov 2025", {"Revenue": 2, "Cost": 3, "Fee": 9, "Tax": 4})
+    sheet = FakeSpreadsheet({
+        "P&L": [HEADER, ["Oct 2025", "Revenue", 1], *old, ["Dec 2025", "Revenue", 5]],
+    })
+
+    sent = []
+    values_batch_update = sheet.values_batch_update
+    sheet.values_batch_update = lambda body: sent.append(body) or values_batch_update(body)
+
+    new = financial_rows("Nov 2025", {"Revenue": 2, "Cost": 30, "Bonus": 7, "Tax": 40})
+    batch = SheetWriteBatch(sheet)
+    batch.diff_period("P&L", FINANCIAL_HEADER, "Nov 2025", old, new, key_columns=2)
+    batch.commit()
+
+    assert sheet.sheets["P&L"].rows == [
+        HEADER, ["Oct 2025", "Revenue", 1], *new, ["Dec 2025", "Revenue", 5],
+    ]
+    assert batch.diff_stats == {
+        "cells_updated": 2,
+        "rows_inserted": 1,
+        "rows_deleted": 1,
+        "rows_unchanged": 1,
+        "rows_rewritten": 0,
+    }
+    # yang dikirim cuma 2 cell Value + 1 baris baru (+ index period)
+    assert [(d["range"], d["values"]) for d in sent[0]["data"] if d["range"].startswith("'P&L'")] == [
+        ("'P&L'!C4", [[30]]),
+        ("'P&L'!A5", [["Nov 2025", "Bonus", 7]]),
+        ("'P&L'!C6", [[40]]),
+    ]
+
+
+def test_diff_period_falls_back_to_rewrite_when_sheet_differs():
+    old = financial_rows("Nov 2025", {"Revenue": 2, "Cost": 3})
+    sheet = FakeSpreadsheet({"P&L": [HEADER, ["Nov 2025", "Revenue", 2]]})  # diedit manual
+
+    new = financial_rows("Nov 2025", {"Revenue": 20, "Cost": 3})
+    batch = SheetWriteBatch(sheet)
+    batch.diff_period("P&L", FINANCIAL_HEADER, "Nov 2025", old, new, key_columns=2)
+    batch.commit()
+
+    assert sheet.sheets["P&L"].rows == [HEADER, *new]
+    assert batch.diff_stats["rows_rewritten"] == 2
+    assert batch.diff_stats["cells_updated"] == 0
+
+
+def test_period_index_replaces_column_a_scan():
+    sheet = FakeSpreadsheet({})
+    batch = SheetWriteBatch(sheet)
+    for period in ("Oct 2025", "Nov 2025", "Dec 2025"):
+        batch.upsert_period("P&L", FINANCIAL_HEADER, period,
+                            financial_rows(period, {"Revenue": 1, "Cost": 2}))
+    batch.commit()
+    assert sheet.sheets["_INDEX"].hidden
+
+    read = []
+    values_batch_get = sheet.values_batch_get
+    sheet.values_batch_get = lambda ranges, params=None: read.extend(ranges) or values_batch_get(ranges, params)
+
+    # Nov bertambah 1 baris, Oct berkurang 1 baris: Nov & Dec bergeser
+    sheet.calls.clear()
+    batch = SheetWriteBatch(sheet)
+    batch.upsert_period("P&L", FINANCIAL_HEADER, "Nov 2025",
+                        financial_rows("Nov 2025", {"Revenue": 10, "Cost": 20, "Tax": 30}))
+    batch.upsert_period("P&L", FINANCIAL_HEADER, "Oct 2025",
+                        financial_rows("Oct 2025", {"Revenue": 5}))
+    assert batch.commit() == 4
+    assert read == ["'P&L'!A1:C1", "'_INDEX'!A2:D", "'_INDEX'!E1"]
+
+    assert [r[:4] for r in sheet.sheets["_INDEX"].rows] == [
+        PERIOD_INDEX_HEADER,
+        ["P&L", "*", 1, 7],
+        ["P&L", "Oct 2025", 2, 2],
+        ["P&L", "Nov 2025", 3, 5],
+        ["P&L", "Dec 2025", 6, 7],
+    ]
+
+    # index dipakai commit berikutnya: Dec ditemukan tanpa baca kolom A
+    batch = SheetWriteBatch(sheet)
+    batch.upsert_period("P&L", FINANCIAL_HEADER, "Dec 2025", financial_rows("Dec 2025", {"Revenue": 9}))
+    batch.commit()
+    assert sheet.sheets["P&L"].rows == [
+        HEADER,
+        ["Oct 2025", "Revenue", 5],
+        ["Nov 2025", "Revenue", 10],
+        ["Nov 2025", "Cost", 20],
+        ["Nov 2025", "Tax", 30],
+        ["Dec 2025", "Revenue", 9],
+    ]
+    assert not any(r.endswith("!A:A") for r in read)
+
+
+def test_concurrent_commits_do_not_overwrite_each_other():
+    import threading
+
+    from fake_google import FakeBackend
+
+    backend = FakeBackend(latency=0.02)
+    sheet = backend.spreadsheet(key="k")
+
+    def run(period):
+        batch = SheetWriteBatch(sheet)
+        batch.upsert_period("P&L", FINANCIAL_HEADER, period, financial_rows(period, {"Revenue": 1}))
+        batch.commit()
+
+    threads = [threading.Thread(target=run, args=(p,)) for p in ("Nov 2025", "Dec 2025")]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    periods = sorted(r[0] for r in sheet.sheets["P&L"].rows[1:])
+    assert periods == ["Dec 2025", "Nov 2025"]
@@ -0,0 +1,82 @@
+import threading
+import time
+
+import jobs
+import main
+
+
+def _use_tmp_db(monkeypatch, tmp_path):
+    monkeypatch.setattr(jobs, "JOBS_DB_PATH", str(tmp_path / "jobs.sqlite3"))
+    monkeypatch.setattr(jobs, "_pool", None)
+
+
+def _wait(job_id, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = jobs.get_job(job_id)
+        if job["status"] not in jobs.ACTIVE_STATUSES:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} tidak selesai")
+
+
+def test_job_runs_with_progress(monkeypatch, tmp_path):
+    _use_tmp_db(monkeypatch, tmp_path)
+    seen = []
+
+    def fake_process_pdf(pdf_source, progress=None):
+        for stage, fraction in [("extract", 0.1), ("sheets", 0.6)]:
+            progress(stage, fraction)
+            seen.append((stage, jobs.get_job(job_holder[0])["progress"]))
+        return {"period": "Jan 2025", "size": len(pdf_source)}
+
+    job_holder = []
+    monkeypatch.setattr(main, "process_pdf", fake_process_pdf)
+
+    # PDF upload disalin ke job, jadi stream asli boleh langsung ditutup
+    gate = threading.Event()
+    monkeypatch.setattr(jobs, "_run_job", _gated(jobs._run_job, gate))
+    job_holder.append(jobs.submit_job(b"%PDF-fake", file_name="report.pdf"))
+    assert jobs.get_job(job_holder[0])["status"] == jobs.QUEUED
+    gate.set()
+
+    job = _wait(job_holder[0])
+    assert job["status"] == jobs.DONE
+    assert job["progress"] == 1.0
+    assert job["result"] == {"period": "Jan 2025", "size": 9}
+    assert seen == [("extract", 0.1), ("sheets", 0.6)]
+
+
+def test_cancel_stops_at_next_stage(monkeypatch, tmp_path):
+    _use_tmp_db(monkeypatch, tmp_path)
+    reached = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def fake_process_pdf(pdf_source, progress=None):
+        progress("extract", 0.1)
+        reached.append("extract")
+        started.set()
+        release.wait(5)
+        progress("sheets", 0.6)  # job dibatalkan -> berhenti di sini
+        reached.append("sheets")
+        return {}
+
+    monkeypatch.setattr(main, "process_pdf", fake_process_pdf)
+
+    job_id = jobs.submit_job(b"%PDF-fake")
+    assert started.wait(5)
+    jobs.cancel_job(job_id)
+    release.set()
+
+    job = _wait(job_id)
+    assert job["status"] == jobs.CANCELLED
+    assert job["stage"] == "sheets"
+    assert reached == ["extract"]
+
+
+def _gated(fn, gate):
+    def run(*args):
+        gate.wait(5)
+        return fn(*args)
+    return run
@@ -0,0 +1,43 @@
+import shutil
+
+import main
+from fake_google import FakeSpreadsheet
+
+
+def test_batch_coalesces_sheet_writes(monkeypatch, tmp_path):
+    for name in ["2025-10.pdf", "2025-11.pdf"]:
+        shutil.copy("report.pdf", tmp_path / name)
+    (tmp_path / "broken.pdf").write_bytes(b"bukan pdf")
+    (tmp_path / "notes.txt").write_text("skip")
+
+    sheet = FakeSpreadsheet({})
+    uploads = []
+    monkeypatch.setattr(main, "connect_sheet", lambda *a, **k: sheet)
+    monkeypatch.setattr(
+        main, "upload_pdf_to_drive",
+        lambda path, period: uploads.append(path) or {"link": f"link-{len(uploads)}"},
+    )
+
+    paths = main.resolve_pdf_paths([str(tmp_path)])
+    assert [p.rsplit("/", 1)[1] for p in paths] == ["2025-10.pdf", "2025-11.pdf", "broken.pdf"]
+
+    summary = main.process_batch(paths, workers=2)
+
+    assert summary["processed"] == 2
+    assert list(summary["errors"]) == [str(tmp_path / "broken.pdf")]
+    # period sama: file terakhir yang terakhir di-upload, file sebelumnya
+    # hanya di-upload kalau selesai di-parse lebih dulu
+    assert uploads[-1] == str(tmp_path / "2025-11.pdf")
+    assert summary["drive_uploads"] == len(uploads)
+
+    # 1 commit untuk semua period + 1 commit META, bukan N rewrite
+    assert sheet.calls.count("values_batch_get") == 2
+    assert sheet.calls.count("values_batch_update") == 2
+    assert summary["sheets_requests"] == len(sheet.calls)
+
+    # period sama di 2 file -> baris tidak dobel
+    period = summary["results"][0]["period"]
+    pl_rows = sheet.sheets["P&L"].rows
+    assert len(pl_rows) == 1 + summary["results"][0]["pl_rows"]
+    assert sheet.sheets["META"].rows[1] == [period, f"link-{len(uploads)}"]
+    assert len(sheet.sheets["META"].rows) == 2
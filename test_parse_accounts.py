@@ -0,0 +1,45 @@
+from parse_accounts import build_account_matcher
+from parse_bs import parse_balance_sheet
+from parse_cashflow import parse_cashflow
+
+
+TEXT = """Cash Flow
+Operating Cash Flow Rp486.940.086 Rp46.053.375
+Free Cash Flow Rp497.254.139
+Net Cash Flow -Rp57.439.816
+Net Cash Flow Rp466.154.734
+BALANCE SHEET Nov 2025 Oct 2025 Variance %
+Total Current Assets Rp11.016.419.452 Rp9.910.188.100 11,16%
+Current Assets Rp5.000
+Inventory Rp4.255.400.517 Rp4.323.199.206 -1,57%
+"""
+
+
+def test_first_occurrence_wins_and_order_follows_account_list():
+    assert parse_cashflow(TEXT) == {
+        "Operating Cash Flow": 486940086,
+        "Free Cash Flow": 497254139,
+        "Net Cash Flow": 466154734,
+    }
+    assert list(parse_balance_sheet(TEXT)) == ["Inventory", "Total Current Assets"]
+
+
+def test_suffix_account_not_swallowed_by_longer_label():
+    match = build_account_matcher(["Current Assets", "Total Current Assets"])
+    assert match(TEXT) == {
+        "Current Assets": 11016419452,
+        "Total Current Assets": 11016419452,
+    }
+
+
+def test_same_result_as_baseline_on_report():
+    from extract_pdf import extract_text
+
+    text = extract_text("report.pdf")
+    assert parse_balance_sheet(text)["Total Assets"] == 25197021886
+    assert parse_cashflow(text) == {
+        "Operating Cash Flow": 486940086,
+        "Free Cash Flow": 497254139,
+        "Net Cash Flow": 466154734,
+        "Change in Cash on Hand": 331222430,
+    }
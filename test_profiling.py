@@ -0,0 +1,20 @@
+import os
+
+import profiling
+from parse_kpi import parse_kpi_result
+
+
+def test_profile_call_writes_file_and_reports_hotspots(monkeypatch, tmp_path):
+    monkeypatch.setattr(profiling, "PROFILE_DIR", str(tmp_path))
+
+    text = "A PROFITABILITY\nGross Profit Margin 59,67% 50,00% -2,71% Medium\n"
+    result, report = profiling.profile_call("kpi run", parse_kpi_result, text, "Nov 2025")
+
+    assert result[0][2] == "Gross Profit Margin"
+    assert os.path.dirname(report["path"]) == str(tmp_path)
+    assert report["path"].endswith("-kpi_run.prof")
+    assert os.path.getsize(report["path"]) > 0
+
+    parse_funcs = [f["function"] for f in report["hotspots"]["parse"]]
+    assert any("parse_kpi_result" in f for f in parse_funcs)
+    assert report["hotspots"]["sheets"] == []
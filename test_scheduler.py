@@ -0,0 +1,73 @@
+import threading
+import time
+
+import fake_google
+from scheduler import HIGH, LOW, Scheduler, TokenBucket
+from tracing import Trace
+
+
+def test_429_retried_with_backoff():
+    scheduler = Scheduler()
+    scheduler.backoff = lambda attempt, retry_after=0.0: 0.25
+    backend = fake_google.FakeBackend(sheets_quota=2, quota_window=0.2, scheduler=scheduler)
+    sheet = backend.spreadsheet(key="k")
+
+    trace = Trace()
+    with trace.span("commit"):
+        for _ in range(3):
+            sheet.worksheets()
+
+    assert backend.rejected["sheets.worksheets"] == 1
+    assert backend.counts["sheets.worksheets"] == 3
+    assert scheduler.stats()["sheets"]["retried"] == 1
+    assert scheduler.stats()["sheets"]["failed"] == 0
+    assert trace.summary()["counters"] == {"sheets.retried": 1}
+
+
+def test_token_bucket_throttles_burst():
+    scheduler = Scheduler({"sheets": (600, 1)})  # 10 request / detik
+    started = time.perf_counter()
+    for _ in range(3):
+        scheduler.run("sheets", lambda: None)
+
+    assert time.perf_counter() - started >= 0.15
+    stats = scheduler.stats()["sheets"]
+    assert stats["requests"] == 3
+    assert stats["throttled"] == 2
+
+
+def test_high_priority_served_first():
+    bucket = TokenBucket(rate=5, capacity=1)
+    bucket.acquire()  # token habis
+    order = []
+
+    def take(name, level):
+        bucket.acquire(level)
+        order.append(name)
+
+    threads = []
+    for name, level in (("low-1", LOW), ("low-2", LOW), ("meta", HIGH)):
+        t = threading.Thread(target=take, args=(name, level))
+        t.start()
+        threads.append(t)
+        time.sleep(0.02)
+    for t in threads:
+        t.join()
+
+    assert order == ["meta", "low-1", "low-2"]
+
+
+def test_non_idempotent_request_retried_only_on_429():
+    scheduler = Scheduler()
+    scheduler.backoff = lambda attempt, retry_after=0.0: 0.0
+
+    # 503 setelah insert baris / buat file: bisa jadi sudah dijalankan server
+    responses = iter([503, 200])
+    assert scheduler.run("sheets", lambda: next(responses), status=lambda r: r, idempotent=False) == 503
+
+    responses = iter([429, 200])
+    assert scheduler.run("sheets", lambda: next(responses), status=lambda r: r, idempotent=False) == 200
+
+    responses = iter([503, 200])
+    assert scheduler.run("sheets", lambda: next(responses), status=lambda r: r) == 200
+    assert scheduler.stats()["sheets"]["retried"] == 2
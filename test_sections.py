@@ -0,0 +1,43 @@
+from parse_bs import parse_balance_sheet
+from sections import index_sections, split_sections
+
+TEXT = """Executive Summary
+CASH FLOW
+Free Cash Flow Rp1
+KPI Results
+A PROFITABILITY NOV 2025 vs OCT 2025
+1 ALERT RESULT TARGET TREND IMPORTANCE
+I GROWTH NOV 2025 vs OCT 2025
+Alerts
+Cash Flow
+Free Cash Flow Rp497.254.139
+Cash Flow Charts
+Net Cash Flow Rp466.154.734
+Financials
+PROFIT & LOSS Nov 2025 Oct 2025 Variance %
+Revenue Rp2.722.196.641 Rp1.900.532.746 43,23%
+BALANCE SHEET Nov 2025 Oct 2025 Variance %
+Inventory Rp4.255.400.517 Rp4.323.199.206 -1,57%
+"""
+
+
+def test_index_merges_continuation_headings_and_skips_other():
+    index = index_sections(TEXT)
+    assert sorted(index) == ["bs", "cf", "kpi", "pl"]
+    assert len(index["kpi"]) == 1
+    assert len(index["cf"]) == 1
+
+    sections = split_sections(TEXT, index)
+    assert sections["kpi"].startswith("KPI Results\n")
+    assert "I GROWTH" in sections["kpi"]
+    assert "Alerts" not in sections["kpi"]
+    # baris "CASH FLOW" di executive summary bukan heading section
+    assert "Rp1\n" not in sections["cf"]
+    assert sections["pl"].startswith("PROFIT & LOSS")
+    assert "BALANCE SHEET" not in sections["pl"]
+
+
+def test_balance_sheet_reads_only_its_own_slice():
+    text = "Cash Flow\nless: Change in Inventory Rp67.798.690\n" + TEXT
+    assert parse_balance_sheet(text)["Inventory"] == 67798690
+    assert parse_balance_sheet(split_sections(text)["bs"])["Inventory"] == 4255400517
@@ -0,0 +1,158 @@
+import store
+from fake_google import FakeSpreadsheet
+from google_sheet import SheetWriteBatch
+
+
+def _parsed(period, revenue, kpi_rows=()):
+    return {
+        "period": period,
+        "pl": {"Revenue": revenue, "Cost": -5},
+        "bs": {"Cash": 7},
+        "cf": {},
+        "kpi_rows": [list(r) for r in kpi_rows],
+    }
+
+
+def test_save_report_roundtrip_and_history():
+    kpi = [["Nov 2025", "Finance", "Margin", 12.5, "%", 10, "%", "Up", "", "High"]]
+    assert store.save_report(_parsed("Oct 2025", 10)) == ["P&L", "Balance Sheet", "Cash Flow"]
+    assert store.save_report(_parsed("Nov 2025", 20, kpi)) == [
+        "P&L", "Balance Sheet", "Cash Flow", "KPI Result",
+    ]
+
+    assert store.period_rows("P&L", "Nov 2025") == [["Nov 2025", "Revenue", 20], ["Nov 2025", "Cost", -5]]
+    assert store.period_rows("KPI Result", "Nov 2025") == kpi
+    assert store.list_periods() == ["Oct 2025", "Nov 2025"]
+    assert store.account_history("Revenue") == {"Oct 2025": 10, "Nov 2025": 20}
+
+    # isi sama -> tidak ada yang berubah, KPI kosong tidak menghapus KPI lama
+    assert store.save_report(_parsed("Nov 2025", 20)) == []
+    assert store.period_rows("KPI Result", "Nov 2025") == kpi
+
+
+def test_sync_sends_only_changed_periods():
+    sheet = FakeSpreadsheet({})
+    store.save_report(_parsed("Oct 2025", 10))
+    store.save_report(_parsed("Nov 2025", 20))
+
+    batch = SheetWriteBatch(sheet)
+    items = store.queue_sync(batch)
+    assert {(i.worksheet, i.period) for i in items} == {
+        (w, p) for w in ("P&L", "Balance Sheet", "Cash Flow") for p in ("Oct 2025", "Nov 2025")
+    }
+    batch.commit()
+    store.mark_synced(items)
+    assert store.pending_sync() == []
+
+    store.save_report(_parsed("Nov 2025", 21))
+    assert store.pending_sync() == [("P&L", "Nov 2025")]
+
+    sheet.calls.clear()
+    batch = SheetWriteBatch(sheet)
+    items = store.queue_sync(batch)
+    batch.commit()
+    store.mark_synced(items)
+    assert batch.pending_rows() == {}
+    assert sheet.calls.count("values_batch_update") == 1
+    assert sheet.sheets["P&L"].rows[1:] == [
+        ["Oct 2025", "Revenue", 10], ["Oct 2025", "Cost", -5],
+        ["Nov 2025", "Revenue", 21], ["Nov 2025", "Cost", -5],
+    ]
+
+    # commit gagal -> tidak di-mark, tetap pending untuk sync berikutnya
+    store.save_report(_parsed("Nov 2025", 22))
+    store.queue_sync(SheetWriteBatch(sheet))
+    assert store.pending_sync() == [("P&L", "Nov 2025")]
+    assert len(store.pending_sync(force=True)) == 6
+
+
+def test_failed_value_write_does_not_leave_stale_index():
+    from google_sheet import financial_rows
+
+    def accounts(n, base):
+        return {f"Acc{i}": base + i for i in range(n)}
+
+    sheet = FakeSpreadsheet({})
+    store.save_rows("P&L", "Jan 2026", financial_rows("Jan 2026", accounts(5, 0)))
+    store.save_rows("P&L", "Feb 2026", financial_rows("Feb 2026", accounts(2, 10)))
+    batch = SheetWriteBatch(sheet)
+    items = store.queue_sync(batch)
+    batch.commit()
+    store.mark_synced(items)
+
+    # Jan 5 -> 7 baris: insert baris terkirim, tulis nilai gagal (kuota)
+    store.save_rows("P&L", "Jan 2026", financial_rows("Jan 2026", accounts(7, 0)))
+    values_batch_update = sheet.values_batch_update
+
+    def fail(body):
+        raise RuntimeError("quota")
+
+    sheet.values_batch_update = fail
+    batch = SheetWriteBatch(sheet)
+    store.queue_sync(batch)
+    try:
+        batch.commit()
+    except RuntimeError:
+        pass
+    sheet.values_batch_update = values_batch_update
+
+    # retry + perubahan Feb: posisi baris dari kolom A, bukan index lama
+    store.save_rows("P&L", "Feb 2026", financial_rows("Feb 2026", accounts(2, 20)))
+    batch = SheetWriteBatch(sheet)
+    items = store.queue_sync(batch)
+    batch.commit()
+    store.mark_synced(items)
+
+    rows = sheet.sheets["P&L"].rows[1:]
+    assert [r for r in rows if any(r)] == (
+        financial_rows("Jan 2026", accounts(7, 0)) + financial_rows("Feb 2026", accounts(2, 20))
+    )
+    # index baru sesuai posisi baris sebenarnya
+    index = {(r[1], r[2], r[3]) for r in sheet.sheets["_INDEX"].rows[1:] if r and r[0] == "P&L"}
+    for period, first, last in index - {("*", 1, len(rows) + 1)}:
+        assert {r[0] for r in rows[first - 2:last - 1]} == {period}
+
+
+def test_dirty_index_rebuilt_for_worksheets_outside_the_commit():
+    from google_sheet import financial_rows
+
+    def accounts(n, base):
+        return {f"Acc{i}": base + i for i in range(n)}
+
+    def sync(worksheets=None):
+        batch = SheetWriteBatch(sheet)
+        items = store.queue_sync(batch, worksheets=worksheets)
+        batch.commit()
+        store.mark_synced(items)
+
+    sheet = FakeSpreadsheet({})
+    store.save_rows("P&L", "Jan 2026", financial_rows("Jan 2026", accounts(5, 0)))
+    store.save_rows("P&L", "Feb 2026", financial_rows("Feb 2026", accounts(2, 10)))
+    store.save_rows("Balance Sheet", "Jan 2026", financial_rows("Jan 2026", {"Cash": 1}))
+    sync()
+
+    # P&L: insert baris terkirim, tulis nilai gagal -> index ditandai basi
+    store.save_rows("P&L", "Jan 2026", financial_rows("Jan 2026", accounts(7, 0)))
+    values_batch_update = sheet.values_batch_update
+
+    def fail(body):
+        raise RuntimeError("quota")
+
+    sheet.values_batch_update = fail
+    try:
+        sync(["P&L"])
+    except RuntimeError:
+        pass
+    sheet.values_batch_update = values_batch_update
+
+    # commit berikutnya cuma Balance Sheet, tapi index P&L ikut dibangun ulang
+    store.save_rows("Balance Sheet", "Jan 2026", financial_rows("Jan 2026", {"Cash": 2}))
+    sync(["Balance Sheet"])
+
+    store.save_rows("P&L", "Feb 2026", financial_rows("Feb 2026", accounts(2, 20)))
+    sync(["P&L"])
+
+    rows = sheet.sheets["P&L"].rows[1:]
+    assert [r for r in rows if any(r)] == (
+        financial_rows("Jan 2026", accounts(7, 0)) + financial_rows("Feb 2026", accounts(2, 20))
+    )
@@ -0,0 +1,26 @@
+from extract_pdf import extract_section_text, find_section_pages
+from parse_bs import parse_balance_sheet
+from parse_cashflow import parse_cashflow
+from parse_kpi import parse_kpi_result
+from parse_pl import detect_period, parse_profit_loss
+from sections import split_sections
+from synthetic_report import generate_report, synthetic_pdf
+
+
+def test_synthetic_report_round_trips_through_parsers():
+    pdf, expected = synthetic_pdf(period="Jan 2026", filler_pages=3, extra_accounts=70, kpi_rows=90, seed=7)
+
+    text = extract_section_text(pdf, use_cache=False)
+    sections = split_sections(text)
+
+    assert detect_period(text) == "Jan 2026"
+    assert parse_profit_loss(sections["pl"]) == expected["pl"]
+    assert parse_balance_sheet(sections["bs"]) == expected["bs"]
+    assert parse_cashflow(sections["cf"]) == expected["cf"]
+    assert parse_kpi_result(sections["kpi"], "Jan 2026") == expected["kpi_rows"]
+
+
+def test_filler_pages_are_skipped():
+    pages, _ = generate_report(filler_pages=6)
+    pdf, _ = synthetic_pdf(filler_pages=6)
+    assert len(find_section_pages(pdf)) == len(pages) - 6
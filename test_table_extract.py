@@ -0,0 +1,37 @@
+from synthetic_report import synthetic_pdf
+from table_extract import extract_statement_cells, parse_value, statement_values
+
+
+def test_parse_value_tokens():
+    assert parse_value("Rp1.900.532.746") == (1900532746, "Rp")
+    assert parse_value("-Rp404.888.017") == (-404888017, "Rp")
+    assert parse_value("-55,08%") == (-55.08, "%")
+    assert parse_value("-") == (None, "")
+    assert parse_value("Revenue") is None
+
+
+def test_report_statement_cells():
+    cells = extract_statement_cells("report.pdf")
+
+    pl = statement_values(cells, "pl")
+    assert pl["Revenue"] == 2722196641
+    # Rp0 tidak terlewat (parse_profit_loss melewatkan baris ini)
+    assert pl["Other Expenses"] == 0
+
+    bs = statement_values(cells, "bs")
+    assert bs["Tax Liability"] == -404888017
+    assert statement_values(cells, "bs", column_index=1)["Cash & Equivalents"] == 1467379510
+
+    tax = [c for c in cells if c.section == "bs" and c.account == "Tax Liability"]
+    assert [(c.group, c.column) for c in tax] == [
+        ("LIABILITIES", "Nov 2025"),
+        ("LIABILITIES", "Oct 2025"),
+        ("LIABILITIES", "Variance %"),
+    ]
+
+
+def test_multi_page_statements_match_synthetic_truth():
+    pdf, expected = synthetic_pdf(extra_accounts=90, seed=4)
+    cells = extract_statement_cells(pdf)
+    assert statement_values(cells, "pl") == expected["statements"]["pl"]
+    assert statement_values(cells, "bs") == expected["statements"]["bs"]
@@ -0,0 +1,34 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from tracing import Trace, bind, record_api_call
+
+
+def test_api_calls_counted_in_active_span_and_parents():
+    trace = Trace()
+    record_api_call("sheets")  # di luar span: diabaikan
+
+    with trace.span("sheets_commit"):
+        record_api_call("sheets", bytes_sent=100, bytes_received=10)
+        with trace.span("inner", rows=3):
+            record_api_call("sheets", bytes_sent=5)
+
+    with ThreadPoolExecutor(max_workers=1) as pool, trace.span("upload"):
+        def upload():
+            with trace.span("drive"):
+                record_api_call("drive", bytes_sent=1000)
+
+        pool.submit(bind(upload)).result()
+
+    summary = trace.summary()
+    spans = {s["span"]: s for s in summary["spans"]}
+
+    assert spans["sheets_commit"]["api_requests"] == {"sheets": 2}
+    assert spans["sheets_commit"]["bytes_sent"] == 105
+    assert spans["sheets_commit/inner"]["attrs"] == {"rows": 3}
+    # span di thread pool jadi anak span pemanggil
+    assert spans["upload/drive"]["api_requests"] == {"drive": 1}
+    assert spans["upload"]["bytes_sent"] == 1000
+
+    assert summary["api_requests"] == {"sheets": 2, "drive": 1}
+    assert summary["bytes_sent"] == 1105
+    assert summary["bytes_received"] == 10
@@ -0,0 +1,207 @@
+# tracing.py
+# Tracing ringan untuk pipeline: span per tahap (extract, parse, upload
+# Drive, commit Sheets, META) berisi durasi + jumlah request & bytes ke
+# Google API selama span itu aktif.
+#
+#   trace = Trace()
+#   with trace.span("extract"):
+#       ...
+#   trace.summary()   -> dict, dimasukkan ke hasil process_pdf
+#
+# Request Google dicatat lewat record_api_call() (dipanggil HTTP client
+# Sheets / Drive di google_clients.py dan backend palsu fake_google.py)
+# dan masuk ke span yang sedang aktif di context pemanggil beserta
+# semua induknya. Di luar span, record_api_call() tidak melakukan apa-apa.
+# Counter lain (request yang di-throttle / di-retry scheduler.py) lewat
+# record_counter() dengan cara yang sama.
+#
+# Tiap span selesai ditulis sebagai 1 baris JSON ke logger
+# "financial_pdf.trace"; set TRACE_LOG=1 supaya langsung tampil di stderr.
+
+import contextvars
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# =========================
+# CONFIG
+# =========================
+TRACE_LOG = os.environ.get("TRACE_LOG", "0") == "1"
+
+logger = logging.getLogger("financial_pdf.trace")
+if TRACE_LOG and not logger.handlers:
+    _handler = logging.StreamHandler(sys.stderr)
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+
+# span yang sedang aktif di context ini (per thread / per context yang di-bind)
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+
+# =========================
+# SPAN & TRACE
+# =========================
+class Span:
+    __slots__ = (
+        "trace", "name", "parent", "start", "end", "attrs",
+        "api_requests", "bytes_sent", "bytes_received", "counters",
+    )
+
+    def __init__(self, trace, name: str, parent=None, attrs=None):
+        self.trace = trace
+        self.name = name
+        self.parent = parent
+        self.start = time.perf_counter()
+        self.end = None
+        self.attrs = attrs or {}
+        self.api_requests = {}  # "sheets" / "drive" -> n
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.counters = {}  # "sheets.retried" -> n
+
+    @property
+    def path(self) -> str:
+        names = []
+        span = self
+        while span is not None:
+            names.append(span.name)
+            span = span.parent
+        return "/".join(reversed(names))
+
+
+class Trace:
+    """
+    Kumpulan span 1 run. Aman dipakai dari beberapa thread sekaligus;
+    fungsi yang dijalankan di thread pool dibungkus bind(fn) supaya span
+    di thread itu jadi anak span pemanggil.
+    """
+
+    def __init__(self, name: str = "process_pdf"):
+        self.name = name
+        self.started = time.perf_counter()
+        self.spans = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        parent = _current_span.get()
+        if parent is not None and parent.trace is not self:
+            parent = None
+
+        span = Span(self, name, parent, attrs)
+        token = _current_span.set(span)
+        try:
+            yield span
+        finally:
+            span.end = time.perf_counter()
+            _current_span.reset(token)
+            with self._lock:
+                self.spans.append(span)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(json.dumps({"trace": self.name, **self._span_dict(span)}))
+
+    def _span_dict(self, span) -> dict:
+        out = {
+            "span": span.path,
+            "start_ms": round((span.start - self.started) * 1000, 2),
+            "duration_ms": round((span.end - span.start) * 1000, 2),
+            "api_requests": dict(span.api_requests),
+            "bytes_sent": span.bytes_sent,
+            "bytes_received": span.bytes_received,
+        }
+        if span.counters:
+            out["counters"] = dict(span.counters)
+        if span.attrs:
+            out["attrs"] = span.attrs
+        return out
+
+    def summary(self) -> dict:
+        """
+        {"total_ms", "api_requests", "bytes_sent", "bytes_received", "spans"},
+        plus "counters" kalau ada.
+        Total dihitung dari span paling luar saja (span anak sudah ikut
+        terhitung di induknya). Span urut berdasarkan waktu mulai.
+        """
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s.start)
+
+        totals = {}
+        counters = {}
+        sent = received = 0
+        for span in spans:
+            if span.parent is None:
+                for api, n in span.api_requests.items():
+                    totals[api] = totals.get(api, 0) + n
+                for name, n in span.counters.items():
+                    counters[name] = counters.get(name, 0) + n
+                sent += span.bytes_sent
+                received += span.bytes_received
+
+        summary = {
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 2),
+            "api_requests": totals,
+            "bytes_sent": sent,
+            "bytes_received": received,
+        }
+        if counters:
+            summary["counters"] = counters
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps({"trace": self.name, "summary": summary}))
+
+        summary["spans"] = [self._span_dict(s) for s in spans]
+        return summary
+
+
+def bind(fn):
+    """
+    Bungkus fn supaya jalan di context saat ini: span yang sedang aktif
+    ikut terbawa ke thread pool (ThreadPoolExecutor tidak menyalin context).
+    Tiap panggilan jalan di salinan context sendiri, jadi hasil bind()
+    boleh dipakai beberapa thread sekaligus.
+    """
+    ctx = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        # 1 Context tidak bisa di-enter 2 thread bersamaan
+        return ctx.copy().run(fn, *args, **kwargs)
+
+    return run
+
+
+# =========================
+# API COUNTER
+# =========================
+def record_api_call(api: str, bytes_sent: int = 0, bytes_received: int = 0):
+    """
+    Catat 1 request ke Google API ("sheets" / "drive") di span aktif
+    dan semua induknya.
+    """
+    span = _current_span.get()
+    if span is None:
+        return
+
+    with span.trace._lock:
+        while span is not None:
+            span.api_requests[api] = span.api_requests.get(api, 0) + 1
+            span.bytes_sent += bytes_sent
+            span.bytes_received += bytes_received
+            span = span.parent
+
+
+def record_counter(name: str, n: int = 1):
+    """
+    Tambah counter `name` di span aktif dan semua induknya.
+    """
+    span = _current_span.get()
+    if span is None:
+        return
+
+    with span.trace._lock:
+        while span is not None:
+            span.counters[name] = span.counters.get(name, 0) + n
+            span = span.parent
@@ -1,9 +1,12 @@
-import streamlit as st
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
+import threading
+import time
 from datetime import datetime
 
+from googleapiclient.http import MediaFileUpload, MediaIoBaseUpload
+
+import google_clients
+from pdf_source import digest, is_path, open_input
+
 # Scope Drive
 SCOPES = ["https://www.googleapis.com/auth/drive"]
 
@@ -13,31 +16,56 @@ SCOPES = ["https://www.googleapis.com/auth/drive"]
 # https://drive.google.com/drive/folders/XXXXXXXXXXXX  -> pakai "XXXXXXXXXXXX"
 ROOT_FOLDER_ID = "12934i5FjV9OA96tU3OXBhmyHpGflXjXF"
 
+# Cache ID folder tahun / bulan (detik). Folder jarang berubah,
+# jadi tidak perlu query files().list tiap upload.
+FOLDER_CACHE_TTL = 6 * 60 * 60
+
+# (parent_id, name) -> (folder_id, expires_at)
+_folder_cache = {}
+_folder_cache_lock = threading.Lock()
+# (parent_id, name) -> Lock: upload paralel ke folder yang sama
+# menunggu 1 list / create, tidak membuat folder kembar
+_folder_locks = {}
+# (folder_id, nama file) -> Lock: upload period yang sama (job / batch
+# paralel) tidak sama-sama "belum ada" lalu membuat file kembar
+_file_locks = {}
+
 
 def get_drive_service():
     """
-    Buat Drive client sebagai USER (bukan service account)
-    pakai client_id, client_secret, refresh_token dari st.secrets[gcp_oauth]
-    """
-    oauth = st.secrets["gcp_oauth"]
-
-    creds = Credentials(
-        token=None,  # akan otomatis di-refresh dari refresh_token
-        refresh_token=oauth["refresh_token"],
-        token_uri=oauth["token_uri"],
-        client_id=oauth["client_id"],
-        client_secret=oauth["client_secret"],
-        scopes=SCOPES,
-    )
+    Drive client sebagai USER (bukan service account)
+    pakai client_id, client_secret, refresh_token dari st.secrets[gcp_oauth].
 
-    return build("drive", "v3", credentials=creds)
+    Credentials, access token & discovery document di-cache per proses
+    (lihat google_clients.py).
+    """
+    return google_clients.get_drive_service(SCOPES)
 
 
 def get_or_create_folder(service, name: str, parent_id: str) -> str:
     """
     Cari folder bernama 'name' di dalam parent_id.
     Kalau tidak ada, buat baru.
+    Hasilnya di-cache selama FOLDER_CACHE_TTL.
     """
+    cache_key = (parent_id, name)
+    with _folder_cache_lock:
+        lock = _folder_locks.setdefault(cache_key, threading.Lock())
+
+    with lock:
+        with _folder_cache_lock:
+            cached = _folder_cache.get(cache_key)
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
+
+        folder_id = _find_or_create_folder(service, name, parent_id)
+
+        with _folder_cache_lock:
+            _folder_cache[cache_key] = (folder_id, time.monotonic() + FOLDER_CACHE_TTL)
+    return folder_id
+
+
+def _find_or_create_folder(service, name: str, parent_id: str) -> str:
     query = (
         f"name='{name}' and "
         f"mimeType='application/vnd.google-apps.folder' and "
@@ -76,25 +104,76 @@ def get_or_create_folder(service, name: str, parent_id: str) -> str:
     return folder["id"]
 
 
-def upload_pdf_to_drive(pdf_path: str, period: str) -> str:
+def file_md5(pdf_source) -> str:
+    return digest(pdf_source, "md5")
+
+
+def _media_for(pdf_source):
+    """
+    Path -> MediaFileUpload, bytes / stream -> MediaIoBaseUpload
+    (upload langsung dari memory, tanpa tulis file sementara).
+    """
+    if is_path(pdf_source):
+        return MediaFileUpload(pdf_source, mimetype="application/pdf")
+    return MediaIoBaseUpload(open_input(pdf_source), mimetype="application/pdf")
+
+
+def find_file(service, name: str, parent_id: str):
+    """
+    Cari file bernama 'name' di folder parent_id (1 request metadata).
+    Return dict {id, md5Checksum, webViewLink} atau None.
+    """
+    query = f"name='{name}' and '{parent_id}' in parents and trashed=false"
+
+    result = (
+        service.files()
+        .list(
+            q=query,
+            spaces="drive",
+            fields="files(id, md5Checksum, webViewLink)",
+        )
+        .execute()
+    )
+
+    files = result.get("files", [])
+    return files[0] if files else None
+
+
+def parse_period(period: str) -> tuple:
+    """
+    "Nov 2025" / "November 2025" -> ("Nov", 11, "2025").
+    Raise ValueError kalau bukan "<bulan> <tahun>" (misal "Unknown Period").
+    """
+    parts = period.split()
+    if len(parts) != 2 or not (parts[1].isdigit() and len(parts[1]) == 4):
+        raise ValueError(f"Period tidak valid: {period!r}")
+    month, year = parts
+    try:
+        month_num = datetime.strptime(month, "%b").month  # "Nov"
+    except ValueError:
+        month_num = datetime.strptime(month, "%B").month  # "November"
+    return month, month_num, year
+
+
+def upload_pdf_to_drive(pdf_source, period: str) -> str:
     """
-    Upload PDF ke My Drive user,
+    Upload PDF (path, bytes, atau file-like) ke My Drive user,
     struktur folder:
         ROOT_FOLDER /
           <tahun> /
             <MM_Mmm> /
               PL_Mmm_YYYY.pdf
 
+    Kalau file dengan nama sama sudah ada:
+    - isi sama (MD5 sama)  -> tidak upload ulang, pakai file yang ada
+    - isi beda             -> file lama di-update (bukan bikin duplikat)
+
     Return: webViewLink (URL ke file di Drive)
     """
     service = get_drive_service()
 
     # period contoh: "Nov 2025" atau "November 2025"
-    month, year = period.split()
-    try:
-        month_num = datetime.strptime(month, "%b").month  # "Nov"
-    except ValueError:
-        month_num = datetime.strptime(month, "%B").month  # "November"
+    month, month_num, year = parse_period(period)
 
     month_folder_name = f"{month_num:02d}_{month}"
 
@@ -103,22 +182,49 @@ def upload_pdf_to_drive(pdf_path: str, period: str) -> str:
 
     file_name = f"PL_{month}_{year}.pdf"
 
-    file_metadata = {
-        "name": file_name,
-        "parents": [month_folder_id],
-    }
+    with _folder_cache_lock:
+        lock = _file_locks.setdefault((month_folder_id, file_name), threading.Lock())
+    with lock:
+        return _upload_file(service, pdf_source, file_name, month_folder_id)
 
-    media = MediaFileUpload(pdf_path, mimetype="application/pdf")
 
-    uploaded = (
-        service.files()
-        .create(
-            body=file_metadata,
-            media_body=media,
-            fields="id, webViewLink",
+def _upload_file(service, pdf_source, file_name: str, month_folder_id: str) -> str:
+    """
+    Cek file lalu upload / update (dipanggil di dalam lock nama file).
+    """
+    existing = find_file(service, file_name, month_folder_id)
+    if existing and existing.get("md5Checksum") == file_md5(pdf_source):
+        # PDF identik sudah ada di Drive -> tidak perlu upload
+        return existing["webViewLink"]
+
+    media = _media_for(pdf_source)
+
+    if existing:
+        # PDF revisi untuk period yang sama -> update file lama
+        uploaded = (
+            service.files()
+            .update(
+                fileId=existing["id"],
+                media_body=media,
+                fields="id, webViewLink",
+            )
+            .execute()
+        )
+    else:
+        file_metadata = {
+            "name": file_name,
+            "parents": [month_folder_id],
+        }
+
+        uploaded = (
+            service.files()
+            .create(
+                body=file_metadata,
+                media_body=media,
+                fields="id, webViewLink",
+            )
+            .execute()
         )
-        .execute()
-    )
 
     # Kalau mau bisa diakses siapa saja yang punya link, bisa buka komentar ini:
     # service.permissions().create(